@@ -4,9 +4,29 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.importlib import async_import_module
 
-from .const import DOMAIN, CONF_SYMBOLS, CONF_SCAN_INTERVAL, CONF_ECO_THRESHOLD
-from .coordinator import YahooFinanceDataUpdateCoordinator
+from .cache import YahooFinanceCache
+from .const import (
+    DOMAIN,
+    CONF_SYMBOLS,
+    CONF_SYMBOL_INTERVALS,
+    CONF_SYMBOL_COSTS,
+    CONF_SCAN_INTERVAL,
+    CONF_ECO_THRESHOLD,
+    CONF_BASE_CURRENCY,
+    CONF_EXT_HOURS,
+    CONF_REQUEST_BUDGET,
+    CONF_STREAMING,
+    DEFAULT_REQUEST_BUDGET,
+    FUNDAMENTALS_UPDATE_INTERVAL,
+    NEWS_UPDATE_INTERVAL,
+    HISTORY_UPDATE_INTERVAL,
+    QUOTES_CACHE_TTL,
+)
+from .hub import async_get_hub, async_remove_hub
+from .sensor import async_update_entities, required_data_groups
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,11 +39,71 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     symbols = conf.get(CONF_SYMBOLS, {})
     scan_interval = conf.get(CONF_SCAN_INTERVAL, 120)
     eco_threshold = conf.get(CONF_ECO_THRESHOLD, 600)
-    
-    coordinator = YahooFinanceDataUpdateCoordinator(hass, symbols, scan_interval, eco_threshold)
-    await coordinator.async_config_entry_first_refresh()
+    base_currency = conf.get(CONF_BASE_CURRENCY, "USD")
+    ext_hours = conf.get(CONF_EXT_HOURS, False)
+    symbol_intervals = conf.get(CONF_SYMBOL_INTERVALS, {})
+    symbol_costs = conf.get(CONF_SYMBOL_COSTS, {})
+    streaming = conf.get(CONF_STREAMING, False)
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    # All entries share one rate limiter; the strictest budget applies
+    entry.async_on_unload(
+        async_get_hub(hass).limiter.async_add_budget(
+            entry.entry_id, conf.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+        )
+    )
+
+    cache = YahooFinanceCache(hass, entry.entry_id)
+    await cache.async_load()
+    entry.async_on_unload(cache.async_flush)
+
+    # Slow data is only fetched for what enabled sensors show; enabling an
+    # entity in the registry reloads the entry, which recomputes this
+    groups = required_data_groups(conf, symbols, _disabled_unique_ids(hass, entry))
+
+    # The coordinators pull in numpy; import them in the executor on first
+    # setup instead of on the event loop whenever the package is imported,
+    # which showing the config flow does too. The helper caches the module
+    # and shares one import between entries set up at the same time.
+    coordinator_module = await async_import_module(hass, f"{__name__}.coordinator")
+    coordinators = coordinator_module.YahooFinanceCoordinators(
+        quotes=coordinator_module.YahooFinanceDataUpdateCoordinator(
+            hass, symbols, scan_interval, eco_threshold, base_currency, ext_hours, cache, symbol_intervals, streaming, symbol_costs
+        ),
+        fundamentals=coordinator_module.YahooFinanceFundamentalsCoordinator(hass, _fundamentals_groups(groups), cache=cache),
+        news=coordinator_module.YahooFinanceNewsCoordinator(hass, _symbols_needing(groups, "news"), cache=cache),
+        history=coordinator_module.YahooFinanceHistoryCoordinator(hass, _symbols_needing(groups, "history"), cache=cache),
+        groups=groups,
+        cache=cache,
+        conf=conf,
+    )
+    for coordinator in coordinators.all:
+        entry.async_on_unload(coordinator.async_shutdown)
+
+    # Slow data is refreshed in the background only when the cache is stale
+    for coordinator, ttl in (
+        (coordinators.fundamentals, FUNDAMENTALS_UPDATE_INTERVAL),
+        (coordinators.news, NEWS_UPDATE_INTERVAL),
+        (coordinators.history, HISTORY_UPDATE_INTERVAL),
+    ):
+        if not coordinator.symbols:
+            _LOGGER.debug("No enabled sensor needs %s, not fetching it", coordinator.name)
+            continue
+        if not coordinator.async_restore(ttl):
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{coordinator.name}_first_refresh"
+            )
+
+    # Start from cached data; prices only block setup on a cold start
+    if coordinators.quotes.async_restore(QUOTES_CACHE_TTL):
+        entry.async_create_background_task(
+            hass, coordinators.quotes.async_refresh(), f"{coordinators.quotes.name}_first_refresh"
+        )
+    else:
+        await coordinators.quotes.async_config_entry_first_refresh()
+
+    coordinators.quotes.async_start_streaming()
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinators
 
     # Register update listener
     entry.async_on_unload(entry.add_update_listener(async_update_options))
@@ -32,13 +112,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return True
 
+def _disabled_unique_ids(hass, entry):
+    """Return the unique IDs of the entry's entities disabled in the registry."""
+    return {
+        registry_entry.unique_id
+        for registry_entry in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        if registry_entry.disabled_by
+    }
+
+def _fundamentals_groups(groups):
+    """Return the groups of fundamentals needed per symbol."""
+    return {symbol: needed - {"news", "history"} for symbol, needed in groups.items()}
+
+def _symbols_needing(groups, group):
+    """Return the symbols that need a data group."""
+    return [symbol for symbol, needed in groups.items() if group in needed]
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options in place.
+
+    Only the entities of added or removed symbols and sensor types are
+    added or removed, and only new symbols and data groups are fetched;
+    everything else keeps its data. Toggling streaming, or changing the
+    symbols while streaming, reloads the entry.
+    """
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    old = coordinators.conf
+    conf = {**entry.data, **entry.options}
+    symbols = conf.get(CONF_SYMBOLS, {})
+    streaming = conf.get(CONF_STREAMING, False)
+    if streaming != old.get(CONF_STREAMING, False) or (
+        streaming and symbols.keys() != old.get(CONF_SYMBOLS, {}).keys()
+    ):
+        # The stream subscribes its symbols once
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinators.conf = conf
+    async_get_hub(hass).limiter.async_add_budget(
+        entry.entry_id, conf.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+    )
+    groups = coordinators.groups = required_data_groups(conf, symbols, _disabled_unique_ids(hass, entry))
+    new = (
+        (coordinators.fundamentals, coordinators.fundamentals.async_set_groups(_fundamentals_groups(groups))),
+        (coordinators.news, coordinators.news.async_set_symbols(_symbols_needing(groups, "news"))),
+        (coordinators.history, coordinators.history.async_set_symbols(_symbols_needing(groups, "history"))),
+    )
+    coordinators.quotes.async_reconfigure(
+        symbols,
+        conf.get(CONF_SCAN_INTERVAL, 120),
+        conf.get(CONF_ECO_THRESHOLD, 600),
+        conf.get(CONF_BASE_CURRENCY, "USD"),
+        conf.get(CONF_EXT_HOURS, False),
+        conf.get(CONF_SYMBOL_INTERVALS, {}),
+        conf.get(CONF_SYMBOL_COSTS, {}),
+    )
+    await async_update_entities(hass, entry.entry_id, coordinators)
+
+    for coordinator, new_symbols in new:
+        if new_symbols:
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh_symbols(new_symbols), f"{coordinator.name}_new_symbols"
+            )
+    # New symbols are due, all others were fetched recently
+    await coordinators.quotes.async_refresh()
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            # The last entry is gone; the hub is shared, so it goes only now
+            await async_remove_hub(hass)
 
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a deleted config entry."""
+    await YahooFinanceCache(hass, entry.entry_id).async_remove()
@@ -0,0 +1,375 @@
+"""Async Yahoo Finance client."""
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+
+import aiohttp
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import (
+    CHART_URL,
+    COOKIE_URL,
+    CRUMB_URL,
+    LATENCY_SAMPLES,
+    NEWS_COUNT,
+    NEWS_URL,
+    QUOTE_FIELDS,
+    QUOTE_SUMMARY_URL,
+    QUOTE_URL,
+    RATE_LIMIT_STATUS_CODES,
+    REQUEST_TIMEOUT,
+    get_headers,
+)
+from .records import QuoteRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# quoteSummary modules holding each group of fundamentals
+FUNDAMENTAL_MODULES = {
+    "dividends": ("summaryDetail",),
+    "valuation": ("summaryDetail", "defaultKeyStatistics"),
+    "earnings": ("calendarEvents",),
+    "esg": ("esgScores",),
+}
+
+
+class RateLimitedError(Exception):
+    """Yahoo answered with a rate limit (HTTP 429 or 999)."""
+
+
+class EndpointMetrics:
+    """Request counters and recent latencies of one endpoint."""
+
+    __slots__ = ("requests", "errors", "rate_limited", "bytes", "seconds", "latencies")
+
+    def __init__(self):
+        """Initialize."""
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def percentile(self, percent):
+        """Return a latency percentile of the recent requests in ms, or None."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, round(percent / 100 * (len(latencies) - 1)))
+        return round(latencies[index] * 1000)
+
+    def as_dict(self):
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 2),
+            "latency_ms": {f"p{p}": self.percentile(p) for p in (50, 90, 99)},
+        }
+
+
+def modules_for(groups):
+    """Return the quoteSummary modules needed for groups of fundamentals."""
+    return sorted({module for group in groups for module in FUNDAMENTAL_MODULES.get(group, ())})
+
+
+class YahooFinanceClient:
+    """Fetch Yahoo Finance data without blocking the event loop.
+
+    Requests run on a session sharing Home Assistant's pooled connector, so
+    connections are kept alive and responses are compressed. The session has
+    its own cookie jar for the consent cookie, and the crumb Yahoo requires
+    is fetched once and reused until Yahoo rejects it. The endpoint URLs are
+    attributes so the client can be pointed at a local stub server.
+    """
+
+    cookie_url = COOKIE_URL
+    crumb_url = CRUMB_URL
+    quote_url = QUOTE_URL
+    chart_url = CHART_URL
+    quote_summary_url = QUOTE_SUMMARY_URL
+    news_url = NEWS_URL
+
+    def __init__(self, hass, session=None, timeout=REQUEST_TIMEOUT):
+        """Initialize."""
+        self.hass = hass
+        self._session = session
+        # Only a session we created is ours to close
+        self._owns_session = session is None
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._headers = get_headers()
+        self._crumb = None
+        self._crumb_lock = asyncio.Lock()
+        # Metrics
+        self.endpoints = {}
+        self.crumb_refreshes = 0
+
+    @property
+    def session(self):
+        """Return the client session, creating it on first use."""
+        if self._session is None:
+            # Shared by all entries, so not tied to the entry that happened to create it
+            self._session = async_create_clientsession(self.hass, auto_cleanup=False)
+        return self._session
+
+    async def async_close(self):
+        """Release the session if we created it."""
+        if self._owns_session and self._session is not None:
+            # Home Assistant's connector is shared, detaching leaves it open
+            self._session.detach()
+            self._session = None
+
+    async def _async_get_crumb(self, stale=None):
+        """Return the crumb, fetching a new one if there is none or it is stale."""
+        async with self._crumb_lock:
+            if self._crumb is not None and self._crumb != stale:
+                return self._crumb
+            # Any answer from the cookie URL sets the cookie, even an error page
+            await self._async_request("cookie", self.cookie_url, check=False)
+            _, body = await self._async_request("crumb", self.crumb_url)
+            crumb = body.decode(errors="replace").strip() if body else ""
+            if not crumb or "<" in crumb:
+                raise aiohttp.ClientError("Yahoo did not return a crumb")
+            _LOGGER.debug("Fetched a new Yahoo crumb")
+            self.crumb_refreshes += 1
+            self._crumb = crumb
+            return crumb
+
+    async def _async_request(self, endpoint, url, params=None, headers=None, check=True):
+        """Run one GET and record it in the metrics of the endpoint.
+
+        Returns (response, body); the body is None for 304 Not Modified and
+        for 401/403, which the caller handles. Unless check is False, other
+        error answers raise, rate limits as RateLimitedError.
+        """
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        metrics.requests += 1
+        start = asyncio.get_running_loop().time()
+        try:
+            async with self.session.get(
+                url, params=params, headers=headers or self._headers, timeout=self._timeout
+            ) as response:
+                if response.status in RATE_LIMIT_STATUS_CODES:
+                    metrics.rate_limited += 1
+                    raise RateLimitedError(f"HTTP {response.status} from {url}")
+                if response.status in (304, 401, 403):
+                    return response, None
+                if check:
+                    response.raise_for_status()
+                body = await response.read()
+        except RateLimitedError:
+            raise
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            elapsed = asyncio.get_running_loop().time() - start
+            metrics.seconds += elapsed
+            metrics.latencies.append(elapsed)
+        metrics.bytes += len(body)
+        return response, body
+
+    async def _async_get(self, endpoint, url, params=None, etag=None):
+        """GET a Yahoo endpoint with the crumb.
+
+        Returns (ETag, body), the body is None if Yahoo answered 304 Not Modified.
+        Raises RateLimitedError if Yahoo is rate limiting us.
+        """
+        headers = {**self._headers, "If-None-Match": etag} if etag else self._headers
+        crumb = await self._async_get_crumb()
+        for attempt in range(2):
+            response, body = await self._async_request(
+                endpoint, url, {**(params or {}), "crumb": crumb}, headers
+            )
+            if response.status in (401, 403):
+                if attempt:
+                    break
+                # The crumb expired, get a new one and retry once
+                crumb = await self._async_get_crumb(stale=crumb)
+                continue
+            if body is None:
+                return etag, None
+            return response.headers.get("ETag"), body
+        raise aiohttp.ClientError(f"Yahoo rejected the crumb for {url}")
+
+    async def async_get_json(self, endpoint, url, params=None):
+        """GET a Yahoo JSON endpoint and decode the answer."""
+        _, body = await self._async_get(endpoint, url, params)
+        return json.loads(body)
+
+    async def async_get_json_if_changed(self, endpoint, url, params=None, version=None):
+        """GET a Yahoo JSON endpoint, skipping the decode if nothing changed.
+
+        version is what the previous call for the same request returned: the
+        ETag, sent as If-None-Match, and a digest of the body for when Yahoo
+        ignores it. Returns (version, data), data is None if unchanged.
+        """
+        etag, digest = version or (None, None)
+        new_etag, body = await self._async_get(endpoint, url, params, etag)
+        if body is None:
+            return version, None
+        new_digest = hashlib.blake2b(body, digest_size=16).digest()
+        if new_digest == digest:
+            return (new_etag, digest), None
+        return (new_etag, new_digest), json.loads(body)
+
+    async def async_fetch_quotes(self, symbols):
+        """Fetch raw quotes for symbols with one multi-symbol request.
+
+        Returns a dict of symbol -> raw quote.
+        """
+        if not symbols:
+            return {}
+        response = await self.async_get_json(
+            "quote", self.quote_url, {"symbols": ",".join(symbols), "fields": ",".join(QUOTE_FIELDS)}
+        )
+        results = (response.get("quoteResponse") or {}).get("result") or []
+        quotes = {raw["symbol"]: raw for raw in results if raw.get("symbol")}
+        _LOGGER.debug("Fetched %d quotes for %d symbols", len(quotes), len(symbols))
+        return quotes
+
+    async def async_fetch_chart(self, symbol, range_="1y", interval="1d"):
+        """Fetch OHLCV bars of one symbol.
+
+        Returns a dict with a timestamp list and one list per field, None for gaps.
+        """
+        response = await self.async_get_json(
+            "chart", self.chart_url.format(symbol=symbol), {"range": range_, "interval": interval}
+        )
+        results = (response.get("chart") or {}).get("result") or []
+        if not results:
+            return {}
+        result = results[0]
+        quote = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+        return {"timestamp": result.get("timestamp") or [], **quote}
+
+    async def async_fetch_fundamentals(self, symbol, modules, version=None):
+        """Fetch the fundamentals of one symbol from the given quoteSummary modules.
+
+        Returns (version, fundamentals), fundamentals is None if unchanged since version.
+        """
+        version, response = await self.async_get_json_if_changed(
+            "quoteSummary",
+            self.quote_summary_url.format(symbol=symbol),
+            {"modules": ",".join(modules)},
+            version,
+        )
+        if response is None:
+            return version, None
+        results = (response.get("quoteSummary") or {}).get("result") or []
+        return version, parse_fundamentals(results[0] if results else {})
+
+    async def async_fetch_news(self, symbol, version=None):
+        """Fetch the latest raw news items of one symbol.
+
+        Returns (version, items), items is None if unchanged since version.
+        """
+        version, response = await self.async_get_json_if_changed(
+            "news", self.news_url, {"q": symbol, "quotesCount": 0, "newsCount": NEWS_COUNT}, version
+        )
+        if response is None:
+            return version, None
+        return version, response.get("news") or []
+
+    @property
+    def metrics(self):
+        """Return request metrics per endpoint for diagnostics."""
+        return {
+            "crumb_refreshes": self.crumb_refreshes,
+            "endpoints": {name: metrics.as_dict() for name, metrics in self.endpoints.items()},
+        }
+
+
+def _raw(value):
+    """Unwrap a quoteSummary value ({"raw": ..., "fmt": ...})."""
+    if isinstance(value, dict):
+        return value.get("raw")
+    return value
+
+
+def parse_fundamentals(summary):
+    """Convert quoteSummary modules into the fundamentals dict."""
+    detail = summary.get("summaryDetail") or {}
+    stats = summary.get("defaultKeyStatistics") or {}
+    esg = summary.get("esgScores") or {}
+    earnings = ((summary.get("calendarEvents") or {}).get("earnings") or {}).get("earningsDate") or []
+    next_earnings = _raw(earnings[0]) if earnings else None
+    # Professional Metrics
+    return {
+        "dividendYield": _raw(detail.get("dividendYield")),
+        "exDividendDate": _raw(detail.get("exDividendDate")),
+        "nextEarningsDate": (
+            datetime.fromtimestamp(next_earnings, timezone.utc).date().isoformat()
+            if next_earnings else None
+        ),
+        "forwardPE": _raw(detail.get("forwardPE")) or _raw(stats.get("forwardPE")),
+        "trailingPE": _raw(detail.get("trailingPE")),
+        "beta": _raw(detail.get("beta")) or _raw(stats.get("beta")),
+        "totalEsg": _raw(esg.get("totalEsg")),
+        "environmentScore": _raw(esg.get("environmentScore")),
+        "socialScore": _raw(esg.get("socialScore")),
+        "governanceScore": _raw(esg.get("governanceScore")),
+        "trailingAnnualDividendRate": _raw(detail.get("trailingAnnualDividendRate")),
+    }
+
+
+def parse_news(items):
+    """Convert raw news items into articles keyed by their ID."""
+    return {
+        item.get("uuid") or item.get("link"): {
+            "title": item["title"],
+            "link": item.get("link"),
+            "published": item.get("providerPublishTime") or 0,
+        }
+        for item in items
+        if item.get("title")
+    }
+
+
+def parse_quote(raw, ext_hours=False):
+    """Convert a raw quote into the per-symbol record used by the coordinator."""
+    symbol = raw.get("symbol")
+    price = raw.get("regularMarketPrice")
+    previous_close = raw.get("regularMarketPreviousClose")
+    change_percent = 0
+    if price and previous_close:
+        change_percent = (price - previous_close) / previous_close * 100
+
+    # Auto-switch to Extended Hours price if enabled and market is not OPEN
+    state = raw.get("marketState")
+    if ext_hours:
+        if state == "PRE" and raw.get("preMarketPrice"):
+            price = raw.get("preMarketPrice")
+        elif state in ("POST", "POSTPOST", "CLOSED") and raw.get("postMarketPrice"):
+            price = raw.get("postMarketPrice")
+
+    return QuoteRecord(
+        symbol=symbol,
+        regularMarketPrice=price,
+        currency=raw.get("currency"),
+        marketCap=raw.get("marketCap"),
+        longName=raw.get("longName") or raw.get("shortName") or symbol,
+        shortName=raw.get("shortName") or symbol,
+        regularMarketChangePercent=change_percent,
+        previousClose=previous_close,
+        dayHigh=raw.get("regularMarketDayHigh"),
+        dayLow=raw.get("regularMarketDayLow"),
+        open=raw.get("regularMarketOpen"),
+        volume=raw.get("regularMarketVolume"),
+        yearHigh=raw.get("fiftyTwoWeekHigh"),
+        yearLow=raw.get("fiftyTwoWeekLow"),
+        marketState=state,
+        preMarketPrice=raw.get("preMarketPrice"),
+        postMarketPrice=raw.get("postMarketPrice"),
+        exchange=raw.get("exchange"),
+        exchangeTimezoneName=raw.get("exchangeTimezoneName"),
+        quoteType=raw.get("quoteType"),
+    )
@@ -0,0 +1,95 @@
+"""Persistent cache of coordinator data for the Yahoo Finance integration."""
+import logging
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION, STORAGE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class YahooFinanceCache:
+    """Keep the last data of each coordinator on disk so restarts start warm.
+
+    Every section (quotes, fundamentals, news, fx) is stored together with the
+    time it was written, so callers can decide whether it is still fresh.
+    """
+
+    def __init__(self, hass, entry_id):
+        """Initialize."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._sections = {}
+        # Section -> function converting its data to JSON when saved
+        self._encoders = {}
+        # Metrics: sections found fresh, found stale and missing
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+    async def async_load(self):
+        """Load the cache from disk."""
+        try:
+            self._sections = await self._store.async_load() or {}
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not load cached data, starting cold: %s", ex)
+            self._sections = {}
+
+    def get(self, key, ttl):
+        """Return (data, fresh) for a section, or (None, False) if missing.
+
+        Data older than ttl seconds is still returned but marked as not fresh.
+        """
+        section = self._sections.get(key)
+        if not section:
+            self.misses += 1
+            return None, False
+        age = time.time() - section.get("updated", 0)
+        if age < ttl:
+            self.hits += 1
+        else:
+            self.stale += 1
+        return section.get("data"), age < ttl
+
+    @callback
+    def async_set(self, key, data, encode=None):
+        """Store a section and schedule a save.
+
+        Data that isn't JSON needs an encode function; it only runs when the
+        cache is actually saved, not on every update.
+        """
+        self._sections[key] = {"updated": time.time(), "data": data}
+        if encode is not None:
+            self._encoders[key] = encode
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self):
+        """Return the sections with their data encoded as JSON."""
+        return {
+            key: {**section, "data": self._encoders[key](section["data"])}
+            if key in self._encoders else section
+            for key, section in self._sections.items()
+        }
+
+    async def async_flush(self):
+        """Write pending changes to disk."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """Remove the cache file."""
+        await self._store.async_remove()
+
+    @property
+    def metrics(self):
+        """Return lookup counters and section ages for diagnostics."""
+        now = time.time()
+        return {
+            "hits": self.hits,
+            "stale": self.stale,
+            "misses": self.misses,
+            "section_age_seconds": {
+                key: round(now - section.get("updated", 0))
+                for key, section in self._sections.items()
+            },
+        }
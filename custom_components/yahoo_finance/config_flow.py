@@ -3,8 +3,6 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-import yfinance as yf
-import requests
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
@@ -13,6 +11,8 @@ from homeassistant.helpers import config_validation as cv
 from .const import (
     DOMAIN, 
     CONF_SYMBOLS, 
+    CONF_SYMBOL_INTERVALS,
+    CONF_SYMBOL_COSTS,
     CONF_SHOW_CHANGE_PCT, 
     CONF_SHOW_HIGH, 
     CONF_SHOW_LOW, 
@@ -29,10 +29,15 @@ from .const import (
     CONF_ECO_THRESHOLD,
     CONF_BASE_CURRENCY,
     CONF_EXT_HOURS,
+    CONF_STREAMING,
     CONF_SHOW_ESG,
     CONF_SHOW_PERFORMANCE,
     CONF_SHOW_MARKET_STATUS,
-    get_headers
+    CONF_REQUEST_BUDGET,
+    CONF_SHOW_DIAGNOSTICS,
+    DEFAULT_REQUEST_BUDGET,
+    MIN_UPDATE_INTERVAL,
+    POLLING_TIERS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -56,9 +61,12 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Optional(CONF_SHOW_PERFORMANCE, default=False): bool,
         vol.Optional(CONF_SHOW_MARKET_STATUS, default=False): bool,
         vol.Optional(CONF_EXT_HOURS, default=False): bool,
+        vol.Optional(CONF_STREAMING, default=False): bool,
         vol.Optional(CONF_BASE_CURRENCY, default="USD"): vol.In(["USD", "EUR", "CHF", "GBP", "JPY", "CAD", "AUD"]),
         vol.Optional(CONF_SCAN_INTERVAL, default=120): vol.All(vol.Coerce(int), vol.Range(min=30)),
         vol.Optional(CONF_ECO_THRESHOLD, default=600): vol.All(vol.Coerce(int), vol.Range(min=60)),
+        vol.Optional(CONF_REQUEST_BUDGET, default=DEFAULT_REQUEST_BUDGET): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_SHOW_DIAGNOSTICS, default=False): bool,
     }
 )
 
@@ -71,12 +79,17 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     
     # We disable API validation here to avoid 429/Blocking calls during setup
     # Just check if the symbols look like valid ticker symbols
-    # Support format SYMBOL:AMOUNT (e.g. AAPL:10)
+    # Support format SYMBOL:AMOUNT (e.g. AAPL:10) with an optional cost basis
+    # per share (e.g. AAPL:10:150) and refresh tier in seconds or by name
+    # (e.g. AAPL:10@30, MSFT@SLOW)
     symbol_definitions = {}
+    symbol_intervals = {}
+    symbol_costs = {}
     for entry in raw_symbols:
         if not entry:
             continue
-            
+
+        entry, _, tier = entry.partition("@")
         parts = entry.split(":")
         symbol = parts[0].strip()
         amount = 0.0
@@ -86,9 +99,31 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
                 amount = float(parts[1].strip())
             except ValueError:
                  _LOGGER.warning("Invalid amount for symbol %s: %s", symbol, parts[1])
+
+        cost = None
+        if len(parts) > 2:
+            try:
+                cost = float(parts[2].strip())
+            except ValueError:
+                 _LOGGER.warning("Invalid cost basis for symbol %s: %s", symbol, parts[2])
         
+        interval = None
+        if tier:
+            tier = tier.strip().upper()
+            if tier in POLLING_TIERS:
+                interval = POLLING_TIERS[tier]
+            else:
+                try:
+                    interval = max(MIN_UPDATE_INTERVAL, int(tier))
+                except ValueError:
+                    _LOGGER.warning("Invalid refresh tier for symbol %s: %s", symbol, tier)
+
         if symbol and all(c.isalnum() or c in "-.=_" for c in symbol):
             symbol_definitions[symbol] = amount
+            if interval:
+                symbol_intervals[symbol] = interval
+            if cost is not None:
+                symbol_costs[symbol] = cost
             
     if not symbol_definitions:
         raise vol.Invalid("invalid_symbols")
@@ -96,6 +131,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     return {
         "title": ", ".join(symbol_definitions.keys()), 
         CONF_SYMBOLS: symbol_definitions,
+        CONF_SYMBOL_INTERVALS: symbol_intervals,
+        CONF_SYMBOL_COSTS: symbol_costs,
         CONF_SHOW_CHANGE_PCT: data.get(CONF_SHOW_CHANGE_PCT, True),
         CONF_SHOW_HIGH: data.get(CONF_SHOW_HIGH, True),
         CONF_SHOW_LOW: data.get(CONF_SHOW_LOW, True),
@@ -110,9 +147,12 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         CONF_SHOW_PERFORMANCE: data.get(CONF_SHOW_PERFORMANCE, False),
         CONF_SHOW_MARKET_STATUS: data.get(CONF_SHOW_MARKET_STATUS, False),
         CONF_EXT_HOURS: data.get(CONF_EXT_HOURS, False),
+        CONF_STREAMING: data.get(CONF_STREAMING, False),
         CONF_BASE_CURRENCY: data.get(CONF_BASE_CURRENCY, "USD"),
         CONF_SCAN_INTERVAL: data.get(CONF_SCAN_INTERVAL, 120),
         CONF_ECO_THRESHOLD: data.get(CONF_ECO_THRESHOLD, 600),
+        CONF_REQUEST_BUDGET: data.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET),
+        CONF_SHOW_DIAGNOSTICS: data.get(CONF_SHOW_DIAGNOSTICS, False),
     }
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -170,12 +210,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         current_symbols_dict = self.config_entry.options.get(
             CONF_SYMBOLS, self.config_entry.data.get(CONF_SYMBOLS, {})
         )
+        current_intervals = self.config_entry.options.get(
+            CONF_SYMBOL_INTERVALS, self.config_entry.data.get(CONF_SYMBOL_INTERVALS, {})
+        )
+        current_costs = self.config_entry.options.get(
+            CONF_SYMBOL_COSTS, self.config_entry.data.get(CONF_SYMBOL_COSTS, {})
+        )
         symbol_list = []
         for sym, amt in current_symbols_dict.items():
-            if amt > 0:
-                symbol_list.append(f"{sym}:{amt}")
-            else:
-                symbol_list.append(sym)
+            text = f"{sym}:{amt}" if amt > 0 else sym
+            if sym in current_costs:
+                text = f"{sym}:{amt}:{current_costs[sym]}"
+            if sym in current_intervals:
+                text = f"{text}@{current_intervals[sym]}"
+            symbol_list.append(text)
         
         symbols_string = ", ".join(symbol_list)
 
@@ -294,6 +342,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         self.config_entry.data.get(CONF_EXT_HOURS, False)
                     )
                 ): bool,
+                vol.Optional(
+                    CONF_STREAMING, 
+                    default=self.config_entry.options.get(
+                        CONF_STREAMING, 
+                        self.config_entry.data.get(CONF_STREAMING, False)
+                    )
+                ): bool,
                 vol.Optional(
                     CONF_BASE_CURRENCY, 
                     default=self.config_entry.options.get(
@@ -315,6 +370,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         self.config_entry.data.get(CONF_ECO_THRESHOLD, 600)
                     )
                 ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Optional(
+                    CONF_REQUEST_BUDGET, 
+                    default=self.config_entry.options.get(
+                        CONF_REQUEST_BUDGET, 
+                        self.config_entry.data.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+                    )
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_SHOW_DIAGNOSTICS, 
+                    default=self.config_entry.options.get(
+                        CONF_SHOW_DIAGNOSTICS, 
+                        self.config_entry.data.get(CONF_SHOW_DIAGNOSTICS, False)
+                    )
+                ): bool,
             }
         )
 
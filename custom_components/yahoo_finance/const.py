@@ -1,10 +1,24 @@
 import random
 
 DOMAIN = "yahoo_finance"
+DATA_HUB = f"{DOMAIN}_hub"
 DEFAULT_SCAN_INTERVAL = 120
 MIN_UPDATE_INTERVAL = 30
 
+# Named polling tiers usable as SYMBOL@TIER (seconds)
+POLLING_TIERS = {
+    "FAST": MIN_UPDATE_INTERVAL,
+    "NORMAL": DEFAULT_SCAN_INTERVAL,
+    "SLOW": 900,
+}
+
+# Market calendar: wake up shortly after the next open, re-check at least this often
+MARKET_OPEN_DELAY = 60
+MAX_IDLE_INTERVAL = 21600
+
 CONF_SYMBOLS = "symbols"
+CONF_SYMBOL_INTERVALS = "symbol_intervals"
+CONF_SYMBOL_COSTS = "symbol_costs"
 CONF_SHOW_CHANGE_PCT = "show_change_pct"
 CONF_SHOW_HIGH = "show_high"
 CONF_SHOW_LOW = "show_low"
@@ -24,6 +38,82 @@ CONF_EXT_HOURS = "ext_hours"
 CONF_SHOW_ESG = "show_esg"
 CONF_SHOW_PERFORMANCE = "show_performance"
 CONF_SHOW_MARKET_STATUS = "show_market_status"
+CONF_REQUEST_BUDGET = "request_budget"
+CONF_STREAMING = "streaming"
+CONF_SHOW_DIAGNOSTICS = "show_diagnostics"
+
+# Bulk quote endpoint: one request returns quotes for many symbols
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+# Symbols per bulk quote request: starts at QUOTE_CHUNK_SIZE and adapts to
+# how fast Yahoo answers, with up to QUOTE_CHUNK_CONCURRENCY chunks in flight
+QUOTE_CHUNK_SIZE = 100
+QUOTE_CHUNK_MIN = 20
+QUOTE_CHUNK_MAX = 250
+QUOTE_CHUNK_STEP = 25
+QUOTE_CHUNK_TARGET_LATENCY = 2.0
+QUOTE_CHUNK_CONCURRENCY = 4
+# Only the quote fields parse_quote reads are requested
+QUOTE_FIELDS = (
+    "regularMarketPrice", "regularMarketPreviousClose",
+    "regularMarketDayHigh", "regularMarketDayLow", "regularMarketOpen", "regularMarketVolume",
+    "currency", "marketCap", "longName", "shortName", "fiftyTwoWeekHigh", "fiftyTwoWeekLow",
+    "marketState", "preMarketPrice", "postMarketPrice", "exchange", "exchangeTimezoneName",
+    "quoteType",
+)
+
+# Daily price history for locally computed indicators
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+HISTORY_MIN_BARS = 200  # for the 200-day average; bars back to the last year-end are kept too
+HISTORY_UPDATE_INTERVAL = 3600
+
+# Streaming: push prices over a websocket, polling only for the slower fields
+STREAM_URL = "wss://streamer.finance.yahoo.com/?version=2"
+STREAM_RECONNECT_BASE = 5
+STREAM_RECONNECT_MAX = 300
+STREAM_POLL_INTERVAL = 900
+
+# Rate limiting: requests per minute shared by all entries, backoff in seconds
+DEFAULT_REQUEST_BUDGET = 60
+RATE_LIMIT_STATUS_CODES = (429, 999)
+RATE_LIMIT_BACKOFF_BASE = 60
+RATE_LIMIT_BACKOFF_MAX = 1800
+
+# Cookie and crumb Yahoo requires for its JSON endpoints
+COOKIE_URL = "https://fc.yahoo.com"
+CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+NEWS_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+NEWS_COUNT = 5
+REQUEST_TIMEOUT = 20
+# Latencies kept per endpoint for the percentiles in diagnostics
+LATENCY_SAMPLES = 200
+
+# Per-symbol fault isolation: transient failures are retried after a short
+# delay, symbols failing this often in a row are skipped for a growing time
+RETRY_DELAY = 60
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_BASE = 900
+CIRCUIT_BREAKER_MAX = 86400
+
+# Slow data (fundamentals, news) is fetched per symbol with bounded parallelism
+DEFAULT_SLOW_CONCURRENCY = 4
+SLOW_FETCH_TIMEOUT = 30
+
+# Refresh intervals (seconds) of the coordinators besides quotes
+FUNDAMENTALS_UPDATE_INTERVAL = 21600  # 6 hours
+NEWS_UPDATE_INTERVAL = 3600
+FX_UPDATE_INTERVAL = 600
+
+# FX: pairs are quoted against one hub currency and fetched with the quotes,
+# everything else is triangulated; rates older than the TTL are not used
+FX_HUB_CURRENCY = "USD"
+FX_RATE_TTL = 86400
+MAX_BACKOFF_INTERVAL = 3600
+
+# Persistent cache so restarts start from warm data
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+QUOTES_CACHE_TTL = 86400  # cached prices are shown until the first refresh
 
 USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -39,9 +129,7 @@ def get_headers():
         "User-Agent": random.choice(USER_AGENTS),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
         "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
+        # aiohttp negotiates compression and keeps connections alive itself
         "Cache-Control": "max-age=0",
         "Referer": "https://finance.yahoo.com/",
         "DNT": "1",
@@ -1,253 +1,906 @@
 """DataUpdateCoordinator for Yahoo Finance integration."""
-import datetime
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import timedelta
 import logging
+import time
+from typing import TYPE_CHECKING
 
-import yfinance as yf
-import requests
-import asyncio
-import random
+import aiohttp
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .api import RateLimitedError, modules_for, parse_news, parse_quote
 from .const import (
-    DOMAIN, 
-    DEFAULT_SCAN_INTERVAL, 
-    MIN_UPDATE_INTERVAL, 
-    CONF_SCAN_INTERVAL, 
-    CONF_ECO_THRESHOLD, 
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_CONCURRENCY,
+    SLOW_FETCH_TIMEOUT,
+    FUNDAMENTALS_UPDATE_INTERVAL,
+    NEWS_COUNT,
+    NEWS_UPDATE_INTERVAL,
+    FX_UPDATE_INTERVAL,
+    FX_RATE_TTL,
+    HISTORY_UPDATE_INTERVAL,
+    MAX_BACKOFF_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    MARKET_OPEN_DELAY,
+    MAX_IDLE_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_ECO_THRESHOLD,
     CONF_BASE_CURRENCY,
     CONF_EXT_HOURS,
-    get_headers
+    STREAM_POLL_INTERVAL,
 )
+from .fx import FxGraph
+from .health import SymbolHealth
+from .history import SymbolHistory, encode_histories
+from .hub import async_get_hub
+from .portfolio import PortfolioEngine
+from .records import QuoteRecord, encode_snapshot
+from .market_hours import SESSION_EXTENDED, SESSION_REGULAR, get_market
+from .streaming import YahooFinanceStreamer, apply_pricing
+
+if TYPE_CHECKING:
+    from .cache import YahooFinanceCache
 
 _LOGGER = logging.getLogger(__name__)
 
-# Global cooldown for 429 errors
-_LAST_429_TIME = 0
-_COOLDOWN_DURATION = 300  # 5 minutes
 
-class YahooFinanceDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Yahoo Finance data."""
+@dataclass
+class YahooFinanceCoordinators:
+    """Coordinators belonging to one config entry."""
+
+    quotes: "YahooFinanceDataUpdateCoordinator"
+    fundamentals: "YahooFinanceFundamentalsCoordinator"
+    news: "YahooFinanceNewsCoordinator"
+    history: "YahooFinanceHistoryCoordinator"
+    # Slow data groups fetched per symbol
+    groups: dict = field(default_factory=dict)
+    cache: "YahooFinanceCache | None" = None
+    # Options the coordinators and entities are set up with
+    conf: dict = field(default_factory=dict)
+    # Entities by unique ID and the callback adding more, set by the sensor platform
+    entities: dict = field(default_factory=dict)
+    async_add_entities: "Callable | None" = None
+    # Entity state writes, and updates that didn't write because nothing changed
+    state_writes: int = 0
+    skipped_writes: int = 0
+
+    @property
+    def all(self):
+        """Return all coordinators."""
+        return (self.quotes, self.fundamentals, self.news, self.history)
+
+
+class YahooFinanceBaseCoordinator(DataUpdateCoordinator):
+    """Shared rate limit and backoff handling for all Yahoo Finance coordinators.
 
-    def __init__(self, hass, symbol_definitions, scan_interval=DEFAULT_SCAN_INTERVAL, eco_threshold=600, base_currency="USD", ext_hours=False):
+    Subclasses implement _async_fetch and return None when the fetch failed,
+    in which case the previous data is kept and the interval is backed off.
+    Symbols failing on their own are handled per symbol by self.health: they
+    are retried shortly after, or skipped for a while if they keep failing.
+    """
+
+    # Converts data that isn't JSON for the cache
+    _encode = None
+
+    def __init__(self, hass, name, update_interval, cache=None, cache_key=None):
         """Initialize."""
-        self.symbol_definitions = symbol_definitions
-        self.symbols = list(symbol_definitions.keys())
-        self.scan_interval = scan_interval
-        self.eco_threshold = eco_threshold
-        self.base_currency = base_currency
-        self.ext_hours = ext_hours
-        self._slow_update_interval = 21600  # 6 hours
-        self._last_slow_update = 0
+        self._base_interval = timedelta(seconds=update_interval)
+        self._failures = 0
+        self._cache = cache
+        self._cache_key = cache_key
+        # Keys whose data changed in the last update, None to notify everyone
+        self._changed = None
+        self._notified_success = None
+        self.hub = async_get_hub(hass)
+        self.health = SymbolHealth(name)
+        self._unsub_retry = None
+
+        # Metrics
+        self.updates = 0
+        self.failed_updates = 0
+        self.skipped_updates = 0
+        self.unchanged_payloads = 0
+        self.last_duration = None
+        self.last_succeeded = 0
+        self.last_failed = 0
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
+            name=name,
+            update_interval=self._base_interval,
         )
-        self._last_update_success_time = 0
-        self._fx_rates = {}
+
+    @callback
+    def async_restore(self, ttl):
+        """Seed data from the persistent cache.
+
+        Returns True if the cached data is younger than ttl seconds and
+        covers every symbol.
+        """
+        if self._cache is None:
+            return False
+        data, fresh = self._cache.get(self._cache_key, ttl)
+        if data is None:
+            return False
+        self.data = data
+        return fresh and all(symbol in data for symbol in self.symbols)
+
+    async def _async_fetch(self, symbols=None):
+        """Fetch fresh data for symbols (default all), or return None on failure."""
+        raise NotImplementedError
+
+    async def async_shutdown(self):
+        """Cancel a pending retry on unload."""
+        if self._unsub_retry:
+            self._unsub_retry()
+            self._unsub_retry = None
+        await super().async_shutdown()
+
+    @callback
+    def _async_schedule_retry(self):
+        """Schedule the retry of the symbols in the retry queue."""
+        if self._unsub_retry:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if (retry_at := self.health.next_retry) is not None:
+            self._unsub_retry = async_call_later(
+                self.hass, max(0, retry_at - time.monotonic()), self._async_retry
+            )
+
+    async def _async_retry(self, _now):
+        """Fetch only the symbols whose retry is due and merge them in."""
+        self._unsub_retry = None
+        if self.data is not None:
+            await self.async_refresh_symbols(self.health.pop_retries())
+        self._async_schedule_retry()
+
+    async def async_refresh_symbols(self, symbols):
+        """Fetch only the given symbols and merge them into the data."""
+        # While backing off they wait for the next regular update instead
+        if not symbols or self.hub.limiter.backoff_remaining:
+            return
+        _LOGGER.debug("Fetching %s for %d symbols", self.name, len(symbols))
+        data = await self._async_fetch(symbols)
+        if data is not None and data is not self.data:
+            # Not async_set_updated_data: that would postpone the regular update
+            self._changed = self._diff(self.data, data)
+            self.data = data
+            if self._cache is not None:
+                self._cache.async_set(self._cache_key, data, self._encode)
+            self.async_update_listeners()
+
+    @callback
+    def async_set_symbols(self, symbols):
+        """Change the symbols in place. Returns the new symbols, which need a fetch."""
+        new = [symbol for symbol in symbols if symbol not in self.symbols]
+        self.symbols = list(symbols)
+        self._async_drop_removed()
+        return new
+
+    @callback
+    def _async_drop_removed(self):
+        """Forget the data of symbols that are no longer configured."""
+        if self.data and self.data.keys() - set(self.symbols):
+            self.data = {symbol: val for symbol, val in self.data.items() if symbol in self.symbols}
 
     async def _async_update_data(self):
-        """Fetch data from Yahoo Finance."""
-        global _LAST_429_TIME
-        
-        # Check if we are in cooldown
-        if asyncio.get_event_loop().time() < _LAST_429_TIME + _COOLDOWN_DURATION:
-            _LOGGER.info("Skipping update due to recent 429 rate limit (cooling down)")
+        """Fetch data, backing off on failure."""
+        # Don't even try while the shared rate limiter is backing off
+        if backoff := self.hub.limiter.backoff_remaining:
+            _LOGGER.info("Skipping %s update, rate limit backoff for another %.0fs", self.name, backoff)
+            self.skipped_updates += 1
+            self._changed = set()
             return self.data if self.data else {}
 
-        # Check for minimum update interval to prevent spamming
-        now = asyncio.get_event_loop().time()
-        
-        # Eco-Mode Logic: Check if we are in off-market hours (Night or Weekend)
-        # Local time of the Home Assistant instance
-        local_now = datetime.datetime.now()
-        is_weekend = local_now.weekday() >= 5  # 5=Saturday, 6=Sunday
-        is_night = local_now.hour < 8 or local_now.hour >= 22
-        
-        current_threshold = MIN_UPDATE_INTERVAL
-        if is_weekend or is_night:
-            # Use configured eco-threshold
-            current_threshold = self.eco_threshold
-            
-        if now < self._last_update_success_time + current_threshold:
-             _LOGGER.debug("Skipping update due to %s interval limit (%ss)", "Eco-Mode" if current_threshold >= self.eco_threshold else "minimum", current_threshold)
-             return self.data if self.data else {}
-
-        # Determine if we should fetch slow data (earnings, etc.)
-        fetch_slow_data = False
-        if now > self._last_slow_update + self._slow_update_interval:
-            fetch_slow_data = True
-        def fetch_batch(symbols, fetch_slow, ext_hours=False, base_currency="USD"):
-            try:
-                # Add currency pairs to symbols if they are missing
-                all_request_symbols = list(symbols)
-                currencies_to_fetch = set()
-                
-                tickers = yf.Tickers(" ".join(all_request_symbols))
-                batch_data = {}
-                fx_rates = {}
-
-                for symbol in all_request_symbols:
-                    ticker = tickers.tickers.get(symbol)
-                    if not ticker: continue
-                    
-                    try:
-                        fast = ticker.fast_info
-                        
-                        # Basic Data
-                        data = {
-                            "regularMarketPrice": fast.last_price,
-                            "currency": fast.currency,
-                            "marketCap": fast.market_cap,
-                            "symbol": symbol,
-                            "longName": symbol,
-                            "regularMarketChangePercent": 0,
-                        }
-
-                        if fast.last_price and fast.previous_close:
-                            data["regularMarketChangePercent"] = ((fast.last_price - fast.previous_close) / fast.previous_close * 100)
-
-                        # Market State Logic
-                        # If fast info doesn't have it, we'll try to get it from info during slow fetch
-                        # but we can also infer it if pre/post prices exist
-                        
-                        if fetch_slow:
-                            info = ticker.info
-                            # Professional Metrics
-                            data.update({
-                                "longName": info.get("longName") or info.get("shortName") or symbol,
-                                "shortName": info.get("shortName") or symbol,
-                                "dividendYield": info.get("dividendYield"),
-                                "exDividendDate": info.get("exDividendDate"),
-                                "nextEarningsDate": info.get("nextEarningsDate"),
-                                "forwardPE": info.get("forwardPE"),
-                                "trailingPE": info.get("trailingPE"),
-                                "beta": info.get("beta"),
-                                "totalEsg": info.get("totalEsg"),
-                                "environmentScore": info.get("environmentScore"),
-                                "socialScore": info.get("socialScore"),
-                                "governanceScore": info.get("governanceScore"),
-                                "marketState": info.get("marketState"),
-                                "preMarketPrice": info.get("preMarketPrice"),
-                                "postMarketPrice": info.get("postMarketPrice"),
-                                "fiftyDayAverage": info.get("fiftyDayAverage"),
-                                "twoHundredDayAverage": info.get("twoHundredDayAverage"),
-                                "ytdReturn": info.get("ytdReturn"),
-                                "trailingAnnualDividendRate": info.get("trailingAnnualDividendRate"),
-                                "news": [
-                                    {
-                                        "title": n.get("content", {}).get("title"),
-                                        "link": n.get("content", {}).get("canonicalUrl", {}).get("url")
-                                    }
-                                    for n in (ticker.news[:5] if hasattr(ticker, "news") else [])
-                                    if n.get("content", {}).get("title")
-                                ],
-                            })
-                            
-                            # Auto-switch to Extended Hours price if enabled and market is not OPEN
-                            if ext_hours:
-                                state = info.get("marketState")
-                                if state == "PRE" and info.get("preMarketPrice"):
-                                    data["regularMarketPrice"] = info.get("preMarketPrice")
-                                elif (state == "POST" or state == "CLOSED") and info.get("postMarketPrice"):
-                                    data["regularMarketPrice"] = info.get("postMarketPrice")
-                            
-                            # Collect currencies for FX fetching
-                            if fast.currency and fast.currency != base_currency:
-                                currencies_to_fetch.add(f"{fast.currency}{base_currency}=X")
-
-                        batch_data[symbol] = data
-                    except Exception as e:
-                        _LOGGER.debug("Error extracting data for %s: %s", symbol, e)
-
-                # Fetch FX rates if any
-                if currencies_to_fetch:
-                    fx_tickers = yf.Tickers(" ".join(currencies_to_fetch))
-                    for fx_sym in currencies_to_fetch:
-                        try:
-                            fx_rates[fx_sym[:3]] = fx_tickers.tickers[fx_sym].fast_info.last_price
-                        except: pass
-
-                return batch_data, fetch_slow, fx_rates
-            except Exception as ex:
-                _LOGGER.warning("Batch fetch failed: %s", ex)
-                return None, False, {}
-
-        # Add a random delay before the batch request to be stealthy
-        await asyncio.sleep(random.uniform(2.0, 5.0))
-        
-        result, was_slow, fx_rates = await self.hass.async_add_executor_job(
-            fetch_batch, self.symbols, fetch_slow_data, self.ext_hours, self.base_currency
+        start = time.monotonic()
+        data = await self._async_fetch()
+        self.last_duration = time.monotonic() - start
+        self._async_schedule_retry()
+
+        if data is None:
+            self.failed_updates += 1
+            self._failures += 1
+            self.update_interval = min(
+                self._base_interval * 2 ** self._failures,
+                max(self._base_interval, timedelta(seconds=MAX_BACKOFF_INTERVAL)),
+            )
+            _LOGGER.debug("%s update failed, next attempt in %s", self.name, self.update_interval)
+            if not self.data:
+                raise UpdateFailed(f"Failed to fetch {self.name} data for any symbol.")
+            self._changed = set()
+            return self.data
+
+        # Returning the previous data means the update was skipped, not that it succeeded
+        if data is self.data:
+            self.skipped_updates += 1
+            self._changed = set()
+        else:
+            self.updates += 1
+            self._changed = self._diff(self.data, data)
+            if self._failures:
+                self._failures = 0
+                self.update_interval = self._base_interval
+            if self._cache is not None:
+                self._cache.async_set(self._cache_key, data, self._encode)
+
+        return data
+
+    @property
+    def metrics(self):
+        """Return update counters and the last cycle for diagnostics."""
+        return {
+            "symbols": len(self.symbols),
+            "update_interval": self.update_interval.total_seconds() if self.update_interval else None,
+            "last_update_success": self.last_update_success,
+            "updates": self.updates,
+            "failed_updates": self.failed_updates,
+            "skipped_updates": self.skipped_updates,
+            "consecutive_failures": self._failures,
+            "unchanged_payloads": self.unchanged_payloads,
+            "last_cycle": {
+                "duration_ms": round(self.last_duration * 1000) if self.last_duration is not None else None,
+                "symbols_succeeded": self.last_succeeded,
+                "symbols_failed": self.last_failed,
+            },
+            "health": self.health.as_dict(),
+        }
+
+    @staticmethod
+    def _diff(old, new):
+        """Return the keys whose data differs between two payloads."""
+        old = old or {}
+        changed = {key for key, val in new.items() if old.get(key) != val}
+        changed.update(old.keys() - new.keys())
+        return changed
+
+    @callback
+    def async_update_listeners(self):
+        """Notify only the listeners whose context (symbol) changed.
+
+        Listeners without a context are always notified. A change of
+        availability concerns every entity, so it notifies everyone.
+        """
+        changed, self._changed = self._changed, None
+        if changed is None or self.last_update_success != self._notified_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    async def _async_gather_per_symbol(self, func, symbols, concurrency):
+        """Run a per-symbol fetch concurrently with bounded parallelism.
+
+        Symbols whose breaker is open are skipped, and the outcome of every
+        other symbol is recorded in self.health. Returns a dict with the
+        results of the symbols that succeeded.
+        """
+        symbols = self.health.available(symbols)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(symbol):
+            async with semaphore:
+                return await self.hub.async_run(func, symbol, timeout=SLOW_FETCH_TIMEOUT)
+
+        results = await asyncio.gather(
+            *(fetch_one(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+
+        updated = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, RateLimitedError):
+                # Not the symbol's fault; the limiter backs off for everyone
+                _LOGGER.debug("Rate limited fetching %s data for %s", self.name, symbol)
+            elif isinstance(result, asyncio.TimeoutError):
+                _LOGGER.debug("Timed out fetching %s data for %s", self.name, symbol)
+                self.health.record_failure(symbol)
+            elif isinstance(result, Exception):
+                _LOGGER.debug("Error extracting %s data for %s: %s", self.name, symbol, result)
+                # Yahoo answers 404 for unknown and delisted symbols
+                self.health.record_failure(
+                    symbol,
+                    permanent=isinstance(result, aiohttp.ClientResponseError) and result.status == 404,
+                )
+            else:
+                updated[symbol] = result
+                self.health.record_success(symbol)
+
+        _LOGGER.debug("%s refreshed for %d/%d symbols", self.name, len(updated), len(symbols))
+        self.last_succeeded = len(updated)
+        self.last_failed = len(symbols) - len(updated)
+        return updated
+
+    def _no_results(self):
+        """Return what a per-symbol fetch without any result amounts to.
+
+        It failed if a symbol was tried, otherwise every breaker is open
+        and the update is skipped.
+        """
+        if self.last_failed:
+            return None
+        return self.data if self.data is not None else {}
+
+
+class YahooFinanceFundamentalsCoordinator(YahooFinanceBaseCoordinator):
+    """Class to manage fetching fundamentals (PE, ESG, dividends, earnings).
+
+    Only the groups of fundamentals some enabled sensor shows are fetched,
+    per symbol, so only their quoteSummary modules are requested.
+    """
+
+    def __init__(self, hass, groups, concurrency=DEFAULT_SLOW_CONCURRENCY, cache=None):
+        """Initialize with the groups of fundamentals needed per symbol."""
+        self.groups = {symbol: frozenset(needed) for symbol, needed in groups.items() if needed}
+        self.symbols = list(self.groups)
+        self._modules = {symbol: modules_for(needed) for symbol, needed in self.groups.items()}
+        self._concurrency = concurrency
+        # Payload version per symbol, unchanged payloads are not parsed again
+        self._versions = {}
+        super().__init__(hass, f"{DOMAIN}_fundamentals", FUNDAMENTALS_UPDATE_INTERVAL, cache, "fundamentals")
+
+    @callback
+    def async_set_groups(self, groups):
+        """Change the groups needed per symbol in place.
+
+        Returns the symbols that need a fetch: new ones and those needing
+        groups they don't have yet.
+        """
+        groups = {symbol: frozenset(needed) for symbol, needed in groups.items() if needed}
+        new = [symbol for symbol, needed in groups.items() if not needed <= self.groups.get(symbol, frozenset())]
+        self.groups = groups
+        self.symbols = list(groups)
+        self._modules = {symbol: modules_for(needed) for symbol, needed in groups.items()}
+        for symbol in new:
+            self._versions.pop(symbol, None)
+        self._async_drop_removed()
+        return new
+
+    @callback
+    def async_restore(self, ttl):
+        """Seed data from the cache, fresh only if it holds every group needed now."""
+        fresh = super().async_restore(ttl)
+        if not fresh:
+            return False
+        cached, _ = self._cache.get("fundamentals_groups", ttl)
+        cached = cached or {}
+        return all(needed <= set(cached.get(symbol, ())) for symbol, needed in self.groups.items())
+
+    async def _async_fetch(self, symbols=None):
+        """Fetch fundamentals for the symbols, keeping old values on failure."""
+        results = await self._async_gather_per_symbol(
+            lambda symbol: self.hub.client.async_fetch_fundamentals(
+                symbol, self._modules[symbol], self._versions.get(symbol)
+            ),
+            self.symbols if symbols is None else symbols,
+            self._concurrency,
         )
-        
-        # Store FX rates for conversion
-        if fx_rates:
-            self._fx_rates.update(fx_rates)
-        
-        if result == "429":
-            _LOGGER.warning("Hit 429 Rate Limit during batch fetch. Entering 5-minute cooldown.")
-            _LAST_429_TIME = asyncio.get_event_loop().time()
+        if not results:
+            return self._no_results()
+        data = dict(self.data or {})
+        for symbol, (version, fundamentals) in results.items():
+            self._versions[symbol] = version
+            if fundamentals is None:
+                self.unchanged_payloads += 1
+            else:
+                data[symbol] = fundamentals
+        if self._cache is not None:
+            cached, _ = self._cache.get("fundamentals_groups", FUNDAMENTALS_UPDATE_INTERVAL)
+            self._cache.async_set("fundamentals_groups", {
+                **(cached or {}),
+                **{symbol: sorted(self.groups[symbol]) for symbol in results},
+            })
+        return data
+
+
+class YahooFinanceHistoryCoordinator(YahooFinanceBaseCoordinator):
+    """Class to keep daily price history and compute indicators from it.
+
+    Bars are backfilled once per symbol and kept in the persistent cache;
+    later updates only fetch the last few days and merge them in.
+    """
+
+    def __init__(self, hass, symbols, concurrency=DEFAULT_SLOW_CONCURRENCY, cache=None):
+        """Initialize."""
+        self.symbols = list(symbols)
+        self.histories = {}
+        self._concurrency = concurrency
+        self._history_cache = cache
+        # The cache holds the bars, not the indicators computed from them
+        super().__init__(hass, f"{DOMAIN}_history", HISTORY_UPDATE_INTERVAL)
+
+    @callback
+    def async_restore(self, ttl):
+        """Seed the bars from the cache and compute their indicators."""
+        if self._history_cache is None:
+            return False
+        bars, fresh = self._history_cache.get("history", ttl)
+        if not bars:
+            return False
+        self.histories = {
+            symbol: SymbolHistory.from_dict(data)
+            for symbol, data in bars.items()
+            if symbol in self.symbols
+        }
+        self.data = {symbol: history.indicators() for symbol, history in self.histories.items()}
+        return fresh and all(symbol in self.histories for symbol in self.symbols)
+
+    @callback
+    def _async_drop_removed(self):
+        """Forget the bars of symbols that are no longer configured."""
+        super()._async_drop_removed()
+        self.histories = {symbol: history for symbol, history in self.histories.items() if symbol in self.symbols}
+
+    def _range(self, symbol, now):
+        """Return the chart range needed to bring a symbol's history up to date."""
+        history = self.histories.get(symbol)
+        if history is None or not len(history):
+            return "1y"
+        gap = now - history.last_timestamp
+        if gap < 4 * 86400:
+            return "5d"
+        if gap < 25 * 86400:
+            return "1mo"
+        return "1y"
+
+    async def _async_fetch(self, symbols=None):
+        """Fetch new bars for the symbols and recompute their indicators."""
+        now = dt_util.utcnow().timestamp()
+        ranges = {symbol: self._range(symbol, now) for symbol in (self.symbols if symbols is None else symbols)}
+        charts = await self._async_gather_per_symbol(
+            lambda symbol: self.hub.client.async_fetch_chart(symbol, ranges[symbol]), list(ranges), self._concurrency
+        )
+        if not charts:
+            return self._no_results()
+
+        data = dict(self.data or {})
+        for symbol, chart in charts.items():
+            newer = SymbolHistory.from_chart(chart)
+            if symbol in self.histories and ranges[symbol] != "1y":
+                self.histories[symbol] = self.histories[symbol].merge(newer)
+            else:
+                self.histories[symbol] = newer
+            data[symbol] = self.histories[symbol].indicators()
+
+        if self._history_cache is not None:
+            # Histories are replaced, not changed, so a shallow copy keeps this snapshot
+            self._history_cache.async_set("history", dict(self.histories), encode_histories)
+        return data
+
+
+class YahooFinanceNewsCoordinator(YahooFinanceBaseCoordinator):
+    """Class to manage fetching news headlines."""
+
+    def __init__(self, hass, symbols, concurrency=DEFAULT_SLOW_CONCURRENCY, cache=None):
+        """Initialize."""
+        self.symbols = list(symbols)
+        self._concurrency = concurrency
+        self._versions = {}
+        # Latest articles per symbol by article ID
+        self._articles = {}
+        super().__init__(hass, f"{DOMAIN}_news", NEWS_UPDATE_INTERVAL, cache, "news")
+
+    @callback
+    def _async_drop_removed(self):
+        """Forget the articles of symbols that are no longer configured."""
+        super()._async_drop_removed()
+        for symbol in self._articles.keys() - set(self.symbols):
+            del self._articles[symbol]
+            self._versions.pop(symbol, None)
+
+    async def _async_fetch(self, symbols=None):
+        """Fetch news for the symbols, merging in only articles not seen before."""
+        results = await self._async_gather_per_symbol(
+            lambda symbol: self.hub.client.async_fetch_news(symbol, self._versions.get(symbol)),
+            self.symbols if symbols is None else symbols,
+            self._concurrency,
+        )
+        if not results:
+            return self._no_results()
+        data = dict(self.data or {})
+        for symbol, (version, items) in results.items():
+            self._versions[symbol] = version
+            if items is None:
+                self.unchanged_payloads += 1
+                continue
+            articles = self._articles.setdefault(symbol, {})
+            new = parse_news([item for item in items if (item.get("uuid") or item.get("link")) not in articles])
+            if not new:
+                continue
+            articles.update(new)
+            latest = sorted(articles.items(), key=lambda item: item[1]["published"], reverse=True)[:NEWS_COUNT]
+            self._articles[symbol] = dict(latest)
+            data[symbol] = [{"title": article["title"], "link": article["link"]} for _, article in latest]
+        return data
+
+
+class YahooFinanceDataUpdateCoordinator(YahooFinanceBaseCoordinator):
+    """Class to manage fetching Yahoo Finance quotes and portfolio values.
+
+    Data maps symbols to immutable QuoteRecords (and __portfolio__ to the
+    portfolio summary). Updates never mutate it but swap in a new dict.
+    """
+
+    _encode = staticmethod(encode_snapshot)
+
+    def __init__(self, hass, symbol_definitions, scan_interval=DEFAULT_SCAN_INTERVAL, eco_threshold=600, base_currency="USD", ext_hours=False, cache=None, symbol_intervals=None, streaming=False, symbol_costs=None):
+        """Initialize."""
+        self.symbol_definitions = symbol_definitions
+        self.symbols = list(symbol_definitions.keys())
+        self.scan_interval = scan_interval
+        # Per-symbol refresh tiers; symbols without one follow scan_interval
+        self.symbol_intervals = {
+            symbol: interval for symbol, interval in (symbol_intervals or {}).items()
+            if symbol in symbol_definitions
+        }
+        self.eco_threshold = eco_threshold
+        self.base_currency = base_currency
+        self.ext_hours = ext_hours
+        self.fx = FxGraph()
+        self._fx_pairs = frozenset()
+        self._unsub_fx_hub = None
+        self.portfolio = PortfolioEngine(symbol_definitions, base_currency, symbol_costs)
+        # Tick as often as the fastest tier needs; each tick fetches only due symbols
+        tick = min([scan_interval, *self.symbol_intervals.values()])
+        super().__init__(hass, DOMAIN, tick, cache, "quotes")
+        self._tick = self._base_interval
+        self._fetched = {}
+        self._settled = set()
+        # Prices are pushed while the stream is connected; polling falls back
+        # to the configured tiers whenever it is not
+        self._streamer = YahooFinanceStreamer(
+            hass, self.symbols, self._async_handle_pricing, self._async_stream_state
+        ) if streaming and self.symbols else None
+        self._unsub_hub = []
+        self._tiers = None
+        self._async_register_tiers()
+
+    @callback
+    def _async_register_tiers(self, tiers=None):
+        """Register symbols with the hub, replacing earlier registrations.
+
+        tiers maps refresh intervals to the symbols polled at them; by
+        default every symbol at its configured tier, until the first fetch
+        knows which markets are open.
+        """
+        if tiers is None:
+            tiers = {}
+            for symbol in self.symbols:
+                tiers.setdefault(self._interval(symbol), set()).add(symbol)
+        if tiers == self._tiers:
+            return
+        # Quotes come from the hub shared with all other config entries, one
+        # registration per tier so other entries only piggyback what is due.
+        # Registered before the old ones go, so the hub keeps their quotes.
+        unsub_old = self._unsub_hub
+        self._tiers = tiers
+        self._unsub_hub = [
+            self.hub.async_register(symbols, interval / 2, self)
+            for interval, symbols in tiers.items()
+        ]
+        for unsub in unsub_old:
+            unsub()
+
+    @callback
+    def async_reconfigure(self, symbol_definitions, scan_interval, eco_threshold, base_currency, ext_hours, symbol_intervals=None, symbol_costs=None):
+        """Apply new options in place, keeping the quotes of remaining symbols.
+
+        New symbols are due right away, so the next refresh fetches only
+        them. The stream, if any, keeps its symbols; changing those needs a
+        reload.
+        """
+        if base_currency != self.base_currency or ext_hours != self.ext_hours:
+            # Every value changes, refetch them all
+            self._fetched.clear()
+            self._settled.clear()
+        self.symbol_definitions = symbol_definitions
+        self.symbols = list(symbol_definitions)
+        self.scan_interval = scan_interval
+        self.symbol_intervals = {
+            symbol: interval for symbol, interval in (symbol_intervals or {}).items()
+            if symbol in symbol_definitions
+        }
+        self.eco_threshold = eco_threshold
+        self.base_currency = base_currency
+        self.ext_hours = ext_hours
+        self.portfolio = PortfolioEngine(symbol_definitions, base_currency, symbol_costs)
+        self._tick = timedelta(seconds=min([scan_interval, *self.symbol_intervals.values()]))
+        self._base_interval = max(self._tick, timedelta(seconds=STREAM_POLL_INTERVAL)) if self.streaming else self._tick
+        self.update_interval = self._base_interval
+        for symbol in self._fetched.keys() - symbol_definitions.keys():
+            del self._fetched[symbol]
+        self._settled.intersection_update(symbol_definitions)
+        self._async_register_tiers()
+
+        if self.data:
+            data = {symbol: val for symbol, val in self.data.items() if symbol in symbol_definitions}
+            # Value the remaining holdings with the new amounts and costs
+            self.portfolio.update_quotes(data)
+            self._async_track_fx_pairs(self.fx.pairs_for(self.portfolio.currencies))
+            self._value_portfolio(data, list(data))
+            self._changed = self._diff(self.data, data)
+            self.data = data
+            self.async_update_listeners()
+
+    @callback
+    def async_restore(self, ttl):
+        """Seed quotes from the cache, dropping symbols no longer configured."""
+        fresh = super().async_restore(ttl)
+        if self.data:
+            # The cache holds the records as plain dicts
+            self.data = {
+                symbol: val if symbol == "__portfolio__" else QuoteRecord.from_dict(val)
+                for symbol, val in self.data.items()
+                if symbol in self.symbol_definitions or symbol == "__portfolio__"
+            }
+            # Symbols of closed markets keep their cached price in the total
+            self.portfolio.update_quotes(self.data)
+            self._async_track_fx_pairs(self.fx.pairs_for(self.portfolio.currencies))
+        if self._cache is not None:
+            fx_edges, _ = self._cache.get("fx", FX_RATE_TTL)
+            self.fx.restore(fx_edges)
+        return fresh
+
+    @callback
+    def async_start_streaming(self):
+        """Start the price stream if streaming is enabled."""
+        if self._streamer is not None:
+            self._streamer.async_start()
+
+    async def async_shutdown(self):
+        """Stop streaming and unregister from the hub on unload."""
+        if self._streamer is not None:
+            await self._streamer.async_stop()
+        if self._unsub_fx_hub:
+            self._unsub_fx_hub()
+        for unsub in self._unsub_hub:
+            unsub()
+        await super().async_shutdown()
+
+    @property
+    def streaming(self):
+        """Return True while prices are pushed by the stream."""
+        return self._streamer is not None and self._streamer.connected
+
+    @property
+    def metrics(self):
+        """Return update counters, streaming state and FX pairs for diagnostics."""
+        return {
+            **super().metrics,
+            "streaming": self.streaming,
+            "fx_pairs": sorted(self._fx_pairs),
+        }
+
+    async def _async_retry(self, _now):
+        """Refresh now; symbols whose retry is due are fetched with the due ones."""
+        self._unsub_retry = None
+        await self.async_request_refresh()
+
+    @callback
+    def _async_stream_state(self, connected):
+        """Slow polling down while streaming, restore it when the stream drops."""
+        if connected:
+            _LOGGER.debug("Price stream connected, polling every %ss for other fields", STREAM_POLL_INTERVAL)
+            self._base_interval = max(self._tick, timedelta(seconds=STREAM_POLL_INTERVAL))
+        else:
+            _LOGGER.debug("Price stream disconnected, falling back to polling")
+            self._base_interval = self._tick
+            # Catch up on what we missed since the last message
+            self.hass.async_create_task(self.async_request_refresh())
+        self.update_interval = self._base_interval
+
+    @callback
+    def _async_handle_pricing(self, fields):
+        """Merge one streamed price into the data and notify the sensors it changed."""
+        symbol = fields["id"]
+        if not self.data or symbol not in self.data:
+            return
+        update = apply_pricing(fields, self.ext_hours)
+        if not update:
+            return
+        new_data = {**self.data, symbol: self.data[symbol]._replace(**update)}
+        self._value_portfolio(new_data, (symbol,))
+        # Not async_set_updated_data: that would postpone the next poll on every tick
+        self._changed = self._diff(self.data, new_data)
+        self.data = new_data
+        self.async_update_listeners()
+
+    def _interval(self, symbol):
+        """Return the refresh interval of a symbol's tier."""
+        interval = max(MIN_UPDATE_INTERVAL, self.symbol_intervals.get(symbol, self.scan_interval))
+        if self.streaming:
+            # Prices arrive over the stream; polling only refreshes the other fields
+            interval = max(interval, STREAM_POLL_INTERVAL)
+        return interval
+
+    def _min_interval(self, symbol, utc_now):
+        """Return how often a symbol may be fetched now, or None if its market is closed."""
+        interval = self._interval(symbol)
+        market = get_market(symbol, (self.data or {}).get(symbol))
+        if market is None:
+            # Unknown exchange: fall back to the night/weekend Eco-Mode on the local clock
+            local_now = dt_util.now()
+            if local_now.weekday() >= 5 or local_now.hour < 8 or local_now.hour >= 22:
+                return max(interval, self.eco_threshold)
+            return interval
+
+        session = market.session(utc_now, self.ext_hours)
+        if session == SESSION_REGULAR:
+            return interval
+        if session == SESSION_EXTENDED:
+            # Pre/post-market prices move slowly, poll them in Eco-Mode
+            return max(interval, self.eco_threshold)
+        return None
+
+    def _schedule(self, utc_now):
+        """Sleep until the next market opens when every symbol's market is closed."""
+        next_opens = []
+        for symbol in self.symbols:
+            market = get_market(symbol, (self.data or {}).get(symbol))
+            if market is None or market.session(utc_now, self.ext_hours) is not None:
+                self.update_interval = self._base_interval
+                return
+            if next_open := market.next_open(utc_now, self.ext_hours):
+                next_opens.append(next_open)
+
+        if not next_opens:
+            self.update_interval = self._base_interval
+            return
+        idle = min(next_opens) - utc_now + timedelta(seconds=MARKET_OPEN_DELAY)
+        self.update_interval = max(self._base_interval, min(idle, timedelta(seconds=MAX_IDLE_INTERVAL)))
+        _LOGGER.debug("All markets closed, next quote update in %s", self.update_interval)
+
+    def _value_portfolio(self, new_data, updated):
+        """Value the updated holdings and recompute the portfolio total and weights."""
+        self.portfolio.update_quotes({symbol: new_data[symbol] for symbol in updated})
+        rates = {currency: self.fx.rate(currency, self.base_currency) for currency in self.portfolio.currencies}
+        rows, summary = self.portfolio.value(rates)
+        # Fresh quotes lack the valuation even if it didn't change
+        for symbol in updated:
+            if symbol not in rows:
+                rows[symbol] = self.portfolio.row(symbol)
+        for symbol, row in rows.items():
+            if symbol in new_data:
+                new_data[symbol] = new_data[symbol]._replace(**row)
+        new_data["__portfolio__"] = summary
+
+    @callback
+    def _async_track_fx_pairs(self, pairs):
+        """Fetch a new set of FX pairs with the quotes, registered so other entries can piggyback."""
+        if self._unsub_fx_hub:
+            self._unsub_fx_hub()
+        self._unsub_fx_hub = self.hub.async_register(pairs, FX_UPDATE_INTERVAL / 2, self)
+        self._fx_pairs = frozenset(pairs)
+
+    async def _async_fetch(self, symbols=None):
+        """Fetch quotes for symbols (default those due whose markets are open)."""
+        now = asyncio.get_event_loop().time()
+        utc_now = dt_util.utcnow()
+        requested = None if symbols is None else set(symbols)
+
+        # Ticks drift slightly; don't push a symbol back a whole tick for that
+        tolerance = self._base_interval.total_seconds() / 2
+        due = []
+        closed = set()
+        tiers = {}
+        for symbol in self.health.available(self.symbols):
+            min_interval = self._min_interval(symbol, utc_now)
+            if min_interval is not None:
+                tiers.setdefault(min_interval, set()).add(symbol)
+            if requested is not None:
+                # Only the requested symbols, e.g. retries, whatever their schedule
+                if symbol in requested:
+                    due.append(symbol)
+                    if min_interval is None:
+                        closed.add(symbol)
+            elif self.health.retry_due(symbol):
+                # Retried after a transient failure, whatever its schedule
+                due.append(symbol)
+                if min_interval is None:
+                    closed.add(symbol)
+            elif min_interval is None:
+                # One last fetch settles the closing price, then idle until the next open
+                closed.add(symbol)
+                if symbol not in self._settled:
+                    due.append(symbol)
+            elif now - self._fetched.get(symbol, -min_interval) >= min_interval - tolerance:
+                due.append(symbol)
+        # Other entries only piggyback symbols whose markets are open
+        self._async_register_tiers(tiers)
+
+        if not due:
+            _LOGGER.debug("No symbol due for an update")
+            self._schedule(utc_now)
             return self.data if self.data else {}
-        
-        if result:
-            _LOGGER.debug("Successfully fetched batch data for %d symbols", len(result))
-            if was_slow:
-                self._last_slow_update = asyncio.get_event_loop().time()
-
-            # Merge with existing data
-            new_data = self.data.copy() if self.data else {}
-            
-            total_portfolio_value = 0
-            for symbol, val in result.items():
-                # Add owned amount to data
-                amount = self.symbol_definitions.get(symbol, 0)
-                val["owned_amount"] = amount
-                
-                if amount > 0 and val.get("regularMarketPrice"):
-                    price = val["regularMarketPrice"]
-                    currency = val.get("currency", "USD")
-                    
-                    # Store original total value
-                    val["total_value"] = amount * price
-                    
-                    # Convert to base currency for portfolio total
-                    if currency != self.base_currency:
-                         rate = self._fx_rates.get(currency)
-                         if rate:
-                             val["total_value_base"] = amount * price * rate
-                         else:
-                             # Try reciprocal if needed or just use 1.0 (though yf should provide the rate)
-                             val["total_value_base"] = amount * price
-                    else:
-                         val["total_value_base"] = amount * price
-                    
-                    total_portfolio_value += val["total_value_base"]
-                else:
-                    val["total_value"] = 0
-                    val["total_value_base"] = 0
-                
-                new_data[symbol] = val
-
-            # Calculate weight for each symbol
-            for symbol, val in new_data.items():
-                if symbol == "__portfolio__":
-                    continue
-                if total_portfolio_value > 0:
-                    val["portfolio_weight"] = (val.get("total_value_base", 0) / total_portfolio_value) * 100
-                else:
-                    val["portfolio_weight"] = 0
-            
-            new_data["__portfolio__"] = {
-                "total_value": total_portfolio_value,
-                "currency": self.base_currency
+
+        failed = set()
+        try:
+            # FX pairs ride along in the same bulk request on every fast tick
+            quotes, failed = await self.hub.async_get_quotes([*due, *self._fx_pairs], tolerance, self)
+            # The options may have changed while another entry held the hub
+            due = [symbol for symbol in due if symbol in self.symbol_definitions]
+            result = {
+                symbol: parse_quote(quotes[symbol], self.ext_hours)
+                for symbol in due
+                if symbol in quotes
             }
-            
-            self._last_update_success_time = asyncio.get_event_loop().time()
-            return new_data
-        
-        if not self.data:
-            raise UpdateFailed("Failed to fetch data for any symbol in batch.")
-            
-        return self.data
+        except RateLimitedError as ex:
+            # The limiter already logged it and is backing off
+            _LOGGER.debug("Batch fetch rate limited: %s", ex)
+            result = None
+        except Exception as ex:
+            _LOGGER.warning("Batch fetch failed: %s", ex)
+            result = None
+            failed = set(due)
+
+        self.last_succeeded = len(result or ())
+        self.last_failed = len(due) - self.last_succeeded
+        if result is not None:
+            for symbol in due:
+                if symbol in result:
+                    self.health.record_success(symbol)
+                elif symbol not in failed:
+                    # Yahoo answered without it, it doesn't know the symbol
+                    self.health.record_failure(symbol, permanent=True)
+                elif not self.hub.limiter.backoff_remaining:
+                    # Its chunk failed; chunks skipped for a rate limit
+                    # aren't the symbol's fault
+                    self.health.record_failure(symbol)
+        elif failed:
+            for symbol in due:
+                self.health.record_failure(symbol)
+        # Only a failed request fails the update; symbols Yahoo doesn't know
+        # are the health tracker's business, not the other symbols'
+        if result is None or not result and failed.issuperset(due):
+            return None
+
+        _LOGGER.debug("Successfully fetched batch data for %d of %d symbols", len(result), len(self.symbols))
+        # Symbols Yahoo didn't return are marked too so they follow the same schedule
+        for symbol in due:
+            if symbol in failed:
+                continue
+            self._fetched[symbol] = now
+            if symbol in closed:
+                self._settled.add(symbol)
+            else:
+                self._settled.discard(symbol)
+        if not result:
+            # Nothing new, e.g. a retry of a symbol Yahoo doesn't know
+            self._schedule(utc_now)
+            return self.data if self.data else {}
+
+        # Currencies seen for the first time need their pairs before valuing the portfolio
+        fx_quotes = {pair: quotes[pair] for pair in self._fx_pairs if pair in quotes}
+        pairs = self.fx.pairs_for({
+            *self.portfolio.currencies,
+            *(val.get("currency") for val in result.values()),
+        })
+        if pairs != self._fx_pairs:
+            new_pairs = pairs - self._fx_pairs
+            self._async_track_fx_pairs(pairs)
+            if new_pairs:
+                try:
+                    fx_quotes.update((await self.hub.async_get_quotes(new_pairs, tolerance, self))[0])
+                except Exception as ex:
+                    _LOGGER.warning("FX fetch failed: %s", ex)
+                # Nor may a symbol removed meanwhile come back
+                result = {symbol: val for symbol, val in result.items() if symbol in self.symbol_definitions}
+        if fx_quotes:
+            self.fx.update(fx_quotes)
+            if self._cache is not None:
+                self._cache.async_set("fx", self.fx.as_dict())
+
+        # Swap in a new snapshot; records of other symbols are shared, not copied
+        new_data = {**self.data, **result} if self.data else result
+        self._value_portfolio(new_data, result)
+
+        self._schedule(utc_now)
+        return new_data
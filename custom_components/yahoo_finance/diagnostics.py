@@ -0,0 +1,60 @@
+"""Diagnostics support for Yahoo Finance."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_SYMBOL_COSTS, CONF_SYMBOLS
+from .hub import async_get_hub
+
+# Holdings and purchase prices are private
+TO_REDACT = {CONF_SYMBOLS, CONF_SYMBOL_COSTS}
+
+
+class _SymbolAliases(dict):
+    """Stable placeholders for symbols, so sections still match up without naming them."""
+
+    def __missing__(self, symbol):
+        alias = self[symbol] = f"symbol_{len(self) + 1}"
+        return alias
+
+
+def _anonymize_health(health, aliases):
+    """Replace the symbols in a coordinator's health state."""
+    return {
+        "failing": {aliases[symbol]: count for symbol, count in health["failing"].items()},
+        "open": {aliases[symbol]: seconds for symbol, seconds in health["open"].items()},
+        "retry_queue": sorted(aliases[symbol] for symbol in health["retry_queue"]),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    aliases = _SymbolAliases()
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        # The hub, its HTTP client and the rate limiter are shared by all entries
+        "hub": async_get_hub(hass).metrics,
+        "coordinators": {
+            coordinator.name: {
+                **(metrics := coordinator.metrics),
+                "health": _anonymize_health(metrics["health"], aliases),
+            }
+            for coordinator in coordinators.all
+        },
+        "cache": coordinators.cache.metrics if coordinators.cache is not None else None,
+        "entities": {
+            "state_writes": coordinators.state_writes,
+            "skipped_writes": coordinators.skipped_writes,
+        },
+        "data_groups": {
+            aliases[symbol]: sorted(groups) for symbol, groups in coordinators.groups.items()
+        },
+    }
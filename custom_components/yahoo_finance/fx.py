@@ -0,0 +1,131 @@
+"""FX rates with triangulation for the Yahoo Finance integration."""
+from collections import deque
+import logging
+import time
+
+from .const import FX_HUB_CURRENCY, FX_RATE_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Minor currency units Yahoo quotes some exchanges in -> (major unit, factor)
+MINOR_UNITS = {
+    "GBp": ("GBP", 0.01),
+    "GBX": ("GBP", 0.01),
+    "ZAc": ("ZAR", 0.01),
+    "ZAC": ("ZAR", 0.01),
+    "ILA": ("ILS", 0.01),
+}
+
+
+def normalize(currency):
+    """Return (major currency, factor) for a possibly minor currency unit."""
+    return MINOR_UNITS.get(currency, (currency, 1.0))
+
+
+def parse_pair(symbol):
+    """Return (from, to) of a Yahoo FX symbol like EURUSD=X or JPY=X, or None."""
+    if not symbol.endswith("=X"):
+        return None
+    pair = symbol[:-2]
+    if len(pair) == 6:
+        return pair[:3], pair[3:]
+    if len(pair) == 3:
+        # Short form quotes the currency per US dollar
+        return "USD", pair
+    return None
+
+
+class FxGraph:
+    """Exchange rates as a graph of quoted pairs.
+
+    Only pairs against one hub currency are fetched; every other rate,
+    including inverse quotes and cross rates like JPY->EUR, is derived by
+    walking the graph. Rates older than their TTL are not used. Derived
+    rates are cached until the next update or until the oldest rate they
+    were derived from expires.
+    """
+
+    def __init__(self, hub_currency=FX_HUB_CURRENCY, ttl=FX_RATE_TTL):
+        """Initialize."""
+        self.hub_currency = hub_currency
+        self._ttl = ttl
+        # Currency -> {currency: (rate, updated)}
+        self._edges = {}
+        # (from, to) -> (rate, oldest quote it was derived from)
+        self._cache = {}
+
+    def pairs_for(self, currencies):
+        """Return the Yahoo symbols needed to convert between all currencies."""
+        majors = {normalize(currency)[0] for currency in currencies if currency}
+        return {f"{major}{self.hub_currency}=X" for major in majors if major != self.hub_currency}
+
+    def update(self, quotes, now=None):
+        """Add the rates of FX quotes (symbol -> quote with regularMarketPrice)."""
+        now = time.time() if now is None else now
+        for symbol, quote in quotes.items():
+            pair = parse_pair(symbol)
+            rate = quote.get("regularMarketPrice")
+            if pair is None or not rate:
+                _LOGGER.debug("Skipping FX quote %s without a usable rate", symbol)
+                continue
+            self._set_edge(*pair, rate, now)
+        self._cache.clear()
+
+    def _set_edge(self, from_currency, to_currency, rate, updated):
+        """Store a quoted rate and its inverse."""
+        self._edges.setdefault(from_currency, {})[to_currency] = (rate, updated)
+        self._edges.setdefault(to_currency, {})[from_currency] = (1 / rate, updated)
+
+    def rate(self, from_currency, to_currency, now=None):
+        """Return the rate converting from_currency into to_currency, or None."""
+        now = time.time() if now is None else now
+        key = (from_currency, to_currency)
+        if (cached := self._cache.get(key)) is not None:
+            rate, oldest = cached
+            if oldest is None or now - oldest <= self._ttl:
+                return rate
+
+        from_major, from_factor = normalize(from_currency)
+        to_major, to_factor = normalize(to_currency)
+        rate, oldest = self._path_rate(from_major, to_major, now)
+        if rate is not None:
+            rate = rate * from_factor / to_factor
+        self._cache[key] = (rate, oldest)
+        return rate
+
+    def _path_rate(self, source, target, now):
+        """Multiply the rates along the shortest path of fresh edges.
+
+        Returns (rate, update time of the oldest edge on the path); the
+        rate is None if there is no path.
+        """
+        if source == target:
+            return 1.0, None
+        queue = deque([(source, 1.0, now)])
+        seen = {source}
+        while queue:
+            currency, rate, oldest = queue.popleft()
+            for neighbor, (edge_rate, updated) in self._edges.get(currency, {}).items():
+                if neighbor in seen or now - updated > self._ttl:
+                    continue
+                if neighbor == target:
+                    return rate * edge_rate, min(oldest, updated)
+                seen.add(neighbor)
+                queue.append((neighbor, rate * edge_rate, min(oldest, updated)))
+        return None, None
+
+    def as_dict(self):
+        """Return the quoted rates for the persistent cache."""
+        return [
+            [from_currency, to_currency, rate, updated]
+            for from_currency, edges in self._edges.items()
+            for to_currency, (rate, updated) in edges.items()
+            if from_currency < to_currency
+        ]
+
+    def restore(self, edges):
+        """Restore rates saved by as_dict."""
+        for from_currency, to_currency, rate, updated in edges or ():
+            if rate:
+                self._set_edge(from_currency, to_currency, rate, updated)
+        self._cache.clear()
@@ -0,0 +1,117 @@
+"""Per-symbol health tracking for the Yahoo Finance integration."""
+import logging
+import time
+
+from .const import (
+    CIRCUIT_BREAKER_BASE,
+    CIRCUIT_BREAKER_MAX,
+    CIRCUIT_BREAKER_THRESHOLD,
+    RETRY_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SymbolHealth:
+    """Circuit breakers and a retry queue for the symbols of one coordinator.
+
+    A transient failure puts the symbol in the retry queue, so it is fetched
+    again after a short delay instead of waiting for the next regular update.
+    After a few consecutive failures, or right away for a permanent one like
+    an unknown symbol, its breaker opens and the symbol is skipped for a
+    growing period. Once that passed one attempt is made; success closes
+    the breaker, failure opens it again for twice as long.
+    """
+
+    def __init__(
+        self,
+        name,
+        threshold=CIRCUIT_BREAKER_THRESHOLD,
+        base=CIRCUIT_BREAKER_BASE,
+        maximum=CIRCUIT_BREAKER_MAX,
+        retry_delay=RETRY_DELAY,
+    ):
+        """Initialize."""
+        self.name = name
+        self._threshold = threshold
+        self._base = base
+        self._max = maximum
+        self._retry_delay = retry_delay
+        # Symbol -> consecutive failures
+        self._failures = {}
+        # Symbol -> monotonic time its breaker closes again
+        self._open_until = {}
+        # Symbol -> monotonic time of its retry
+        self._retries = {}
+
+    def available(self, symbols, now=None):
+        """Return the symbols whose breaker is not open."""
+        if not self._open_until:
+            return list(symbols)
+        now = time.monotonic() if now is None else now
+        return [symbol for symbol in symbols if self._open_until.get(symbol, 0) <= now]
+
+    def is_open(self, symbol, now=None):
+        """Return True if the symbol's breaker is open."""
+        now = time.monotonic() if now is None else now
+        return self._open_until.get(symbol, 0) > now
+
+    def record_success(self, symbol):
+        """Close the breaker of a symbol that was fetched."""
+        if self._failures.pop(symbol, None) is not None:
+            if self._open_until.pop(symbol, None) is not None:
+                _LOGGER.info("%s: %s works again", self.name, symbol)
+        self._retries.pop(symbol, None)
+
+    def record_failure(self, symbol, permanent=False, now=None):
+        """Count a failed fetch of a symbol.
+
+        Transient failures below the threshold are queued for a retry,
+        everything else opens the breaker.
+        """
+        now = time.monotonic() if now is None else now
+        failures = self._failures[symbol] = max(
+            self._failures.get(symbol, 0) + 1,
+            self._threshold if permanent else 0,
+        )
+        if failures < self._threshold:
+            self._retries[symbol] = now + self._retry_delay
+            return
+        self._retries.pop(symbol, None)
+        delay = min(self._base * 2 ** (failures - self._threshold), self._max)
+        self._open_until[symbol] = now + delay
+        _LOGGER.warning(
+            "%s: %s failed %d times in a row, skipping it for %.0f minutes",
+            self.name, symbol, failures, delay / 60,
+        )
+
+    def retry_due(self, symbol, now=None):
+        """Return True if the symbol is queued for a retry that is due."""
+        now = time.monotonic() if now is None else now
+        return self._retries.get(symbol, now + 1) <= now
+
+    def pop_retries(self, now=None):
+        """Return and dequeue the symbols whose retry is due."""
+        now = time.monotonic() if now is None else now
+        due = [symbol for symbol, at in self._retries.items() if at <= now]
+        for symbol in due:
+            del self._retries[symbol]
+        return due
+
+    @property
+    def next_retry(self):
+        """Return the monotonic time of the earliest retry, or None."""
+        return min(self._retries.values(), default=None)
+
+    def as_dict(self):
+        """Return the state for diagnostics."""
+        now = time.monotonic()
+        return {
+            "failing": dict(self._failures),
+            "open": {
+                symbol: round(until - now)
+                for symbol, until in self._open_until.items()
+                if until > now
+            },
+            "retry_queue": sorted(self._retries),
+        }
@@ -0,0 +1,125 @@
+"""Local daily price history and indicators for the Yahoo Finance integration."""
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .const import HISTORY_MIN_BARS
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class SymbolHistory:
+    """Daily OHLCV bars of one symbol, kept in NumPy arrays.
+
+    Bars are backfilled once and then merged incrementally: a newer fetch
+    replaces every bar from its first timestamp on, which also updates the
+    still moving bar of the current session.
+    """
+
+    __slots__ = ("timestamps", *FIELDS)
+
+    def __init__(self, timestamps=(), **columns):
+        """Initialize from a timestamp sequence and one sequence per field."""
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        for field in FIELDS:
+            # Missing values (None) and fields become NaN
+            values = columns.get(field)
+            if values is None or len(values) != len(self.timestamps):
+                values = np.full(len(self.timestamps), np.nan)
+            setattr(self, field, np.asarray(values, dtype=np.float64))
+
+    @classmethod
+    def from_chart(cls, chart):
+        """Build from a decoded chart response, dropping bars without a close."""
+        history = cls(chart.get("timestamp") or (), **{field: chart.get(field) for field in FIELDS})
+        keep = ~np.isnan(history.close)
+        return history._slice(keep)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore from the persistent cache."""
+        return cls(data.get("t") or (), **{field: data.get(field[0]) for field in FIELDS})
+
+    def as_dict(self):
+        """Return a JSON serializable copy for the persistent cache."""
+        data = {"t": self.timestamps.tolist()}
+        for field in FIELDS:
+            values = getattr(self, field)
+            data[field[0]] = np.where(np.isnan(values), None, values).tolist()
+        return data
+
+    def __len__(self):
+        """Return the number of bars."""
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self):
+        """Return the timestamp of the newest bar, or None."""
+        return int(self.timestamps[-1]) if len(self) else None
+
+    def _slice(self, index):
+        """Return a new history with the selected bars."""
+        history = SymbolHistory.__new__(SymbolHistory)
+        for name in self.__slots__:
+            setattr(history, name, getattr(self, name)[index])
+        return history
+
+    def merge(self, newer):
+        """Return a history with newer bars replacing ours from their first timestamp on."""
+        if not len(newer):
+            return self
+        older = self._slice(self.timestamps < newer.timestamps[0])
+        merged = SymbolHistory.__new__(SymbolHistory)
+        for name in self.__slots__:
+            setattr(merged, name, np.concatenate((getattr(older, name), getattr(newer, name))))
+        return merged._trim()
+
+    def _trim(self):
+        """Drop the bars no indicator needs.
+
+        Keeps the bars of the longest moving average and every bar back to
+        the last close of the previous year, the base of the YTD return.
+        """
+        start = max(0, len(self) - HISTORY_MIN_BARS)
+        previous = np.flatnonzero(self.timestamps < self._year_start())
+        if len(previous):
+            start = min(start, previous[-1])
+        return self._slice(slice(start, None)) if start else self
+
+    def _year_start(self):
+        """Return the timestamp of Jan 1 of the newest bar's year (UTC)."""
+        return datetime(
+            datetime.fromtimestamp(self.last_timestamp, timezone.utc).year, 1, 1, tzinfo=timezone.utc
+        ).timestamp()
+
+    def indicators(self):
+        """Compute moving averages and the year-to-date return."""
+        close = self.close
+        if not len(close):
+            return {}
+
+        data = {
+            "fiftyDayAverage": _mean_tail(close, 50),
+            "twoHundredDayAverage": _mean_tail(close, 200),
+            "ytdReturn": None,
+        }
+
+        # Year to date: against the last close of the previous calendar year
+        previous = np.flatnonzero(self.timestamps < self._year_start())
+        if len(previous):
+            base = close[previous[-1]]
+            if base:
+                data["ytdReturn"] = float(close[-1] / base - 1)
+        return data
+
+
+def encode_histories(histories):
+    """Convert the histories of all symbols to dicts for the cache."""
+    return {symbol: history.as_dict() for symbol, history in histories.items()}
+
+
+def _mean_tail(values, window):
+    """Return the mean of the last window values, or None if there are fewer."""
+    if len(values) < window:
+        return None
+    return round(float(values[-window:].mean()), 4)
@@ -0,0 +1,289 @@
+"""Quote hub shared by all Yahoo Finance config entries."""
+import asyncio
+import logging
+
+from homeassistant.core import callback
+
+from .api import RateLimitedError, YahooFinanceClient
+from .const import (
+    DATA_HUB,
+    QUOTE_CHUNK_CONCURRENCY,
+    QUOTE_CHUNK_MAX,
+    QUOTE_CHUNK_MIN,
+    QUOTE_CHUNK_SIZE,
+    QUOTE_CHUNK_STEP,
+    QUOTE_CHUNK_TARGET_LATENCY,
+)
+from .ratelimit import YahooFinanceRateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_hub(hass):
+    """Return the quote hub of this Home Assistant instance, creating it if needed."""
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = YahooFinanceQuoteHub(hass)
+    return hub
+
+
+async def async_remove_hub(hass):
+    """Drop the quote hub and close its session, once no entry uses it."""
+    if (hub := hass.data.pop(DATA_HUB, None)) is not None:
+        await hub.client.async_close()
+
+
+class AdaptiveChunkSize:
+    """Number of symbols per bulk quote request, adapted to how Yahoo copes.
+
+    Grows by a fixed step while full chunks come back well within the target
+    latency and halves when a chunk fails or is slower than that, so large
+    watchlists use few requests without risking huge, slow responses.
+    """
+
+    def __init__(
+        self,
+        size=QUOTE_CHUNK_SIZE,
+        minimum=QUOTE_CHUNK_MIN,
+        maximum=QUOTE_CHUNK_MAX,
+        step=QUOTE_CHUNK_STEP,
+        target_latency=QUOTE_CHUNK_TARGET_LATENCY,
+    ):
+        """Initialize."""
+        self.size = size
+        self._min = minimum
+        self._max = maximum
+        self._step = step
+        self._target = target_latency
+
+        # Metrics
+        self.grown = 0
+        self.shrunk = 0
+
+    def report_success(self, count, latency):
+        """Adapt to a chunk of count symbols that took latency seconds."""
+        if latency > self._target:
+            self._shrink()
+        elif count >= self.size and latency < self._target / 2 and self.size < self._max:
+            self.size = min(self._max, self.size + self._step)
+            self.grown += 1
+
+    def report_failure(self):
+        """Adapt to a failed chunk."""
+        self._shrink()
+
+    def _shrink(self):
+        """Halve the chunk size."""
+        if self.size > self._min:
+            self.size = max(self._min, self.size // 2)
+            self.shrunk += 1
+            _LOGGER.debug("Quote chunks shrunk to %d symbols", self.size)
+
+    @property
+    def metrics(self):
+        """Return the current size and adjustments for diagnostics."""
+        return {"size": self.size, "grown": self.grown, "shrunk": self.shrunk}
+
+
+class YahooFinanceQuoteHub:
+    """Fetch quotes for all config entries together.
+
+    Every coordinator registers the symbols it needs and how old their quotes
+    may be. A fetch triggered by one coordinator also refreshes the registered
+    symbols of the others that are at least halfway to stale, so upstream
+    requests scale with the number of unique symbols instead of entries.
+    A coordinator's own registrations never ride along with its fetches, it
+    knows best which of its symbols are due. Fetches are serialized: a coordinator asking for symbols that are being
+    fetched waits for that request instead of issuing its own.
+
+    Large fetches are split into chunks of an adaptive size, fetched
+    concurrently and merged as they finish. The hub also owns the HTTP
+    client and the rate limiter used for every Yahoo request.
+    """
+
+    def __init__(self, hass):
+        """Initialize."""
+        self.hass = hass
+        self.client = YahooFinanceClient(hass)
+        self.limiter = YahooFinanceRateLimiter()
+        self.chunk_size = AdaptiveChunkSize()
+        self._lock = asyncio.Lock()
+        self._quotes = {}
+        self._fetched = {}
+        self._subscriptions = {}
+        self._max_age = {}
+
+        # Metrics
+        self.fetches = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.piggybacked = 0
+        self.chunks = 0
+        self.failed_chunks = 0
+
+    @callback
+    def async_register(self, symbols, max_age, owner=None):
+        """Register symbols kept fresh by the hub. Returns an unregister callback.
+
+        Fetches by the same owner don't piggyback these symbols.
+        """
+        token = object()
+        self._subscriptions[token] = (frozenset(symbols), max_age, owner)
+        self._rebuild()
+
+        @callback
+        def unregister():
+            self._subscriptions.pop(token, None)
+            self._rebuild()
+            # Drop quotes nobody needs anymore
+            for symbol in list(self._quotes):
+                if symbol not in self._max_age:
+                    self._quotes.pop(symbol, None)
+                    self._fetched.pop(symbol, None)
+
+        return unregister
+
+    def _rebuild(self):
+        """Recompute the strictest max age of every registered symbol."""
+        max_age = {}
+        for symbols, age, _ in self._subscriptions.values():
+            for symbol in symbols:
+                max_age[symbol] = min(age, max_age.get(symbol, age))
+        self._max_age = max_age
+
+    def _is_stale(self, symbol, max_age, now):
+        """Return True if the symbol was not fetched within max_age seconds."""
+        fetched = self._fetched.get(symbol)
+        return fetched is None or now - fetched > max_age
+
+    async def async_get_quotes(self, symbols, max_age, owner=None):
+        """Return raw quotes for symbols, fetching only those older than max_age.
+
+        Symbols registered by other owners ride along if they are halfway
+        to stale. Chunks fail independently. Returns (quotes, symbols whose
+        chunk failed); raises the underlying exception if every chunk failed.
+        """
+        loop = asyncio.get_running_loop()
+        failed = set()
+        async with self._lock:
+            now = loop.time()
+            wanted = {symbol for symbol in symbols if self._is_stale(symbol, max_age, now)}
+            self.cache_misses += len(wanted)
+            self.cache_hits += len(symbols) - len(wanted)
+            if wanted:
+                # Piggyback other entries' symbols that will be due soon
+                requested = len(wanted)
+                wanted |= {
+                    symbol
+                    for registered, age, registrant in self._subscriptions.values()
+                    if owner is None or registrant is not owner
+                    for symbol in registered
+                    if self._is_stale(symbol, age / 2, now)
+                }
+                self.fetches += 1
+                self.piggybacked += len(wanted) - requested
+                errors = await self._async_fetch_chunks(sorted(wanted), failed)
+                if errors and len(failed) == len(wanted):
+                    raise errors[0]
+                _LOGGER.debug(
+                    "Hub fetched %d symbols (%d requested by caller)",
+                    len(wanted), len(symbols),
+                )
+
+        return (
+            {
+                symbol: self._quotes[symbol]
+                for symbol in symbols
+                if symbol in self._quotes and symbol not in failed
+            },
+            failed.intersection(symbols),
+        )
+
+    async def _async_fetch_chunks(self, symbols, failed):
+        """Fetch quotes in concurrent chunks, merging each as it finishes.
+
+        Adds the symbols of failed chunks to failed and returns the errors.
+        """
+        loop = asyncio.get_running_loop()
+        pending = list(symbols)
+        errors = []
+
+        async def fetch(chunk):
+            start = loop.time()
+            quotes = await self.client.async_fetch_quotes(chunk)
+            self.chunk_size.report_success(len(chunk), loop.time() - start)
+            return quotes
+
+        async def worker():
+            # Each worker takes the next chunk at the size current when it starts
+            while pending:
+                if any(isinstance(error, RateLimitedError) for error in errors):
+                    # Don't keep knocking while Yahoo is rate limiting us
+                    failed.update(pending)
+                    pending.clear()
+                    return
+                chunk = pending[:self.chunk_size.size]
+                del pending[:len(chunk)]
+                self.chunks += 1
+                try:
+                    quotes = await self.async_run(fetch, chunk)
+                except Exception as ex:  # pylint: disable=broad-except
+                    # A failing chunk doesn't cost the other chunks their quotes
+                    _LOGGER.debug("Fetching %d quotes failed: %s", len(chunk), ex)
+                    self.failed_chunks += 1
+                    if not isinstance(ex, RateLimitedError):
+                        self.chunk_size.report_failure()
+                    failed.update(chunk)
+                    errors.append(ex)
+                    continue
+                now = loop.time()
+                self._quotes.update(quotes)
+                # Unknown symbols are marked too so they aren't retried every call
+                for symbol in chunk:
+                    self._fetched[symbol] = now
+
+        workers = min(QUOTE_CHUNK_CONCURRENCY, -(-len(pending) // self.chunk_size.size))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return errors
+
+    async def async_run(self, func, *args, timeout=None):
+        """Await one request of the client, within the rate limit.
+
+        The timeout, if any, covers the request only, not the wait for a
+        token. Raises RateLimitedError when Yahoo rate limits us or we are
+        backing off.
+        """
+        await self.limiter.async_acquire()
+        try:
+            if timeout is None:
+                result = await func(*args)
+            else:
+                result = await asyncio.wait_for(func(*args), timeout)
+        except RateLimitedError:
+            self.limiter.async_report_rate_limited()
+            raise
+        self.limiter.async_report_success()
+        return result
+
+    @property
+    def cache_hit_rate(self):
+        """Return the share of quote lookups served without a request, or None."""
+        lookups = self.cache_hits + self.cache_misses
+        return round(self.cache_hits / lookups, 3) if lookups else None
+
+    @property
+    def metrics(self):
+        """Return the metrics of the hub, its client and rate limiter for diagnostics."""
+        return {
+            "subscribed_symbols": len(self._max_age),
+            "fetches": self.fetches,
+            "quote_cache_hits": self.cache_hits,
+            "quote_cache_misses": self.cache_misses,
+            "quote_cache_hit_rate": self.cache_hit_rate,
+            "piggybacked_symbols": self.piggybacked,
+            "quote_chunks": self.chunks,
+            "failed_quote_chunks": self.failed_chunks,
+            "quote_chunk_size": self.chunk_size.metrics,
+            "rate_limiter": self.limiter.metrics,
+            **self.client.metrics,
+        }
@@ -0,0 +1,321 @@
+"""Offline trading calendar for the exchanges Yahoo Finance symbols trade on."""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+import re
+from zoneinfo import ZoneInfo
+
+SESSION_REGULAR = "regular"
+SESSION_EXTENDED = "extended"
+
+_CRYPTO_PATTERN = re.compile(r"^[A-Z0-9]{2,}-[A-Z]{3}$")
+
+
+def _easter(year):
+    """Return Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """Return the n-th weekday (0=Monday) of a month; n=-1 is the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    """Move a holiday falling on a weekend to the nearest weekday (US rule)."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _next_weekday(day):
+    """Move a holiday falling on a weekend to the following Monday (UK rule)."""
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=16)
+def _us_holidays(year):
+    """NYSE and Nasdaq holidays."""
+    easter = _easter(year)
+    new_year = date(year, 1, 1)
+    return frozenset({
+        # A Saturday New Year is not made up on the Friday before
+        new_year + timedelta(days=1) if new_year.weekday() == 6 else new_year,
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Presidents' Day
+        easter - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 6, 19)),  # Juneteenth
+        _observed(date(year, 7, 4)),  # Independence Day
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    })
+
+
+@lru_cache(maxsize=16)
+def _xetra_holidays(year):
+    """Deutsche Börse (Xetra, Frankfurt) holidays."""
+    easter = _easter(year)
+    return frozenset({
+        date(year, 1, 1),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        date(year, 5, 1),
+        date(year, 12, 24),
+        date(year, 12, 25),
+        date(year, 12, 26),
+        date(year, 12, 31),
+    })
+
+
+@lru_cache(maxsize=16)
+def _euronext_holidays(year):
+    """Euronext (Paris, Amsterdam, Brussels, Lisbon), Milan and Madrid holidays."""
+    easter = _easter(year)
+    return frozenset({
+        date(year, 1, 1),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        date(year, 5, 1),
+        date(year, 12, 25),
+        date(year, 12, 26),
+    })
+
+
+@lru_cache(maxsize=16)
+def _lse_holidays(year):
+    """London Stock Exchange holidays."""
+    easter = _easter(year)
+    christmas = _next_weekday(date(year, 12, 25))
+    return frozenset({
+        _next_weekday(date(year, 1, 1)),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        _nth_weekday(year, 5, 0, 1),  # Early May bank holiday
+        _nth_weekday(year, 5, 0, -1),  # Spring bank holiday
+        _nth_weekday(year, 8, 0, -1),  # Summer bank holiday
+        christmas,
+        _next_weekday(christmas + timedelta(days=1)),  # Boxing Day
+    })
+
+
+@lru_cache(maxsize=16)
+def _six_holidays(year):
+    """SIX Swiss Exchange holidays."""
+    easter = _easter(year)
+    return frozenset({
+        date(year, 1, 1),
+        date(year, 1, 2),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        easter + timedelta(days=39),  # Ascension Day
+        easter + timedelta(days=50),  # Whit Monday
+        date(year, 5, 1),
+        date(year, 8, 1),
+        date(year, 12, 24),
+        date(year, 12, 25),
+        date(year, 12, 26),
+        date(year, 12, 31),
+    })
+
+
+@lru_cache(maxsize=16)
+def _jpx_holidays(year):
+    """Tokyo Stock Exchange holidays (fixed and Happy Monday dates, no equinoxes)."""
+    return frozenset({
+        date(year, 1, 1),
+        date(year, 1, 2),
+        date(year, 1, 3),
+        _nth_weekday(year, 1, 0, 2),  # Coming of Age Day
+        date(year, 2, 11),
+        date(year, 2, 23),
+        date(year, 4, 29),
+        date(year, 5, 3),
+        date(year, 5, 4),
+        date(year, 5, 5),
+        _nth_weekday(year, 7, 0, 3),  # Marine Day
+        date(year, 8, 11),
+        _nth_weekday(year, 9, 0, 3),  # Respect for the Aged Day
+        _nth_weekday(year, 10, 0, 2),  # Sports Day
+        date(year, 11, 3),
+        date(year, 11, 23),
+        date(year, 12, 31),
+    })
+
+
+def _no_holidays(year):
+    """Markets without a holiday table."""
+    return frozenset()
+
+
+@dataclass(frozen=True)
+class Market:
+    """Trading hours of one exchange in its local timezone."""
+
+    name: str
+    timezone: str
+    open: time = time(9, 0)
+    close: time = time(17, 30)
+    holidays: object = _no_holidays
+    ext_open: time | None = None
+    ext_close: time | None = None
+    # Trades 24/7 (crypto)
+    continuous: bool = False
+    # Trades around the clock from Sunday open to Friday close (FX, futures)
+    weekly: bool = False
+
+    def _is_trading_day(self, day):
+        """Return True if the exchange trades on this local date."""
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def _hours(self, ext_hours):
+        """Return the (start, end) of the session we poll in."""
+        if ext_hours and self.ext_open and self.ext_close:
+            return self.ext_open, self.ext_close
+        return self.open, self.close
+
+    def session(self, now, ext_hours=False):
+        """Return SESSION_REGULAR, SESSION_EXTENDED or None if closed at now (UTC)."""
+        if self.continuous:
+            return SESSION_REGULAR
+
+        local = now.astimezone(ZoneInfo(self.timezone))
+        current = local.time()
+
+        if self.weekly:
+            weekday = local.weekday()
+            if weekday == 5 or (weekday == 6 and current < self.open) or (weekday == 4 and current >= self.close):
+                return None
+            return SESSION_REGULAR
+
+        if not self._is_trading_day(local.date()):
+            return None
+        if self.open <= current < self.close:
+            return SESSION_REGULAR
+        start, end = self._hours(ext_hours)
+        if start <= current < end:
+            return SESSION_EXTENDED
+        return None
+
+    def next_open(self, now, ext_hours=False):
+        """Return the next session start after now (UTC), or None if always open."""
+        if self.continuous:
+            return None
+
+        tz = ZoneInfo(self.timezone)
+        local = now.astimezone(tz)
+        start = self.open if self.weekly else self._hours(ext_hours)[0]
+        for offset in range(14):
+            day = local.date() + timedelta(days=offset)
+            if self.weekly:
+                if day.weekday() != 6:
+                    continue
+            elif not self._is_trading_day(day):
+                continue
+            candidate = datetime.combine(day, start, tzinfo=tz)
+            if candidate > local:
+                return candidate.astimezone(ZoneInfo("UTC"))
+        return None
+
+
+US = Market("US", "America/New_York", time(9, 30), time(16, 0), _us_holidays, time(4, 0), time(20, 0))
+XETRA = Market("XETRA", "Europe/Berlin", time(9, 0), time(17, 30), _xetra_holidays)
+FRANKFURT = Market("Frankfurt", "Europe/Berlin", time(8, 0), time(22, 0), _xetra_holidays)
+LSE = Market("LSE", "Europe/London", time(8, 0), time(16, 30), _lse_holidays)
+EURONEXT_PARIS = Market("Euronext Paris", "Europe/Paris", time(9, 0), time(17, 30), _euronext_holidays)
+EURONEXT_AMSTERDAM = Market("Euronext Amsterdam", "Europe/Amsterdam", time(9, 0), time(17, 30), _euronext_holidays)
+EURONEXT_BRUSSELS = Market("Euronext Brussels", "Europe/Brussels", time(9, 0), time(17, 30), _euronext_holidays)
+EURONEXT_LISBON = Market("Euronext Lisbon", "Europe/Lisbon", time(8, 0), time(16, 30), _euronext_holidays)
+MILAN = Market("Milan", "Europe/Rome", time(9, 0), time(17, 30), _euronext_holidays)
+MADRID = Market("Madrid", "Europe/Madrid", time(9, 0), time(17, 30), _euronext_holidays)
+SIX = Market("SIX", "Europe/Zurich", time(9, 0), time(17, 30), _six_holidays)
+TOKYO = Market("Tokyo", "Asia/Tokyo", time(9, 0), time(15, 30), _jpx_holidays)
+HONG_KONG = Market("Hong Kong", "Asia/Hong_Kong", time(9, 30), time(16, 0))
+TORONTO = Market("Toronto", "America/Toronto", time(9, 30), time(16, 0))
+ASX = Market("ASX", "Australia/Sydney", time(10, 0), time(16, 0))
+CRYPTO = Market("Crypto", "UTC", continuous=True)
+FX = Market("FX", "America/New_York", time(17, 0), time(17, 0), weekly=True)
+FUTURES = Market("Futures", "America/New_York", time(18, 0), time(17, 0), weekly=True)
+
+# Yahoo exchange codes (quote "exchange" field)
+EXCHANGE_MARKETS = {
+    "NMS": US, "NGM": US, "NCM": US, "NYQ": US, "ASE": US, "PCX": US, "BTS": US,
+    "PNK": US, "OQB": US, "NAS": US, "NIM": US, "SNP": US, "DJI": US, "CXI": US, "WCB": US,
+    "GER": XETRA, "FRA": FRANKFURT, "STU": FRANKFURT, "DUS": FRANKFURT,
+    "MUN": FRANKFURT, "HAM": FRANKFURT, "BER": FRANKFURT,
+    "LSE": LSE, "IOB": LSE, "FGI": LSE,
+    "PAR": EURONEXT_PARIS, "AMS": EURONEXT_AMSTERDAM, "BRU": EURONEXT_BRUSSELS,
+    "LIS": EURONEXT_LISBON, "MIL": MILAN, "MCE": MADRID,
+    "EBS": SIX, "VTX": SIX,
+    "JPX": TOKYO, "OSA": TOKYO,
+    "HKG": HONG_KONG,
+    "TOR": TORONTO, "VAN": TORONTO,
+    "ASX": ASX,
+    "CCC": CRYPTO, "CCY": FX,
+    "CME": FUTURES, "CMX": FUTURES, "NYM": FUTURES, "CBT": FUTURES, "NYB": FUTURES,
+}
+
+# Symbol suffixes, used until the first quote tells us the exchange
+SUFFIX_MARKETS = {
+    "DE": XETRA, "F": FRANKFURT, "SG": FRANKFURT, "DU": FRANKFURT, "MU": FRANKFURT,
+    "HM": FRANKFURT, "BE": FRANKFURT,
+    "L": LSE, "IL": LSE,
+    "PA": EURONEXT_PARIS, "AS": EURONEXT_AMSTERDAM, "BR": EURONEXT_BRUSSELS,
+    "LS": EURONEXT_LISBON, "MI": MILAN, "MC": MADRID,
+    "SW": SIX, "VX": SIX,
+    "T": TOKYO,
+    "HK": HONG_KONG,
+    "TO": TORONTO, "V": TORONTO,
+    "AX": ASX,
+}
+
+QUOTE_TYPE_MARKETS = {
+    "CRYPTOCURRENCY": CRYPTO,
+    "CURRENCY": FX,
+    "FUTURE": FUTURES,
+}
+
+
+def get_market(symbol, quote=None):
+    """Return the Market a symbol trades on, or None if unknown.
+
+    Uses the exchange from the last quote when available, otherwise the
+    symbol's notation (suffix, =X, =F, crypto pair).
+    """
+    quote = quote or {}
+    if market := QUOTE_TYPE_MARKETS.get(quote.get("quoteType")):
+        return market
+    if market := EXCHANGE_MARKETS.get(quote.get("exchange")):
+        return market
+
+    if symbol.endswith("=X"):
+        return FX
+    if symbol.endswith("=F"):
+        return FUTURES
+    if _CRYPTO_PATTERN.match(symbol):
+        return CRYPTO
+    if "." in symbol:
+        return SUFFIX_MARKETS.get(symbol.rsplit(".", 1)[1])
+    if symbol.startswith("^"):
+        return None
+    # Plain tickers are US listings
+    return US
@@ -0,0 +1,128 @@
+"""Vectorized portfolio valuation for the Yahoo Finance integration."""
+import logging
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+# Columns of the per-position output matrix
+OUTPUT_KEYS = ("total_value", "total_value_base", "portfolio_weight", "daily_pnl", "unrealized_gain")
+
+
+def _float(value):
+    """Convert a NumPy scalar to a float, NaN to None."""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class PortfolioEngine:
+    """Value all positions of a config entry in one vectorized pass.
+
+    Amounts, prices, previous closes, cost bases and currencies live in
+    arrays aligned by position. Quote updates only touch the rows of the
+    symbols that changed; valuation then computes values, weights, daily
+    P&L, unrealized gain and currency exposure for every row at once and
+    reports only the rows whose results changed.
+    """
+
+    def __init__(self, symbol_definitions, base_currency="USD", costs=None):
+        """Initialize."""
+        costs = costs or {}
+        self.symbols = list(symbol_definitions)
+        self.base_currency = base_currency
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        size = len(self.symbols)
+        self.amounts = np.array([symbol_definitions[symbol] for symbol in self.symbols], dtype=np.float64)
+        self.costs = np.array([costs.get(symbol, np.nan) for symbol in self.symbols], dtype=np.float64)
+        self.prices = np.full(size, np.nan)
+        self.previous_close = np.full(size, np.nan)
+        # Currency of each position as an index into self.currencies
+        self.currencies = [base_currency]
+        self._currency_index = {base_currency: 0}
+        self.position_currency = np.zeros(size, dtype=np.intp)
+        self._outputs = None
+        self._missing = set()
+
+    def update_quotes(self, quotes):
+        """Update the rows of the given symbols from their quote data."""
+        for symbol, val in quotes.items():
+            i = self._index.get(symbol)
+            if i is None:
+                continue
+            self.prices[i] = val.get("regularMarketPrice") or np.nan
+            self.previous_close[i] = val.get("previousClose") or np.nan
+            currency = val.get("currency") or "USD"
+            if (index := self._currency_index.get(currency)) is None:
+                index = self._currency_index[currency] = len(self.currencies)
+                self.currencies.append(currency)
+            self.position_currency[i] = index
+
+    def value(self, fx_rates):
+        """Value the portfolio with rates into the base currency ({currency: rate}).
+
+        Positions without a rate are left out of the totals rather than being
+        counted 1:1. Returns ({symbol: values} for the rows that changed,
+        portfolio summary).
+        """
+        currency_rates = np.array([
+            1.0 if currency == self.base_currency else fx_rates.get(currency) or np.nan
+            for currency in self.currencies
+        ])
+        rate = currency_rates[self.position_currency]
+        held = (self.amounts > 0) & (self.prices > 0)
+        value = np.where(held, self.amounts * self.prices, 0.0)
+        value_base = np.where(held, value * rate, 0.0)
+        total = np.nansum(value_base)
+        weight = value_base / total * 100 if total > 0 else np.zeros_like(value_base)
+        # Weights are shown with two decimals; rounding here keeps one price
+        # tick from marking every other position as changed
+        weight = np.round(weight, 2)
+        pnl = np.where(held & ~np.isnan(self.previous_close), self.amounts * (self.prices - self.previous_close) * rate, 0.0)
+        missing = {self.currencies[i] for i in np.unique(self.position_currency[held & np.isnan(rate)])}
+        gain = np.where(held & ~np.isnan(self.costs), self.amounts * (self.prices - self.costs) * rate, np.nan)
+        exposure = np.bincount(self.position_currency, weights=np.nan_to_num(value_base), minlength=len(self.currencies))
+
+        outputs = np.column_stack((value, value_base, weight, pnl, gain))
+        if self._outputs is None or self._outputs.shape != outputs.shape:
+            changed = np.arange(len(self.symbols))
+        else:
+            same = (outputs == self._outputs) | (np.isnan(outputs) & np.isnan(self._outputs))
+            changed = np.flatnonzero(~same.all(axis=1))
+        self._outputs = outputs
+
+        # Convert in bulk, per-element NumPy scalar access is slow
+        changed = np.asarray(changed, dtype=np.intp)
+        rows = {
+            self.symbols[i]: {
+                "owned_amount": amount,
+                **{key: None if val != val else val for key, val in zip(OUTPUT_KEYS, values)},
+            }
+            for i, amount, values in zip(changed.tolist(), self.amounts[changed].tolist(), outputs[changed].tolist())
+        }
+        summary = {
+            "total_value": float(total),
+            "currency": self.base_currency,
+            "daily_pnl": float(np.nansum(pnl)),
+            "unrealized_gain": float(np.nansum(gain)) if (~np.isnan(gain)).any() else None,
+            "exposure": {
+                currency: float(amount)
+                for currency, amount in zip(self.currencies, exposure)
+                if amount
+            },
+        }
+        if missing:
+            summary["missing_rates"] = sorted(missing)
+        # Logged on change only, valuation runs on every price update
+        if missing and missing != self._missing:
+            _LOGGER.debug("No FX rate for %s, leaving those positions out of the totals", ", ".join(sorted(missing)))
+        self._missing = missing
+        return rows, summary
+
+    def row(self, index):
+        """Return the valuation of one position by symbol or row index."""
+        if isinstance(index, str):
+            index = self._index[index]
+        row = {"owned_amount": float(self.amounts[index])}
+        if self._outputs is not None:
+            row.update(zip(OUTPUT_KEYS, map(_float, self._outputs[index])))
+        return row
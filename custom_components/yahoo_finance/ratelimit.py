@@ -0,0 +1,142 @@
+"""Request rate limiting for the Yahoo Finance integration."""
+import asyncio
+import logging
+import random
+import time
+
+from homeassistant.core import callback
+
+from .api import RateLimitedError
+from .const import (
+    DEFAULT_REQUEST_BUDGET,
+    RATE_LIMIT_BACKOFF_BASE,
+    RATE_LIMIT_BACKOFF_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class YahooFinanceRateLimiter:
+    """Token bucket with exponential backoff, shared by every request we make.
+
+    The bucket refills at the request budget (requests per minute) and holds
+    up to ten seconds worth of tokens for bursts. When Yahoo answers with a
+    rate limit, no tokens are handed out until a jittered, exponentially
+    growing backoff has passed. The first successful request resets it.
+    """
+
+    def __init__(self, budget=DEFAULT_REQUEST_BUDGET):
+        """Initialize."""
+        self._default_budget = budget
+        self._budgets = {}
+        self._set_budget(budget)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._backoff_until = 0.0
+        self._failures = 0
+
+        # Metrics
+        self.requests = 0
+        self.rate_limited = 0
+        self.throttled_time = 0.0
+        # Callers waiting for a token, and since when any of them is
+        self._waiting = 0
+        self._throttled_since = 0.0
+
+    def _set_budget(self, budget):
+        """Apply a new budget in requests per minute."""
+        self.budget = max(1, budget)
+        self._rate = self.budget / 60
+        self._capacity = max(1.0, self.budget / 6)
+
+    @callback
+    def async_add_budget(self, key, budget):
+        """Register a budget; the strictest registered one wins. Returns a remove callback."""
+        self._budgets[key] = budget
+        self._apply_budgets()
+
+        @callback
+        def remove():
+            self._budgets.pop(key, None)
+            self._apply_budgets()
+
+        return remove
+
+    def _apply_budgets(self):
+        """Use the smallest registered budget."""
+        self._set_budget(min(self._budgets.values(), default=self._default_budget))
+        self._tokens = min(self._tokens, self._capacity)
+
+    def _refill(self):
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    @property
+    def backoff_remaining(self):
+        """Return the seconds left before requests are allowed again."""
+        return max(0.0, self._backoff_until - time.monotonic())
+
+    async def async_acquire(self):
+        """Wait for a request token.
+
+        Raises RateLimitedError instead of waiting while backing off, so callers
+        keep their previous data rather than blocking for minutes.
+        """
+        while True:
+            if self.backoff_remaining:
+                raise RateLimitedError("Backing off after rate limit")
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.requests += 1
+                return
+            await self._async_wait((1 - self._tokens) / self._rate)
+
+    async def _async_wait(self, wait):
+        """Sleep for a token, counting the wall-clock time anyone was throttled."""
+        if not self._waiting:
+            self._throttled_since = time.monotonic()
+        self._waiting += 1
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            self._waiting -= 1
+            if not self._waiting:
+                self.throttled_time += time.monotonic() - self._throttled_since
+
+    @callback
+    def async_report_success(self):
+        """Reset the backoff after a successful request."""
+        if self._failures:
+            _LOGGER.info("Yahoo Finance requests succeed again, rate limit backoff reset")
+            self._failures = 0
+
+    @callback
+    def async_report_rate_limited(self):
+        """Start or extend the backoff after Yahoo answered with a rate limit."""
+        self.rate_limited += 1
+        # Concurrent requests failing together count as one strike
+        if self.backoff_remaining:
+            return
+        self._failures += 1
+        delay = min(RATE_LIMIT_BACKOFF_BASE * 2 ** (self._failures - 1), RATE_LIMIT_BACKOFF_MAX)
+        delay = random.uniform(delay / 2, delay)
+        self._backoff_until = time.monotonic() + delay
+        self._tokens = 0.0
+        _LOGGER.warning("Hit Yahoo Finance rate limit, backing off for %.0f seconds", delay)
+
+    @property
+    def metrics(self):
+        """Return counters for diagnostics."""
+        self._refill()
+        return {
+            "budget_per_minute": self.budget,
+            "tokens": round(self._tokens, 2),
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "throttled_seconds": round(self.throttled_time, 1),
+            "backoff_remaining": round(self.backoff_remaining, 1),
+            "consecutive_rate_limits": self._failures,
+        }
@@ -0,0 +1,64 @@
+"""Typed per-symbol quote records for the Yahoo Finance integration."""
+from typing import NamedTuple
+
+
+class QuoteRecord(NamedTuple):
+    """Quote and portfolio valuation of one symbol.
+
+    Records are immutable: an update creates a new record, and the
+    coordinator swaps a new snapshot of records in, so readers never see
+    a half-updated quote and unchanged records are shared between
+    snapshots instead of copied. A named tuple takes a third of the memory
+    of the dict it replaces and is cheaper to create than a frozen
+    dataclass. Field names are the data keys sensors and state attributes
+    have always used.
+    """
+
+    symbol: str | None = None
+    regularMarketPrice: float | None = None
+    currency: str | None = None
+    marketCap: float | None = None
+    longName: str | None = None
+    shortName: str | None = None
+    regularMarketChangePercent: float | None = None
+    previousClose: float | None = None
+    dayHigh: float | None = None
+    dayLow: float | None = None
+    open: float | None = None
+    volume: int | None = None
+    yearHigh: float | None = None
+    yearLow: float | None = None
+    marketState: str | None = None
+    preMarketPrice: float | None = None
+    postMarketPrice: float | None = None
+    exchange: str | None = None
+    exchangeTimezoneName: str | None = None
+    quoteType: str | None = None
+    # Valuation of the position, set by the portfolio engine
+    owned_amount: float | None = None
+    total_value: float | None = None
+    total_value_base: float | None = None
+    portfolio_weight: float | None = None
+    daily_pnl: float | None = None
+    unrealized_gain: float | None = None
+
+    def get(self, key, default=None):
+        """Return a field by data key like dict.get; missing values are None."""
+        value = getattr(self, key, None) if key in FIELDS else None
+        return default if value is None else value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a record from a dict, ignoring unknown keys."""
+        return cls(**{name: data[name] for name in cls._fields if name in data})
+
+
+FIELDS = frozenset(QuoteRecord._fields)
+
+
+def encode_snapshot(data):
+    """Convert the records of a quote snapshot to dicts for the cache."""
+    return {
+        symbol: val._asdict() if isinstance(val, QuoteRecord) else val
+        for symbol, val in data.items()
+    }
@@ -1,21 +1,29 @@
 """Sensor platform for Yahoo Finance integration."""
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
     SensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
-    DOMAIN, 
-    CONF_SYMBOLS, 
-    CONF_SHOW_CHANGE_PCT, 
-    CONF_SHOW_HIGH, 
+    DOMAIN,
+    CONF_SYMBOLS,
+    CONF_SHOW_CHANGE_PCT,
+    CONF_SHOW_HIGH,
     CONF_SHOW_LOW,
     CONF_SHOW_MARKET_CAP,
     CONF_SHOW_VOLUME,
@@ -28,283 +36,661 @@ from .const import (
     CONF_SHOW_TREND,
     CONF_SHOW_ESG,
     CONF_SHOW_PERFORMANCE,
-    CONF_SHOW_MARKET_STATUS
+    CONF_SHOW_MARKET_STATUS,
+    CONF_SHOW_DIAGNOSTICS,
 )
 
+
+def _round(val, digits=2):
+    """Round a value that may be missing."""
+    return round(val, digits) if val is not None else None
+
+
+def _percent(val):
+    """Convert a ratio that may be missing into a rounded percentage."""
+    return round(val * 100, 2) if val is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class YahooFinanceSensorEntityDescription(SensorEntityDescription):
+    """Describe a Yahoo Finance sensor type."""
+
+    value_fn: Callable[[dict], Any]
+    name_fn: Callable[[str], str]
+    # Coordinator the state is read from: quotes, fundamentals or history
+    source: str = "quotes"
+    # Slow data group the state needs fetched (see KEY_GROUPS)
+    group: str | None = None
+    # The unit is the currency of the quote
+    currency_unit: bool = False
+    # (state attribute, data key) pairs carried by this sensor
+    attributes: tuple[tuple[str, str], ...] = ()
+    # Carry the news headlines (primary entity only)
+    news: bool = False
+
+
+# Slow data group of every data key that isn't part of the quote. Groups
+# are only fetched for symbols with an enabled sensor whose state needs them.
+KEY_GROUPS = {
+    "dividendYield": "dividends",
+    "exDividendDate": "dividends",
+    "trailingAnnualDividendRate": "dividends",
+    "nextEarningsDate": "earnings",
+    "forwardPE": "valuation",
+    "trailingPE": "valuation",
+    "beta": "valuation",
+    "totalEsg": "esg",
+    "environmentScore": "esg",
+    "socialScore": "esg",
+    "governanceScore": "esg",
+    "fiftyDayAverage": "history",
+    "twoHundredDayAverage": "history",
+    "ytdReturn": "history",
+}
+
+# The price sensor is the primary entity of a symbol and carries all of these
+# whose group is fetched anyway, plus the news
+PRIMARY_ATTRIBUTES = (
+    ("regularMarketChangePercent", "regularMarketChangePercent"),
+    ("regularMarketDayHigh", "dayHigh"),
+    ("regularMarketDayLow", "dayLow"),
+    ("marketCap", "marketCap"),
+    ("volume", "volume"),
+    ("open", "open"),
+    ("fiftyTwoWeekHigh", "yearHigh"),
+    ("fiftyTwoWeekLow", "yearLow"),
+    ("longName", "longName"),
+    ("shortName", "shortName"),
+    ("dividendYield", "dividendYield"),
+    ("exDividendDate", "exDividendDate"),
+    ("nextEarningsDate", "nextEarningsDate"),
+    ("beta", "beta"),
+    ("totalEsg", "totalEsg"),
+    ("environmentScore", "environmentScore"),
+    ("socialScore", "socialScore"),
+    ("governanceScore", "governanceScore"),
+    ("marketState", "marketState"),
+    ("preMarketPrice", "preMarketPrice"),
+    ("postMarketPrice", "postMarketPrice"),
+    ("fiftyDayAverage", "fiftyDayAverage"),
+    ("twoHundredDayAverage", "twoHundredDayAverage"),
+    ("ytdReturn", "ytdReturn"),
+)
+
+SENSOR_DESCRIPTIONS = {
+    description.key: description
+    for description in (
+        YahooFinanceSensorEntityDescription(
+            key="price",
+            name_fn=lambda symbol: symbol,
+            device_class=SensorDeviceClass.MONETARY,
+            currency_unit=True,
+            value_fn=lambda data: data.get("regularMarketPrice"),
+            attributes=PRIMARY_ATTRIBUTES,
+            news=True,
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="change_pct",
+            name_fn=lambda symbol: f"{symbol} Change %",
+            native_unit_of_measurement="%",
+            icon="mdi:percent",
+            value_fn=lambda data: _round(data.get("regularMarketChangePercent")),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="high",
+            name_fn=lambda symbol: f"{symbol} Day High",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:arrow-up-circle",
+            currency_unit=True,
+            value_fn=lambda data: data.get("dayHigh"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="low",
+            name_fn=lambda symbol: f"{symbol} Day Low",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:arrow-down-circle",
+            currency_unit=True,
+            value_fn=lambda data: data.get("dayLow"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="market_cap",
+            name_fn=lambda symbol: f"{symbol} Market Cap",
+            icon="mdi:chart-areaspline",
+            currency_unit=True,
+            value_fn=lambda data: data.get("marketCap"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="volume",
+            name_fn=lambda symbol: f"{symbol} Volume",
+            icon="mdi:chart-line",
+            value_fn=lambda data: data.get("volume"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="open",
+            name_fn=lambda symbol: f"{symbol} Open",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:door-open",
+            currency_unit=True,
+            value_fn=lambda data: data.get("open"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="52wk_high",
+            name_fn=lambda symbol: f"{symbol} 52-Week High",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:arrow-up-bold-circle-outline",
+            currency_unit=True,
+            value_fn=lambda data: data.get("yearHigh"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="52wk_low",
+            name_fn=lambda symbol: f"{symbol} 52-Week Low",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:arrow-down-bold-circle-outline",
+            currency_unit=True,
+            value_fn=lambda data: data.get("yearLow"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="total_value",
+            name_fn=lambda symbol: f"{symbol} Holding Value",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:wallet",
+            currency_unit=True,
+            value_fn=lambda data: data.get("total_value"),
+            attributes=(
+                ("owned_amount", "owned_amount"),
+                ("daily_pnl", "daily_pnl"),
+                ("unrealized_gain", "unrealized_gain"),
+            ),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="portfolio_weight",
+            name_fn=lambda symbol: f"{symbol} Portfolio Weight",
+            native_unit_of_measurement="%",
+            icon="mdi:chart-pie",
+            value_fn=lambda data: round(data.get("portfolio_weight", 0), 2),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="dividend_yield",
+            name_fn=lambda symbol: f"{symbol} Dividend Yield",
+            native_unit_of_measurement="%",
+            icon="mdi:cash-dividend",
+            source="fundamentals",
+            group="dividends",
+            value_fn=lambda data: _percent(data.get("dividendYield")),
+            attributes=(
+                ("exDividendDate", "exDividendDate"),
+                ("trailingAnnualDividendRate", "trailingAnnualDividendRate"),
+            ),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="next_earnings",
+            name_fn=lambda symbol: f"{symbol} Next Earnings",
+            device_class=SensorDeviceClass.DATE,
+            icon="mdi:calendar-star",
+            source="fundamentals",
+            group="earnings",
+            value_fn=lambda data: date.fromisoformat(data["nextEarningsDate"]) if data.get("nextEarningsDate") else None,
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="pe_ratio",
+            name_fn=lambda symbol: f"{symbol} P/E Ratio",
+            icon="mdi:chart-shave",
+            source="fundamentals",
+            group="valuation",
+            value_fn=lambda data: _round(data.get("forwardPE") or data.get("trailingPE")),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="fifty_day_avg",
+            name_fn=lambda symbol: f"{symbol} 50-Day Average",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:chart-bell-curve-cumulative",
+            source="history",
+            group="history",
+            currency_unit=True,
+            value_fn=lambda data: data.get("fiftyDayAverage"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="two_hundred_day_avg",
+            name_fn=lambda symbol: f"{symbol} 200-Day Average",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:chart-bell-curve",
+            source="history",
+            group="history",
+            currency_unit=True,
+            value_fn=lambda data: data.get("twoHundredDayAverage"),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="total_portfolio_value",
+            name_fn=lambda symbol: "Portfolio Total Value",
+            device_class=SensorDeviceClass.MONETARY,
+            icon="mdi:bank",
+            currency_unit=True,
+            value_fn=lambda data: data.get("total_value"),
+            attributes=(
+                ("daily_pnl", "daily_pnl"),
+                ("unrealized_gain", "unrealized_gain"),
+                ("exposure", "exposure"),
+                ("missing_rates", "missing_rates"),
+            ),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="esg_score",
+            name_fn=lambda symbol: f"{symbol} ESG Score",
+            icon="mdi:leaf",
+            source="fundamentals",
+            group="esg",
+            value_fn=lambda data: data.get("totalEsg"),
+            attributes=(
+                ("environmentScore", "environmentScore"),
+                ("socialScore", "socialScore"),
+                ("governanceScore", "governanceScore"),
+            ),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="ytd_return",
+            name_fn=lambda symbol: f"{symbol} YTD Return",
+            native_unit_of_measurement="%",
+            icon="mdi:chart-line-variant",
+            source="history",
+            group="history",
+            value_fn=lambda data: _percent(data.get("ytdReturn")),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="market_status",
+            name_fn=lambda symbol: f"{symbol} Market Status",
+            icon="mdi:clock-check",
+            value_fn=lambda data: data.get("marketState"),
+            attributes=(
+                ("preMarketPrice", "preMarketPrice"),
+                ("postMarketPrice", "postMarketPrice"),
+            ),
+        ),
+        YahooFinanceSensorEntityDescription(
+            key="beta",
+            name_fn=lambda symbol: f"{symbol} Beta Factor",
+            icon="mdi:calculator-variant",
+            source="fundamentals",
+            group="valuation",
+            value_fn=lambda data: _round(data.get("beta")),
+        ),
+    )
+}
+
+# Optional per-symbol sensors: (option, default, sensor types)
+OPTIONAL_SENSORS = (
+    (CONF_SHOW_CHANGE_PCT, True, ("change_pct",)),
+    (CONF_SHOW_HIGH, True, ("high",)),
+    (CONF_SHOW_LOW, True, ("low",)),
+    (CONF_SHOW_MARKET_CAP, False, ("market_cap",)),
+    (CONF_SHOW_VOLUME, False, ("volume",)),
+    (CONF_SHOW_OPEN, False, ("open",)),
+    (CONF_SHOW_52WK_HIGH, False, ("52wk_high",)),
+    (CONF_SHOW_52WK_LOW, False, ("52wk_low",)),
+    (CONF_SHOW_DIVIDEND, False, ("dividend_yield",)),
+    (CONF_SHOW_EARNINGS, False, ("next_earnings",)),
+    (CONF_SHOW_PE, False, ("pe_ratio",)),
+    (CONF_SHOW_TREND, False, ("fifty_day_avg", "two_hundred_day_avg")),
+    (CONF_SHOW_ESG, False, ("esg_score",)),
+    (CONF_SHOW_PERFORMANCE, False, ("ytd_return",)),
+    (CONF_SHOW_MARKET_STATUS, False, ("market_status",)),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class YahooFinanceDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describe a sensor exposing the integration's own metrics."""
+
+    # Both get the YahooFinanceCoordinators of the entry
+    value_fn: Callable[[Any], Any]
+    attributes_fn: Callable[[Any], dict] | None = None
+
+
+def _latencies(coordinators, percent):
+    """Return a latency percentile in ms per endpoint."""
+    return {
+        name: metrics.percentile(percent)
+        for name, metrics in coordinators.quotes.hub.client.endpoints.items()
+    }
+
+
+# Optional sensors for finding bottlenecks; hub metrics are shared by all entries
+DIAGNOSTIC_SENSORS = (
+    YahooFinanceDiagnosticSensorEntityDescription(
+        key="requests",
+        name="Yahoo Finance Requests",
+        icon="mdi:swap-vertical",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinators: coordinators.quotes.hub.limiter.requests,
+        attributes_fn=lambda coordinators: {
+            "rate_limited": coordinators.quotes.hub.limiter.rate_limited,
+            "throttled_seconds": round(coordinators.quotes.hub.limiter.throttled_time, 1),
+            "bytes": sum(metrics.bytes for metrics in coordinators.quotes.hub.client.endpoints.values()),
+        },
+    ),
+    YahooFinanceDiagnosticSensorEntityDescription(
+        key="request_latency",
+        name="Yahoo Finance Quote Latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinators: _latencies(coordinators, 90).get("quote"),
+        attributes_fn=lambda coordinators: {
+            "p50": _latencies(coordinators, 50),
+            "p90": _latencies(coordinators, 90),
+            "p99": _latencies(coordinators, 99),
+        },
+    ),
+    YahooFinanceDiagnosticSensorEntityDescription(
+        key="rate_limit_cooldown",
+        name="Yahoo Finance Rate Limit Cooldown",
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda coordinators: round(coordinators.quotes.hub.limiter.backoff_remaining),
+    ),
+    YahooFinanceDiagnosticSensorEntityDescription(
+        key="quote_cache_hit_rate",
+        name="Yahoo Finance Quote Cache Hit Rate",
+        icon="mdi:cached",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinators: _percent(coordinators.quotes.hub.cache_hit_rate),
+    ),
+    YahooFinanceDiagnosticSensorEntityDescription(
+        key="state_writes",
+        name="Yahoo Finance State Writes",
+        icon="mdi:pencil",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinators: coordinators.state_writes,
+        attributes_fn=lambda coordinators: {"skipped_writes": coordinators.skipped_writes},
+    ),
+)
+
+
+def _key_source(key):
+    """Return the coordinator holding a data key."""
+    if key not in KEY_GROUPS:
+        return "quotes"
+    return "history" if KEY_GROUPS[key] == "history" else "fundamentals"
+
+
+def unique_id(symbol, sensor_type):
+    """Return the unique ID of a sensor."""
+    return f"{DOMAIN}_{symbol.lower()}_{sensor_type}"
+
+
+def enabled_sensor_types(conf):
+    """Return the per-symbol sensor types enabled in the options."""
+    sensor_types = ["price", "beta"]
+    for option, default, types in OPTIONAL_SENSORS:
+        if conf.get(option, default):
+            sensor_types.extend(types)
+    return sensor_types
+
+
+def required_data_groups(conf, symbols, disabled=()):
+    """Return the slow data groups to fetch per symbol.
+
+    A group is needed when a sensor enabled in the options, and not disabled
+    in the entity registry (disabled holds unique IDs), reads its state from
+    it. News is needed by the price sensor.
+    """
+    sensor_types = enabled_sensor_types(conf)
+    groups = {}
+    for symbol in symbols:
+        needed = groups[symbol] = set()
+        for sensor_type in sensor_types:
+            if unique_id(symbol, sensor_type) in disabled:
+                continue
+            description = SENSOR_DESCRIPTIONS[sensor_type]
+            if description.group:
+                needed.add(description.group)
+            if description.news:
+                needed.add("news")
+    return groups
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Yahoo Finance sensor based on a config entry."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-    
-    # Prioritize options over data
-    conf = {**entry.data, **entry.options}
-    
-    show_change_pct = conf.get(CONF_SHOW_CHANGE_PCT, True)
-    show_high = conf.get(CONF_SHOW_HIGH, True)
-    show_low = conf.get(CONF_SHOW_LOW, True)
-    show_market_cap = conf.get(CONF_SHOW_MARKET_CAP, False)
-    show_volume = conf.get(CONF_SHOW_VOLUME, False)
-    show_open = conf.get(CONF_SHOW_OPEN, False)
-    show_52wk_high = conf.get(CONF_SHOW_52WK_HIGH, False)
-    show_52wk_low = conf.get(CONF_SHOW_52WK_LOW, False)
-    show_dividend = conf.get(CONF_SHOW_DIVIDEND, False)
-    show_earnings = conf.get(CONF_SHOW_EARNINGS, False)
-    show_pe = conf.get(CONF_SHOW_PE, False)
-    show_trend = conf.get(CONF_SHOW_TREND, False)
-    show_esg = conf.get(CONF_SHOW_ESG, False)
-    show_performance = conf.get(CONF_SHOW_PERFORMANCE, False)
-    show_market_status = conf.get(CONF_SHOW_MARKET_STATUS, False)
-
-    entities = []
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    entities = [factory() for factory in _entity_factories(coordinators, entry.entry_id).values()]
+    coordinators.entities = {entity.unique_id: entity for entity in entities}
+    coordinators.async_add_entities = async_add_entities
+    async_add_entities(entities)
+
+
+def _entity_factories(coordinators, entry_id):
+    """Return a factory for every entity the options ask for, by unique ID."""
+    coordinator = coordinators.quotes
+    conf = coordinators.conf
+    sensor_types = enabled_sensor_types(conf)
+
+    factories = {}
     for symbol in coordinator.symbols:
-        entities.append(YahooFinanceSensor(coordinator, symbol, "price"))
-        if show_change_pct:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "change_pct"))
-        if show_high:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "high"))
-        if show_low:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "low"))
-        if show_market_cap:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "market_cap"))
-        if show_volume:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "volume"))
-        if show_open:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "open"))
-        if show_52wk_high:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "52wk_high"))
-        if show_52wk_low:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "52wk_low"))
-            
+        for sensor_type in sensor_types:
+            factories[unique_id(symbol, sensor_type)] = partial(YahooFinanceSensor, coordinators, symbol, sensor_type)
+
         # Portfolio value sensor (only if amount > 0)
         amount = coordinator.symbol_definitions.get(symbol, 0)
         if amount > 0:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "total_value"))
-            entities.append(YahooFinanceSensor(coordinator, symbol, "portfolio_weight"))
-            
-        # Extended data sensors (only if enabled)
-        if show_dividend:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "dividend_yield"))
-        if show_earnings:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "next_earnings"))
-        if show_pe:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "pe_ratio"))
-        if show_trend:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "fifty_day_avg"))
-            entities.append(YahooFinanceSensor(coordinator, symbol, "two_hundred_day_avg"))
-        if show_esg:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "esg_score"))
-        if show_performance:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "ytd_return"))
-        if show_market_status:
-            entities.append(YahooFinanceSensor(coordinator, symbol, "market_status"))
-        
-        entities.append(YahooFinanceSensor(coordinator, symbol, "beta"))
-            
+            for sensor_type in ("total_value", "portfolio_weight"):
+                factories[unique_id(symbol, sensor_type)] = partial(YahooFinanceSensor, coordinators, symbol, sensor_type)
+
     # Total Portfolio sensor
     if any(amt > 0 for amt in coordinator.symbol_definitions.values()):
-        entities.append(YahooFinanceSensor(coordinator, "__portfolio__", "total_portfolio_value"))
-    
-    async_add_entities(entities)
+        factories[unique_id("__portfolio__", "total_portfolio_value")] = partial(
+            YahooFinanceSensor, coordinators, "__portfolio__", "total_portfolio_value"
+        )
+
+    if conf.get(CONF_SHOW_DIAGNOSTICS, False):
+        for description in DIAGNOSTIC_SENSORS:
+            factories[f"{DOMAIN}_{entry_id}_{description.key}"] = partial(
+                YahooFinanceDiagnosticSensor, coordinators, entry_id, description
+            )
+
+    return factories
+
+
+async def async_update_entities(hass, entry_id, coordinators):
+    """Add and remove entities to match changed options.
+
+    Entities that are still wanted are kept as they are; they only pick up
+    changed data groups of their symbol.
+    """
+    factories = _entity_factories(coordinators, entry_id)
+    registry = er.async_get(hass)
+    for uid in coordinators.entities.keys() - factories.keys():
+        entity = coordinators.entities.pop(uid)
+        # Entities disabled in the registry were never added
+        if entity.hass is not None:
+            await entity.async_remove(force_remove=True)
+        if entity_id := registry.async_get_entity_id(Platform.SENSOR, DOMAIN, uid):
+            registry.async_remove(entity_id)
+
+    for entity in coordinators.entities.values():
+        if isinstance(entity, YahooFinanceSensor) and entity.hass is not None:
+            entity.async_update_groups()
+
+    new = [factory() for uid, factory in factories.items() if uid not in coordinators.entities]
+    coordinators.entities.update((entity.unique_id, entity) for entity in new)
+    if new:
+        coordinators.async_add_entities(new)
 
 class YahooFinanceSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Yahoo Finance sensor."""
 
+    entity_description: YahooFinanceSensorEntityDescription
     _attr_has_entity_name = True
+    # Large or rarely changing attributes stay out of the recorder history
+    _unrecorded_attributes = frozenset({
+        "news",
+        "longName",
+        "shortName",
+        "exDividendDate",
+        "nextEarningsDate",
+        "environmentScore",
+        "socialScore",
+        "governanceScore",
+    })
 
-    def __init__(self, coordinator, symbol, sensor_type):
+    def __init__(self, coordinators, symbol, sensor_type):
         """Initialize."""
-        super().__init__(coordinator)
+        description = SENSOR_DESCRIPTIONS[sensor_type]
+        # Subscribe only to the coordinator this sensor reads its state from,
+        # with our symbol as context so we are only notified when it changed
+        super().__init__(getattr(coordinators, description.source), context=symbol)
+        self.entity_description = description
+        self._coordinators = coordinators
         self.symbol = symbol
         self.sensor_type = sensor_type
-        self._attr_unique_id = f"{DOMAIN}_{symbol.lower()}_{sensor_type}"
-        
-        if sensor_type == "price":
-            self._attr_name = f"{symbol}"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-        elif sensor_type == "change_pct":
-            self._attr_name = f"{symbol} Change %"
-            self._attr_native_unit_of_measurement = "%"
-            self._attr_icon = "mdi:percent"
-        elif sensor_type == "high":
-            self._attr_name = f"{symbol} Day High"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:arrow-up-circle"
-        elif sensor_type == "low":
-            self._attr_name = f"{symbol} Day Low"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:arrow-down-circle"
-        elif sensor_type == "market_cap":
-            self._attr_name = f"{symbol} Market Cap"
-            self._attr_icon = "mdi:chart-areaspline"
-        elif sensor_type == "volume":
-            self._attr_name = f"{symbol} Volume"
-            self._attr_icon = "mdi:chart-line"
-        elif sensor_type == "open":
-            self._attr_name = f"{symbol} Open"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:door-open"
-        elif sensor_type == "52wk_high":
-            self._attr_name = f"{symbol} 52-Week High"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:arrow-up-bold-circle-outline"
-        elif sensor_type == "52wk_low":
-            self._attr_name = f"{symbol} 52-Week Low"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:arrow-down-bold-circle-outline"
-        elif sensor_type == "total_value":
-            self._attr_name = f"{symbol} Holding Value"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:wallet"
-        elif sensor_type == "portfolio_weight":
-            self._attr_name = f"{symbol} Portfolio Weight"
-            self._attr_native_unit_of_measurement = "%"
-            self._attr_icon = "mdi:chart-pie"
-        elif sensor_type == "dividend_yield":
-            self._attr_name = f"{symbol} Dividend Yield"
-            self._attr_native_unit_of_measurement = "%"
-            self._attr_icon = "mdi:cash-dividend"
-        elif sensor_type == "next_earnings":
-            self._attr_name = f"{symbol} Next Earnings"
-            self._attr_device_class = SensorDeviceClass.DATE
-            self._attr_icon = "mdi:calendar-star"
-        elif sensor_type == "pe_ratio":
-            self._attr_name = f"{symbol} P/E Ratio"
-            self._attr_icon = "mdi:chart-shave"
-        elif sensor_type == "fifty_day_avg":
-            self._attr_name = f"{symbol} 50-Day Average"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:chart-bell-curve-cumulative"
-        elif sensor_type == "two_hundred_day_avg":
-            self._attr_name = f"{symbol} 200-Day Average"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:chart-bell-curve"
-        elif sensor_type == "total_portfolio_value":
-            self._attr_name = "Portfolio Total Value"
-            self._attr_device_class = SensorDeviceClass.MONETARY
-            self._attr_icon = "mdi:bank"
-        elif sensor_type == "esg_score":
-            self._attr_name = f"{symbol} ESG Score"
-            self._attr_icon = "mdi:leaf"
-        elif sensor_type == "ytd_return":
-            self._attr_name = f"{symbol} YTD Return"
-            self._attr_native_unit_of_measurement = "%"
-            self._attr_icon = "mdi:chart-line-variant"
-        elif sensor_type == "market_status":
-            self._attr_name = f"{symbol} Market Status"
-            self._attr_icon = "mdi:clock-check"
-        elif sensor_type == "beta":
-            self._attr_name = f"{symbol} Beta Factor"
-            self._attr_icon = "mdi:calculator-variant"
+        self._last_written = None
+        self._unsub_extra = {}
+        self._set_groups()
+        self._attr_unique_id = unique_id(symbol, sensor_type)
+        self._attr_name = description.name_fn(symbol)
 
         if symbol == "__portfolio__":
              self.entity_id = f"sensor.{DOMAIN}_total_portfolio_value"
         else:
              self.entity_id = f"sensor.{DOMAIN}_{symbol.lower()}_{sensor_type}"
 
+    def _set_groups(self):
+        """Leave out attributes of data groups that aren't fetched for our symbol."""
+        groups = self._coordinators.groups.get(self.symbol, ())
+        # (state attribute, data key, coordinator holding the key); quotes of
+        # symbols are records read by attribute, the portfolio summary a dict
+        record = self.symbol != "__portfolio__"
+        self._attributes = tuple(
+            (name, key, "record" if record and source == "quotes" else source)
+            for name, key in self.entity_description.attributes
+            if key not in KEY_GROUPS or KEY_GROUPS[key] in groups
+            for source in (_key_source(key),)
+        )
+        self._news = self.entity_description.news and "news" in groups
+        # Other coordinators we carry attributes from
+        self._extra_sources = {
+            source for _, _, source in self._attributes if source not in ("quotes", "record")
+        } - {self.entity_description.source}
+        if self._news:
+            self._extra_sources.add("news")
+
+    @callback
+    def _async_subscribe_extra(self):
+        """Subscribe to the other coordinators we carry attributes from.
+
+        The price sensor carries fundamentals, history and news besides its
+        quote, and has to be rewritten when they change for our symbol.
+        """
+        for source in self._unsub_extra.keys() - self._extra_sources:
+            self._unsub_extra.pop(source)()
+        for source in self._extra_sources - self._unsub_extra.keys():
+            self._unsub_extra[source] = getattr(self._coordinators, source).async_add_listener(
+                self._handle_coordinator_update, self.symbol
+            )
+
+    @callback
+    def _async_unsubscribe_extra(self):
+        """Unsubscribe from the other coordinators."""
+        while self._unsub_extra:
+            self._unsub_extra.popitem()[1]()
+
+    async def async_added_to_hass(self):
+        """Subscribe to the other coordinators we carry attributes from as well."""
+        await super().async_added_to_hass()
+        self._async_subscribe_extra()
+        self.async_on_remove(self._async_unsubscribe_extra)
+
+    @callback
+    def async_update_groups(self):
+        """Pick up changed data groups of our symbol after new options."""
+        self._set_groups()
+        self._async_subscribe_extra()
+        self._handle_coordinator_update()
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data or self.symbol not in self.coordinator.data:
+        data = self.coordinator.data
+        if not data or self.symbol not in data:
             return None
-        
-        data = self.coordinator.data[self.symbol]
-        if self.sensor_type == "price":
-            return data.get("regularMarketPrice")
-        elif self.sensor_type == "change_pct":
-            pct = data.get("regularMarketChangePercent")
-            return round(pct, 2) if pct is not None else None
-        elif self.sensor_type == "high":
-            return data.get("dayHigh")
-        elif self.sensor_type == "low":
-            return data.get("dayLow")
-        elif self.sensor_type == "market_cap":
-            return data.get("marketCap")
-        elif self.sensor_type == "volume":
-            return data.get("volume")
-        elif self.sensor_type == "open":
-            return data.get("open")
-        elif self.sensor_type == "52wk_high":
-            return data.get("yearHigh")
-        elif self.sensor_type == "52wk_low":
-            return data.get("yearLow")
-        elif self.sensor_type == "total_value":
-            return data.get("total_value")
-        elif self.sensor_type == "portfolio_weight":
-            return round(data.get("portfolio_weight", 0), 2)
-        elif self.sensor_type == "dividend_yield":
-            val = data.get("dividendYield")
-            return round(val * 100, 2) if val is not None else None
-        elif self.sensor_type == "next_earnings":
-            return data.get("nextEarningsDate")
-        elif self.sensor_type == "pe_ratio":
-            val = data.get("forwardPE") or data.get("trailingPE")
-            return round(val, 2) if val is not None else None
-        elif self.sensor_type == "fifty_day_avg":
-            return data.get("fiftyDayAverage")
-        elif self.sensor_type == "two_hundred_day_avg":
-            return data.get("twoHundredDayAverage")
-        elif self.sensor_type == "total_portfolio_value":
-             return self.coordinator.data.get("__portfolio__", {}).get("total_value")
-        elif self.sensor_type == "esg_score":
-            return data.get("totalEsg")
-        elif self.sensor_type == "ytd_return":
-            val = data.get("ytdReturn")
-            return round(val * 100, 2) if val is not None else None
-        elif self.sensor_type == "market_status":
-            return data.get("marketState")
-        elif self.sensor_type == "beta":
-            val = data.get("beta")
-            return round(val, 2) if val is not None else None
-        return None
+        return self.entity_description.value_fn(data[self.symbol])
 
     @property
     def native_unit_of_measurement(self):
         """Return the unit of measurement."""
-        if self.sensor_type in ["change_pct", "dividend_yield", "portfolio_weight", "ytd_return"]:
-            return "%"
-        
-        # These sensors do not have units
-        if self.sensor_type in ["next_earnings", "volume", "pe_ratio", "market_status", "esg_score", "beta"]:
-             return None
-
-        if self.coordinator.data and self.symbol in self.coordinator.data:
-            return self.coordinator.data[self.symbol].get("currency")
+        if not self.entity_description.currency_unit:
+            return self.entity_description.native_unit_of_measurement
+
+        quotes = self._coordinators.quotes.data
+        if quotes and self.symbol in quotes:
+            return quotes[self.symbol].get("currency")
         return None
 
     @property
     def extra_state_attributes(self):
-        """Return the state attributes."""
-        if self.coordinator.data and self.symbol in self.coordinator.data:
-            info = self.coordinator.data[self.symbol]
-            pct_change = info.get("regularMarketChangePercent")
-            return {
-                "regularMarketChangePercent": round(pct_change, 2) if pct_change is not None else None,
-                "regularMarketDayHigh": info.get("dayHigh"),
-                "regularMarketDayLow": info.get("dayLow"),
-                "marketCap": info.get("marketCap"),
-                "volume": info.get("volume"),
-                "open": info.get("open"),
-                "fiftyTwoWeekHigh": info.get("yearHigh"),
-                "fiftyTwoWeekLow": info.get("yearLow"),
-                "longName": info.get("longName"),
-                "shortName": info.get("shortName"),
-                "news": info.get("news"),
-                "dividendYield": info.get("dividendYield"),
-                "exDividendDate": info.get("exDividendDate"),
-                "nextEarningsDate": info.get("nextEarningsDate"),
-                "beta": info.get("beta"),
-                "totalEsg": info.get("totalEsg"),
-                "environmentScore": info.get("environmentScore"),
-                "socialScore": info.get("socialScore"),
-                "governanceScore": info.get("governanceScore"),
-                "marketState": info.get("marketState"),
-                "preMarketPrice": info.get("preMarketPrice"),
-                "postMarketPrice": info.get("postMarketPrice"),
-                "fiftyDayAverage": info.get("fiftyDayAverage"),
-                "twoHundredDayAverage": info.get("twoHundredDayAverage"),
-                "ytdReturn": info.get("ytdReturn")
-            }
-        return {}
+        """Return the state attributes.
+
+        The price sensor carries the full set, the others only their own.
+        """
+        quotes = self._coordinators.quotes.data
+        if not self._attributes or not quotes or self.symbol not in quotes:
+            return {}
+        quote = quotes[self.symbol]
+        sources = {
+            "quotes": quote,
+            "fundamentals": (self._coordinators.fundamentals.data or {}).get(self.symbol, {}),
+            "history": (self._coordinators.history.data or {}).get(self.symbol, {}),
+        }
+        attributes = {
+            name: getattr(quote, key) if source == "record" else sources[source].get(key)
+            for name, key, source in self._attributes
+        }
+        if "regularMarketChangePercent" in attributes:
+            attributes["regularMarketChangePercent"] = _round(attributes["regularMarketChangePercent"])
+        if self._news:
+            attributes["news"] = (self._coordinators.news.data or {}).get(self.symbol)
+        return attributes
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write the state only if the value, attributes or availability changed."""
+        state = (self.available, self.native_value, self.extra_state_attributes)
+        if state == self._last_written:
+            self._coordinators.skipped_writes += 1
+            return
+        self._last_written = state
+        self._coordinators.state_writes += 1
+        self.async_write_ha_state()
+
+
+class YahooFinanceDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Sensor exposing one of the integration's own metrics.
+
+    Metrics are read whenever the quotes coordinator updates.
+    """
+
+    entity_description: YahooFinanceDiagnosticSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"p50", "p90", "p99"})
+
+    def __init__(self, coordinators, entry_id, description):
+        """Initialize."""
+        super().__init__(coordinators.quotes)
+        self.entity_description = description
+        self._coordinators = coordinators
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{description.key}"
+
+    @property
+    def native_value(self):
+        """Return the current value of the metric."""
+        return self.entity_description.value_fn(self._coordinators)
+
+    @property
+    def extra_state_attributes(self):
+        """Return related metrics."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._coordinators)
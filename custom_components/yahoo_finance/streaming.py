@@ -0,0 +1,231 @@
+"""Streaming price feed for the Yahoo Finance integration."""
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import random
+import struct
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import STREAM_URL, STREAM_RECONNECT_BASE, STREAM_RECONNECT_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+# Field number -> (name, type) of Yahoo's PricingData protobuf message
+PRICING_FIELDS = {
+    1: ("id", "string"),
+    2: ("price", "float"),
+    3: ("time", "sint64"),
+    4: ("currency", "string"),
+    5: ("exchange", "string"),
+    6: ("quoteType", "int"),
+    7: ("marketHours", "int"),
+    8: ("changePercent", "float"),
+    9: ("dayVolume", "sint64"),
+    10: ("dayHigh", "float"),
+    11: ("dayLow", "float"),
+    12: ("change", "float"),
+    13: ("shortName", "string"),
+    15: ("openPrice", "float"),
+    16: ("previousClose", "float"),
+    33: ("marketcap", "double"),
+}
+
+MARKET_HOURS_PRE = 0
+MARKET_HOURS_REGULAR = 1
+
+
+def _read_varint(buf, pos):
+    """Read a protobuf varint, returning (value, new position)."""
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def decode_pricing(buf):
+    """Decode a PricingData protobuf message into a dict of known fields.
+
+    Raises ValueError on malformed input.
+    """
+    fields = {}
+    pos = 0
+    try:
+        while pos < len(buf):
+            key, pos = _read_varint(buf, pos)
+            number, wire_type = key >> 3, key & 7
+            if wire_type == 0:
+                value, pos = _read_varint(buf, pos)
+            elif wire_type == 1:
+                value, pos = buf[pos:pos + 8], pos + 8
+            elif wire_type == 2:
+                length, pos = _read_varint(buf, pos)
+                value, pos = buf[pos:pos + length], pos + length
+            elif wire_type == 5:
+                value, pos = buf[pos:pos + 4], pos + 4
+            else:
+                raise ValueError(f"Unsupported wire type {wire_type}")
+            if pos > len(buf):
+                raise ValueError(f"Field {number} runs past the end of the message")
+
+            if (spec := PRICING_FIELDS.get(number)) is None:
+                continue
+            name, kind = spec
+            if kind == "string":
+                fields[name] = value.decode()
+            elif kind == "float":
+                # Float32 carries about 7 significant digits; drop the noise
+                fields[name] = float(f"{struct.unpack('<f', value)[0]:.7g}")
+            elif kind == "double":
+                fields[name] = struct.unpack("<d", value)[0]
+            elif kind == "sint64":
+                fields[name] = (value >> 1) ^ -(value & 1)
+            else:
+                fields[name] = value
+    except (IndexError, TypeError, AttributeError, struct.error, UnicodeDecodeError) as ex:
+        # Truncated data, or a field of an unexpected wire type
+        raise ValueError(f"Malformed pricing message: {ex}") from ex
+    return fields
+
+
+def decode_message(text):
+    """Decode a websocket text frame into pricing fields.
+
+    Newer feeds wrap the base64 protobuf in JSON, older ones send it bare.
+    Raises ValueError on malformed input.
+    """
+    if text.startswith("{"):
+        message = json.loads(text)
+        if not isinstance(message, dict):
+            raise ValueError("Malformed pricing message: not a JSON object")
+        text = message.get("message") or ""
+    try:
+        return decode_pricing(base64.b64decode(text))
+    except (binascii.Error, TypeError) as ex:
+        raise ValueError(f"Malformed pricing message: {ex}") from ex
+
+
+def apply_pricing(fields, ext_hours=False):
+    """Translate pricing fields into the coordinator's per-symbol keys."""
+    price = fields.get("price")
+    if not price:
+        return {}
+
+    market_hours = fields.get("marketHours", MARKET_HOURS_REGULAR)
+    if market_hours == MARKET_HOURS_REGULAR:
+        data = {"regularMarketPrice": price}
+        if "changePercent" in fields:
+            data["regularMarketChangePercent"] = fields["changePercent"]
+        for source, key in (("dayHigh", "dayHigh"), ("dayLow", "dayLow"), ("dayVolume", "volume"), ("openPrice", "open")):
+            if fields.get(source):
+                data[key] = fields[source]
+    else:
+        key = "preMarketPrice" if market_hours == MARKET_HOURS_PRE else "postMarketPrice"
+        data = {key: price}
+        # Auto-switch to Extended Hours price if enabled
+        if ext_hours:
+            data["regularMarketPrice"] = price
+
+    if fields.get("marketcap"):
+        data["marketCap"] = fields["marketcap"]
+    return data
+
+
+class YahooFinanceStreamer:
+    """Websocket client for Yahoo's push price feed.
+
+    Reconnects with exponential backoff and reports connection changes so the
+    coordinator can fall back to polling while disconnected.
+    """
+
+    def __init__(self, hass, symbols, on_pricing, on_connection_change, url=STREAM_URL):
+        """Initialize."""
+        self.hass = hass
+        self.symbols = list(symbols)
+        self.connected = False
+        self._on_pricing = on_pricing
+        self._on_connection_change = on_connection_change
+        self._url = url
+        self._task = None
+        self._stopping = False
+
+    @callback
+    def async_start(self):
+        """Start streaming in the background."""
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(self._async_run(), "yahoo_finance_stream")
+
+    async def async_stop(self):
+        """Stop streaming without reporting the disconnect."""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._set_connected(False)
+
+    @callback
+    def _set_connected(self, connected):
+        """Report connection changes."""
+        if connected != self.connected:
+            self.connected = connected
+            if not self._stopping:
+                self._on_connection_change(connected)
+
+    async def _async_run(self):
+        """Keep a websocket connection open, reconnecting when it drops."""
+        session = async_get_clientsession(self.hass)
+        failures = 0
+        while True:
+            try:
+                async with session.ws_connect(self._url, heartbeat=30) as ws:
+                    await ws.send_json({"subscribe": self.symbols})
+                    self._set_connected(True)
+                    _LOGGER.debug("Streaming prices for %d symbols", len(self.symbols))
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            # Only a stream that delivers resets the backoff, not
+                            # one that accepts connections and drops them
+                            failures = 0
+                            self._handle_message(msg.data)
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                _LOGGER.debug("Price stream error: %s", ex)
+            except Exception:  # pylint: disable=broad-except
+                # Never let the stream end for good; polling covers the gap
+                _LOGGER.exception("Unexpected price stream error")
+            finally:
+                self._set_connected(False)
+
+            failures += 1
+            delay = min(STREAM_RECONNECT_BASE * 2 ** (failures - 1), STREAM_RECONNECT_MAX)
+            delay = random.uniform(delay / 2, delay)
+            _LOGGER.debug("Price stream disconnected, reconnecting in %.0fs", delay)
+            await asyncio.sleep(delay)
+
+    @callback
+    def _handle_message(self, text):
+        """Decode one frame and hand it to the coordinator."""
+        try:
+            fields = decode_message(text)
+        except ValueError as ex:
+            _LOGGER.debug("Skipping undecodable stream message: %s", ex)
+            return
+        try:
+            if fields.get("id"):
+                self._on_pricing(fields)
+        except Exception:  # pylint: disable=broad-except
+            # One bad message must not end the stream
+            _LOGGER.exception("Error handling stream message %s", fields)
@@ -0,0 +1,751 @@
+"""Offline benchmark of the Yahoo Finance integration.
+
+Sets the integration up in a bare Home Assistant instance against a fake
+Yahoo server that replays the responses in scripts/fixtures (or another
+directory of recordings), then runs full quote cycles for synthetic
+watchlists and reports per cycle:
+
+- wall time of the update including all state writes
+- CPU time of the Home Assistant process (the server runs in its own)
+- HTTP requests and bytes, from the integration's own metrics
+- entity state writes, and the JSON bytes of the written states and of
+  the attributes the recorder keeps of them
+- peak traced memory (with --memory, tracemalloc slows everything down)
+
+and per size the memory held by the quote coordinator's data after the
+cycles (quote records, portfolio valuation and the snapshot dict).
+
+Needs Home Assistant and numpy installed:
+
+    python scripts/benchmark.py --sizes 10 100 1000 --cycles 5
+    python scripts/benchmark.py --latency 150 --rate-limit 0.05
+    python scripts/benchmark.py --sizes 5000 --cycles 3 --memory
+    python scripts/benchmark.py --json results.json
+    python scripts/benchmark.py --baseline results.json --max-regression 1.2
+    python scripts/benchmark.py --still --notify-all
+
+With --still prices don't move between requests, as on weekends or while
+markets are closed. --notify-all writes the state of every entity on every
+update, as the integration did before it diffed the data, so the state
+writes with and without it show what change detection saves. Likewise
+--full-attributes gives every sensor the price sensor's attributes and
+news and records them all, as before the attributes were slimmed down.
+
+With --baseline the script exits with status 1 if the median cycle wall or
+CPU time, or the quote data size, of any size grew by more than
+--max-regression.
+
+With --startup it instead measures what loading the integration costs: in
+a fresh interpreter that already has Home Assistant loaded, it imports the
+modules in the order Home Assistant does (the package and config flow to
+show the form, the coordinators on setup, then the sensor platform) and
+reports the import time, resident memory growth and heavy libraries
+loaded by each step:
+
+    python scripts/benchmark.py --startup
+
+With --sensors it instead measures the sensor platform's hot path: for
+watchlists with every optional sensor enabled, the time to construct the
+entities and per entity the time to read native_value, the unit of
+measurement and the state attributes, as Home Assistant does on every
+state write. --baseline compares these too:
+
+    python scripts/benchmark.py --sensors --sizes 100 1000 --json sensors.json
+
+With --portfolio it instead times the portfolio valuation of --entries
+config entries with that many positions each, in four currencies: a full
+revaluation after every price moved, and an incremental one after a
+single streamed price. It reports milliseconds per tick for all entries
+together and the rows each reported as changed. --baseline compares the
+times:
+
+    python scripts/benchmark.py --portfolio --sizes 1000 5000 --entries 3
+"""
+import argparse
+import asyncio
+import copy
+import dataclasses
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+DOMAIN = "yahoo_finance"
+# Sensor and portfolio timings compared against a baseline
+SENSOR_KEYS = ("construct_us", "native_value_us", "unit_us", "attributes_us")
+PORTFOLIO_KEYS = ("full_ms", "incremental_ms")
+# Position currencies and their rates into USD for --portfolio
+PORTFOLIO_RATES = {"USD": 1.0, "EUR": 1.1, "GBp": 0.0125, "JPY": 0.0067}
+# Libraries worth keeping off the import path of the config flow
+HEAVY_MODULES = ("numpy", "pandas", "yfinance")
+STARTUP_STEPS = (
+    ("config flow", ("custom_components.yahoo_finance", "custom_components.yahoo_finance.config_flow")),
+    ("setup", ("custom_components.yahoo_finance.coordinator",)),
+    ("sensor platform", ("custom_components.yahoo_finance.sensor",)),
+)
+
+
+def serve(port, fixtures, latency, rate_limit, seed, moving=True):
+    """Run the fake Yahoo server (in a child process).
+
+    Besides the Yahoo endpoints it answers GET /__stats with the requests
+    received per endpoint, and GET /__config?latency=&rate_limit=&moving=
+    changes the injected latency, the share of 429s and whether prices
+    move between requests, so tests can drive it.
+    """
+    from aiohttp import web
+
+    random.seed(seed)
+    config = {"latency": latency, "rate_limit": rate_limit, "moving": moving}
+    stats = {}
+    recorded = {
+        name: json.loads((Path(fixtures) / f"{name}.json").read_text())
+        for name in ("quote", "chart", "quoteSummary", "search")
+    }
+    template = recorded["quote"]["quoteResponse"]["result"][0]
+    base_price = template["regularMarketPrice"]
+
+    @web.middleware
+    async def inject(request, handler):
+        """Count requests, add latency and answer a share of the data requests with 429."""
+        name = request.match_info.route.name
+        if name is None:
+            return await handler(request)
+        stats[name] = stats.get(name, 0) + 1
+        if config["latency"]:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * config["latency"] / 1000)
+        if config["rate_limit"] and request.path.startswith("/v") and random.random() < config["rate_limit"]:
+            return web.Response(status=429, text="Too Many Requests")
+        return await handler(request)
+
+    def replay(name, symbol):
+        """Return a recorded response rewritten for another symbol."""
+        text = json.dumps(recorded[name]).replace('"AAPL"', json.dumps(symbol))
+        return web.Response(text=text, content_type="application/json")
+
+    async def cookie(request):
+        return web.Response(status=404, headers={"Set-Cookie": "A3=bench; Path=/"})
+
+    async def crumb(request):
+        return web.Response(text="benchcrumb")
+
+    async def quote(request):
+        fields = set(filter(None, request.query.get("fields", "").split(",")))
+        results = []
+        for symbol in request.query["symbols"].split(","):
+            if symbol.startswith("UNKNOWN"):
+                # Yahoo leaves out symbols it doesn't know
+                continue
+            raw = copy.copy(template)
+            raw["symbol"] = symbol
+            if symbol.endswith("-USD"):
+                # Crypto pairs trade around the clock
+                raw["quoteType"], raw["exchange"] = "CRYPTOCURRENCY", "CCC"
+            # Prices move a bit on every request so the sensors have to update
+            if config["moving"]:
+                raw["regularMarketPrice"] = round(base_price * random.uniform(0.98, 1.02), 2)
+            if fields:
+                raw = {key: val for key, val in raw.items() if key in fields or key == "symbol"}
+            results.append(raw)
+        return web.json_response({"quoteResponse": {"result": results, "error": None}})
+
+    async def chart(request):
+        return replay("chart", request.match_info["symbol"])
+
+    async def quote_summary(request):
+        return replay("quoteSummary", request.match_info["symbol"])
+
+    async def search(request):
+        return replay("search", request.query["q"])
+
+    async def get_stats(request):
+        return web.json_response(stats)
+
+    async def set_config(request):
+        for key, val in request.query.items():
+            config[key] = val == "1" if key == "moving" else float(val)
+        return web.json_response(config)
+
+    app = web.Application(middlewares=[inject])
+    app.router.add_get("/", cookie, name="cookie")
+    app.router.add_get("/v1/test/getcrumb", crumb, name="crumb")
+    app.router.add_get("/v7/finance/quote", quote, name="quote")
+    app.router.add_get("/v8/finance/chart/{symbol}", chart, name="chart")
+    app.router.add_get("/v10/finance/quoteSummary/{symbol}", quote_summary, name="quoteSummary")
+    app.router.add_get("/v1/finance/search", search, name="search")
+    app.router.add_get("/__stats", get_stats)
+    app.router.add_get("/__config", set_config)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+def deep_size(obj, seen=None):
+    """Return the bytes held by an object and everything it references."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(val, seen) for key, val in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    elif slots := getattr(type(obj), "__slots__", ()):
+        size += sum(deep_size(getattr(obj, name, None), seen) for name in slots)
+    return size
+
+
+def rss_mb():
+    """Return the current resident memory of this process in MiB."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # Not Linux: fall back to the peak
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_startup(queue):
+    """Import the integration step by step in this (fresh) process."""
+    sys.path.insert(0, str(ROOT))
+    # What Home Assistant has loaded before it gets to the integration
+    for module in (
+        "aiohttp",
+        "voluptuous",
+        "homeassistant.config_entries",
+        "homeassistant.helpers.config_validation",
+        "homeassistant.helpers.entity_platform",
+        "homeassistant.helpers.update_coordinator",
+        "homeassistant.components.sensor",
+    ):
+        importlib.import_module(module)
+
+    steps = []
+    for name, modules in STARTUP_STEPS:
+        rss = rss_mb()
+        start = time.perf_counter()
+        for module in modules:
+            importlib.import_module(module)
+        steps.append({
+            "step": name,
+            "import_ms": (time.perf_counter() - start) * 1000,
+            "rss_mb": rss_mb() - rss,
+            "heavy": [module for module in HEAVY_MODULES if module in sys.modules],
+        })
+    queue.put(steps)
+
+
+def run_startup(runs):
+    """Measure the startup steps in fresh interpreters. Returns the medians."""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for _ in range(runs):
+        queue = context.Queue()
+        process = context.Process(target=measure_startup, args=(queue,))
+        process.start()
+        results.append(queue.get())
+        process.join()
+    return [
+        {
+            "step": name,
+            "import_ms": statistics.median(run[i]["import_ms"] for run in results),
+            "rss_mb": statistics.median(run[i]["rss_mb"] for run in results),
+            "heavy": results[0][i]["heavy"],
+        }
+        for i, (name, _) in enumerate(STARTUP_STEPS)
+    ]
+
+
+def print_startup(steps):
+    """Print the startup steps as a table."""
+    print(f"{'step':<16}  {'import ms':>9}  {'rss MiB':>7}  heavy modules loaded")
+    for step in steps:
+        print(
+            f"{step['step']:<16}  {step['import_ms']:>9.1f}  {step['rss_mb']:>7.1f}  "
+            f"{', '.join(step['heavy']) or '-'}"
+        )
+
+
+def percentile(values, percent):
+    """Return a percentile of a list of numbers."""
+    values = sorted(values)
+    return values[min(len(values) - 1, round(percent / 100 * (len(values) - 1)))]
+
+
+async def async_start_hass(config_dir):
+    """Return a bare Home Assistant instance loading custom components from ROOT."""
+    from homeassistant import config_entries, core, loader
+    from homeassistant.helpers import device_registry as dr, entity, entity_registry as er
+
+    os.symlink(ROOT / "custom_components", Path(config_dir) / "custom_components")
+    hass = core.HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    # What bootstrap does before setting up integrations
+    loader.async_setup(hass)
+    entity.async_setup(hass)
+    await asyncio.gather(er.async_load(hass), dr.async_load(hass))
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    return hass
+
+
+def point_client_at(base_url):
+    """Send every request of the integration's client to the fake server."""
+    from custom_components.yahoo_finance.api import YahooFinanceClient
+
+    YahooFinanceClient.cookie_url = f"{base_url}/"
+    YahooFinanceClient.crumb_url = f"{base_url}/v1/test/getcrumb"
+    YahooFinanceClient.quote_url = f"{base_url}/v7/finance/quote"
+    YahooFinanceClient.chart_url = f"{base_url}/v8/finance/chart/{{symbol}}"
+    YahooFinanceClient.quote_summary_url = f"{base_url}/v10/finance/quoteSummary/{{symbol}}"
+    YahooFinanceClient.news_url = f"{base_url}/v1/finance/search"
+
+
+def watchlist(size):
+    """Return a synthetic watchlist; every tenth symbol is a holding so the portfolio is valued too."""
+    return {f"BENCH{i:05d}": (10.0 if i % 10 == 0 else 0.0) for i in range(size)}
+
+
+async def async_add_watchlist(hass, data, title="Benchmark"):
+    """Set up a config entry and wait for its first data. Returns the entry."""
+    from homeassistant import config_entries
+
+    entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=title,
+        data=data,
+        options={},
+        source=config_entries.SOURCE_USER,
+        unique_id=None,
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    # Slow data is fetched in background tasks, wait for it to settle
+    while any(
+        coordinator.symbols and coordinator.data is None and coordinator.last_exception is None
+        for coordinator in coordinators.all
+    ):
+        await asyncio.sleep(0.05)
+    await hass.async_block_till_done()
+    return entry
+
+
+def notify_all():
+    """Notify and write every entity on every update, as before change detection."""
+    from custom_components.yahoo_finance.coordinator import YahooFinanceDataUpdateCoordinator
+    from custom_components.yahoo_finance.sensor import YahooFinanceSensor
+
+    def handle_coordinator_update(self):
+        self._coordinators.state_writes += 1
+        self.async_write_ha_state()
+
+    YahooFinanceDataUpdateCoordinator._diff = staticmethod(lambda old, new: None)
+    YahooFinanceSensor._handle_coordinator_update = handle_coordinator_update
+
+
+def full_attributes():
+    """Give every sensor the price sensor's attributes and news, none unrecorded."""
+    from custom_components.yahoo_finance import sensor
+
+    for key, description in sensor.SENSOR_DESCRIPTIONS.items():
+        if key != "total_portfolio_value":
+            sensor.SENSOR_DESCRIPTIONS[key] = dataclasses.replace(
+                description, attributes=sensor.PRIMARY_ATTRIBUTES, news=True
+            )
+
+    class YahooFinanceSensor(sensor.YahooFinanceSensor):
+        _unrecorded_attributes = frozenset()
+
+    sensor.YahooFinanceSensor = YahooFinanceSensor
+
+
+def force_full_cycle(coordinators):
+    """Make every symbol due, even while its market is closed, and stale in the hub."""
+    coordinators.quotes._fetched.clear()
+    coordinators.quotes._settled.clear()
+    coordinators.quotes.hub._fetched.clear()
+
+
+async def run_size(size, args, base_url):
+    """Set up one watchlist and run its cycles. Returns the results."""
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import callback
+    from homeassistant.helpers.json import json_bytes
+
+    config_dir = tempfile.mkdtemp(prefix="yf-bench-")
+    hass = await async_start_hass(config_dir)
+    point_client_at(base_url)
+
+    start = time.perf_counter()
+    entry = await async_add_watchlist(
+        hass,
+        {"symbols": watchlist(size), "request_budget": args.budget, **dict(args.option)},
+        f"Benchmark {size}",
+    )
+    setup_time = time.perf_counter() - start
+
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    quotes = coordinators.quotes
+    hub = quotes.hub
+
+    payload = {"state": 0, "recorded": 0}
+
+    @callback
+    def count_payload(event):
+        """Add up the size of a written state and of what the recorder keeps of its attributes."""
+        if (state := event.data["new_state"]) is None:
+            return
+        payload["state"] += len(json_bytes(state.as_dict()))
+        unrecorded = state.state_info["unrecorded_attributes"] if state.state_info else ()
+        payload["recorded"] += len(json_bytes({
+            key: val for key, val in state.attributes.items() if key not in unrecorded
+        }))
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, count_payload)
+
+    def requests_and_bytes():
+        endpoints = hub.client.endpoints.values()
+        return sum(m.requests for m in endpoints), sum(m.bytes for m in endpoints)
+
+    cycles = []
+    for _ in range(args.cycles):
+        force_full_cycle(coordinators)
+        requests, received = requests_and_bytes()
+        writes = coordinators.state_writes
+        payload.update(state=0, recorded=0)
+        if args.memory:
+            tracemalloc.reset_peak()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        await quotes.async_refresh()
+        await hass.async_block_till_done()
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        requests_after, received_after = requests_and_bytes()
+        cycles.append({
+            "wall_ms": wall * 1000,
+            "cpu_ms": cpu * 1000,
+            "requests": requests_after - requests,
+            "bytes": received_after - received,
+            "state_writes": coordinators.state_writes - writes,
+            "state_kb": payload["state"] / 1024,
+            "recorded_kb": payload["recorded"] / 1024,
+            "peak_memory_kb": tracemalloc.get_traced_memory()[1] / 1024 if args.memory else None,
+            "success": quotes.last_update_success and not hub.limiter.backoff_remaining,
+        })
+
+    result = {
+        "symbols": size,
+        "entities": len(hass.states.async_entity_ids("sensor")),
+        "setup_s": round(setup_time, 2),
+        "cycles": cycles,
+        "rate_limited": hub.limiter.rate_limited,
+        "data_kb": deep_size(quotes.data) / 1024,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_stop(force=True)
+    # The hub lives in hass.data and goes away with this instance
+    shutil.rmtree(config_dir, ignore_errors=True)
+    return result
+
+
+async def run_sensors(size, args, base_url):
+    """Time the sensor properties of one watchlist. Returns microseconds per entity."""
+    from custom_components.yahoo_finance import const
+    from custom_components.yahoo_finance.sensor import YahooFinanceSensor, _entity_factories
+
+    config_dir = tempfile.mkdtemp(prefix="yf-bench-")
+    hass = await async_start_hass(config_dir)
+    point_client_at(base_url)
+    shows = {getattr(const, name): True for name in dir(const) if name.startswith("CONF_SHOW_")}
+    entry = await async_add_watchlist(
+        hass,
+        {"symbols": watchlist(size), "request_budget": args.budget, **shows, **dict(args.option)},
+        f"Benchmark {size}",
+    )
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    entities = [entity for entity in coordinators.entities.values() if isinstance(entity, YahooFinanceSensor)]
+    factories = [
+        factory for factory in _entity_factories(coordinators, entry.entry_id).values()
+        if factory.func is YahooFinanceSensor
+    ]
+
+    def per_entity(func, items):
+        """Return the median microseconds per item of a few timed passes."""
+        timings = []
+        for _ in range(args.cycles):
+            start = time.perf_counter()
+            for item in items:
+                func(item)
+            timings.append((time.perf_counter() - start) / len(items) * 1e6)
+        return statistics.median(timings)
+
+    result = {
+        "symbols": size,
+        "entities": len(entities),
+        "construct_us": per_entity(lambda factory: factory(), factories),
+        "native_value_us": per_entity(lambda entity: entity.native_value, entities),
+        "unit_us": per_entity(lambda entity: entity.native_unit_of_measurement, entities),
+        "attributes_us": per_entity(lambda entity: entity.extra_state_attributes, entities),
+    }
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_stop(force=True)
+    shutil.rmtree(config_dir, ignore_errors=True)
+    return result
+
+
+def print_sensors(results):
+    """Print the sensor timings as a table."""
+    print(f"{'symbols':>7}  {'entities':>8}  {'construct us':>12}  {'value us':>8}  {'unit us':>7}  {'attributes us':>13}")
+    for result in results:
+        print(
+            f"{result['symbols']:>7}  {result['entities']:>8}  {result['construct_us']:>12.2f}  "
+            f"{result['native_value_us']:>8.2f}  {result['unit_us']:>7.2f}  {result['attributes_us']:>13.2f}"
+        )
+
+
+def run_portfolio(size, args):
+    """Time the valuation of entries with size positions each. Returns milliseconds per tick."""
+    from custom_components.yahoo_finance.portfolio import PortfolioEngine
+
+    rng = random.Random(args.seed)
+    currencies = list(PORTFOLIO_RATES)
+    engines, quotes = [], []
+    for entry in range(args.entries):
+        symbols = [f"E{entry}P{i:05d}" for i in range(size)]
+        engines.append(PortfolioEngine(
+            {symbol: rng.uniform(1, 100) for symbol in symbols},
+            "USD",
+            {symbol: rng.uniform(10, 200) for symbol in symbols},
+        ))
+        quotes.append({
+            symbol: {
+                "regularMarketPrice": (price := rng.uniform(10, 200)),
+                "previousClose": price * rng.uniform(0.97, 1.03),
+                "currency": currencies[i % len(currencies)],
+            }
+            for i, symbol in enumerate(symbols)
+        })
+
+    def move(entry_quotes, symbols):
+        """Move the prices of some symbols, as a quote update would."""
+        for symbol in symbols:
+            quote = entry_quotes[symbol]
+            entry_quotes[symbol] = {**quote, "regularMarketPrice": quote["regularMarketPrice"] * rng.uniform(0.99, 1.01)}
+        return {symbol: entry_quotes[symbol] for symbol in symbols}
+
+    def tick(updates):
+        """Value every entry after its updates; returns (ms, changed rows)."""
+        changed = 0
+        start = time.perf_counter()
+        for engine, update in zip(engines, updates):
+            engine.update_quotes(update)
+            changed += len(engine.value(PORTFOLIO_RATES)[0])
+        return (time.perf_counter() - start) * 1000, changed
+
+    # The first valuation builds the outputs every later one is diffed against
+    tick(quotes)
+    full = [tick([move(entry_quotes, list(entry_quotes)) for entry_quotes in quotes]) for _ in range(args.cycles)]
+    incremental = [
+        tick([move(entry_quotes, [rng.choice(list(entry_quotes))]) for entry_quotes in quotes])
+        for _ in range(args.cycles)
+    ]
+    return {
+        "symbols": size,
+        "entries": args.entries,
+        "full_ms": statistics.median(ms for ms, _ in full),
+        "full_rows": statistics.median(rows for _, rows in full),
+        "incremental_ms": statistics.median(ms for ms, _ in incremental),
+        "incremental_rows": statistics.median(rows for _, rows in incremental),
+    }
+
+
+def print_portfolio(results):
+    """Print the portfolio timings as a table."""
+    print(f"{'positions':>9}  {'entries':>7}  {'full ms':>7}  {'rows':>6}  {'incremental ms':>14}  {'rows':>6}")
+    for result in results:
+        print(
+            f"{result['symbols']:>9}  {result['entries']:>7}  {result['full_ms']:>7.2f}  {result['full_rows']:>6.0f}  "
+            f"{result['incremental_ms']:>14.2f}  {result['incremental_rows']:>6.0f}"
+        )
+
+
+def summarize(result):
+    """Return the medians and p95 of a size's cycles."""
+    cycles = result["cycles"]
+    summary = {"symbols": result["symbols"], "entities": result["entities"], "setup_s": result["setup_s"]}
+    for key in ("wall_ms", "cpu_ms", "requests", "bytes", "state_writes", "state_kb", "recorded_kb"):
+        values = [cycle[key] for cycle in cycles]
+        summary[key] = statistics.median(values)
+        if key in ("wall_ms", "cpu_ms"):
+            summary[f"{key}_p95"] = percentile(values, 95)
+    peaks = [cycle["peak_memory_kb"] for cycle in cycles if cycle["peak_memory_kb"] is not None]
+    summary["peak_memory_kb"] = max(peaks) if peaks else None
+    summary["failed_cycles"] = sum(not cycle["success"] for cycle in cycles)
+    summary["rate_limited"] = result["rate_limited"]
+    summary["data_kb"] = result["data_kb"]
+    summary["max_rss_mb"] = result["max_rss_mb"]
+    return summary
+
+
+def print_table(summaries):
+    """Print the summaries as a table."""
+    columns = (
+        ("symbols", "symbols", "{:.0f}"),
+        ("entities", "entities", "{:.0f}"),
+        ("setup_s", "setup s", "{:.2f}"),
+        ("wall_ms", "wall ms", "{:.1f}"),
+        ("wall_ms_p95", "p95", "{:.1f}"),
+        ("cpu_ms", "cpu ms", "{:.1f}"),
+        ("requests", "requests", "{:.0f}"),
+        ("bytes", "bytes", "{:.0f}"),
+        ("state_writes", "writes", "{:.0f}"),
+        ("state_kb", "state KiB", "{:.1f}"),
+        ("recorded_kb", "rec KiB", "{:.1f}"),
+        ("peak_memory_kb", "peak KiB", "{:.0f}"),
+        ("data_kb", "data KiB", "{:.0f}"),
+        ("failed_cycles", "failed", "{:.0f}"),
+        ("rate_limited", "429s", "{:.0f}"),
+        ("max_rss_mb", "rss MiB", "{:.0f}"),
+    )
+    rows = [[title for _, title, _ in columns]]
+    for summary in summaries:
+        rows.append([
+            "-" if summary[key] is None else fmt.format(summary[key])
+            for key, _, fmt in columns
+        ])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def compare(summaries, baseline, max_regression, keys=("wall_ms", "cpu_ms", "data_kb")):
+    """Return the regressions of the given keys against a baseline."""
+    previous = {summary["symbols"]: summary for summary in baseline["summaries"]}
+    regressions = []
+    for summary in summaries:
+        old = previous.get(summary["symbols"])
+        if old is None:
+            continue
+        for key in keys:
+            if old.get(key) and summary[key] > old[key] * max_regression:
+                regressions.append(
+                    f"{summary['symbols']} symbols: {key} {old[key]:.1f} -> {summary[key]:.1f}"
+                )
+    return regressions
+
+
+def option(value):
+    """Parse an integration option given as KEY=VALUE."""
+    key, _, raw = value.partition("=")
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0, help="mean server latency in ms")
+    parser.add_argument("--rate-limit", type=float, default=0, help="share of requests answered with 429")
+    parser.add_argument("--budget", type=int, default=100000, help="request budget per minute")
+    parser.add_argument("--option", type=option, action="append", default=[], help="integration option KEY=VALUE")
+    parser.add_argument("--fixtures", default=str(FIXTURES), help="directory of recorded responses")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory per cycle")
+    parser.add_argument("--still", action="store_true", help="keep prices still between requests")
+    parser.add_argument("--notify-all", action="store_true", help="write every entity on every update")
+    parser.add_argument("--full-attributes", action="store_true", help="give every sensor all attributes, recorded")
+    parser.add_argument("--port", type=int, default=18231)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against results written with --json")
+    parser.add_argument("--max-regression", type=float, default=1.2)
+    parser.add_argument("--startup", action="store_true", help="measure import time and memory instead")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to measure startup in")
+    parser.add_argument("--sensors", action="store_true", help="time the sensor properties instead")
+    parser.add_argument("--portfolio", action="store_true", help="time the portfolio valuation instead")
+    parser.add_argument("--entries", type=int, default=3, help="config entries to value with --portfolio")
+    args = parser.parse_args()
+
+    if args.startup:
+        steps = run_startup(args.runs)
+        print_startup(steps)
+        if args.json:
+            Path(args.json).write_text(json.dumps({"args": vars(args), "startup": steps}, indent=2))
+        return
+
+    sys.path.insert(0, str(ROOT))
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.portfolio:
+        summaries = [run_portfolio(size, args) for size in args.sizes]
+        print_portfolio(summaries)
+        report(args, summaries, PORTFOLIO_KEYS)
+        return
+
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve,
+        args=(args.port, args.fixtures, args.latency, args.rate_limit, args.seed, not args.still),
+        daemon=True,
+    )
+    server.start()
+    time.sleep(1)
+    if args.notify_all:
+        notify_all()
+    if args.full_attributes:
+        full_attributes()
+    if args.memory:
+        tracemalloc.start()
+
+    run, keys = (run_sensors, SENSOR_KEYS) if args.sensors else (run_size, ("wall_ms", "cpu_ms", "data_kb"))
+    try:
+        summaries = []
+        for size in args.sizes:
+            result = asyncio.run(run(size, args, f"http://127.0.0.1:{args.port}"))
+            summaries.append(result if args.sensors else summarize(result))
+    finally:
+        server.terminate()
+
+    if args.sensors:
+        print_sensors(summaries)
+    else:
+        print_table(summaries)
+    report(args, summaries, keys)
+
+
+def report(args, summaries, keys):
+    """Write the summaries with --json and exit 1 on a regression against --baseline."""
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "summaries": summaries}, indent=2))
+    if args.baseline:
+        regressions = compare(summaries, json.loads(Path(args.baseline).read_text()), args.max_regression, keys)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the Yahoo Finance integration."""
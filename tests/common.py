@@ -0,0 +1,86 @@
+"""Helpers for running the integration against the benchmark's fake Yahoo server."""
+from contextlib import asynccontextmanager
+import json
+import multiprocessing
+from pathlib import Path
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from urllib.request import urlopen
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "scripts")]
+
+import benchmark  # noqa: E402
+
+DOMAIN = benchmark.DOMAIN
+
+
+class FakeYahoo:
+    """The fake Yahoo server of scripts/benchmark.py, running in a child process."""
+
+    def __init__(self, latency=0, rate_limit=0):
+        """Start the server on a free port and wait until it answers."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=benchmark.serve,
+            args=(port, str(benchmark.FIXTURES), latency, rate_limit, 1),
+            daemon=True,
+        )
+        self._process.start()
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                self.stats()
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise
+                time.sleep(0.1)
+
+    def stats(self):
+        """Return the requests received per endpoint."""
+        with urlopen(f"{self.url}/__stats") as response:
+            return json.load(response)
+
+    def requests(self, endpoint):
+        """Return the requests received by one endpoint."""
+        return self.stats().get(endpoint, 0)
+
+    def configure(self, **config):
+        """Change the injected latency, share of 429s or moving prices."""
+        query = "&".join(f"{key}={int(val) if isinstance(val, bool) else val}" for key, val in config.items())
+        with urlopen(f"{self.url}/__config?{query}"):
+            pass
+
+    def stop(self):
+        """Stop the server."""
+        self._process.terminate()
+        self._process.join()
+
+
+@asynccontextmanager
+async def async_watchlist(server, size, **data):
+    """Set up a config entry with a synthetic watchlist of size symbols.
+
+    Yields (hass, coordinators); unloads and stops Home Assistant afterwards.
+    The request budget is practically unlimited unless data sets one, so
+    the per-symbol fetches of large watchlists don't wait for tokens.
+    """
+    data.setdefault("request_budget", 100000)
+    config_dir = tempfile.mkdtemp(prefix="yf-test-")
+    hass = await benchmark.async_start_hass(config_dir)
+    benchmark.point_client_at(server.url)
+    try:
+        entry = await benchmark.async_add_watchlist(hass, {"symbols": benchmark.watchlist(size), **data})
+        yield hass, hass.data[DOMAIN][entry.entry_id]
+        await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await hass.async_stop(force=True)
+        shutil.rmtree(config_dir, ignore_errors=True)
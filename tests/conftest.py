@@ -0,0 +1,14 @@
+"""Fixtures for the Yahoo Finance tests."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from .common import FakeYahoo  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def fake_yahoo():
+    """Run the fake Yahoo server for the tests of a module."""
+    server = FakeYahoo()
+    yield server
+    server.stop()
@@ -0,0 +1,56 @@
+"""State attributes: the full set on the price sensor only, large ones unrecorded."""
+import asyncio
+
+from custom_components.yahoo_finance.sensor import (
+    PRIMARY_ATTRIBUTES,
+    SENSOR_DESCRIPTIONS,
+    YahooFinanceSensor,
+    unique_id,
+)
+
+from .common import async_watchlist
+
+PRIMARY_NAMES = {name for name, _ in PRIMARY_ATTRIBUTES}
+
+
+def test_only_the_price_sensor_carries_everything(fake_yahoo):
+    """Other sensors carry only the fields that explain their own value."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 10, show_dividend=True, show_esg=True, show_market_status=True) as (
+            hass, coordinators
+        ):
+            checked = set()
+            for entity in coordinators.entities.values():
+                if not isinstance(entity, YahooFinanceSensor) or entity.symbol == "__portfolio__":
+                    continue
+                state = hass.states.get(entity.entity_id)
+                carried = set(state.attributes) & (PRIMARY_NAMES | {"news", "owned_amount", "trailingAnnualDividendRate"})
+                own = {name for name, _ in SENSOR_DESCRIPTIONS[entity.sensor_type].attributes}
+                if entity.sensor_type == "price":
+                    assert "regularMarketDayHigh" in carried
+                    assert {"news", "longName", "shortName"} <= state.state_info["unrecorded_attributes"]
+                assert carried - {"news"} <= own
+                checked.add(entity.sensor_type)
+            assert {"price", "change_pct", "dividend_yield", "esg_score", "market_status"} <= checked
+
+    asyncio.run(run())
+
+
+def test_price_sensor_follows_fundamentals_and_history(fake_yahoo):
+    """The price sensor is rewritten when the attributes it carries from other coordinators change."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 3, show_performance=True) as (hass, coordinators):
+            symbol = coordinators.quotes.symbols[0]
+            entity_id = coordinators.entities[unique_id(symbol, "price")].entity_id
+            for source, key, name in (("fundamentals", "beta", "beta"), ("history", "ytdReturn", "ytdReturn")):
+                coordinator = getattr(coordinators, source)
+                # As a refresh of just this symbol would
+                coordinator.data = {**coordinator.data, symbol: {**coordinator.data[symbol], key: 42.0}}
+                coordinator._changed = {symbol}
+                coordinator.async_update_listeners()
+                await hass.async_block_till_done()
+                assert hass.states.get(entity_id).attributes[name] == 42.0
+
+    asyncio.run(run())
@@ -0,0 +1,55 @@
+"""Quotes of all symbols are fetched in bulk requests."""
+import asyncio
+
+import pytest
+
+from custom_components.yahoo_finance.const import QUOTE_CHUNK_SIZE
+
+from .common import async_watchlist, benchmark
+
+
+@pytest.mark.parametrize("size", [1, 10, 100])
+def test_one_request_per_cycle(fake_yahoo, size):
+    """A full quote cycle for up to one chunk of symbols is a single request."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, size) as (_, coordinators):
+            assert len(coordinators.quotes.data) == size + 1  # and __portfolio__
+            for _ in range(3):
+                benchmark.force_full_cycle(coordinators)
+                before = fake_yahoo.requests("quote")
+                await coordinators.quotes.async_refresh()
+                assert fake_yahoo.requests("quote") - before == 1
+                assert coordinators.quotes.last_update_success
+
+    asyncio.run(run())
+
+
+def test_requests_grow_with_chunks_not_symbols(fake_yahoo):
+    """Large watchlists take one request per chunk, not per symbol."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 1000) as (_, coordinators):
+            benchmark.force_full_cycle(coordinators)
+            before = fake_yahoo.requests("quote")
+            await coordinators.quotes.async_refresh()
+            # Chunks only grow while Yahoo answers quickly
+            assert fake_yahoo.requests("quote") - before <= 1000 // QUOTE_CHUNK_SIZE
+            assert all(f"BENCH{i:05d}" in coordinators.quotes.data for i in range(1000))
+
+    asyncio.run(run())
+
+
+def test_quotes_parsed_per_symbol(fake_yahoo):
+    """Every symbol gets its own parsed quote."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 10) as (_, coordinators):
+            data = coordinators.quotes.data
+            for symbol in benchmark.watchlist(10):
+                assert data[symbol].symbol == symbol
+                assert data[symbol].regularMarketPrice
+                assert data[symbol].currency == "USD"
+            assert data["__portfolio__"]["total_value"] > 0
+
+    asyncio.run(run())
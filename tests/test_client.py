@@ -0,0 +1,217 @@
+"""The async client against a local aiohttp stub of Yahoo."""
+import asyncio
+from contextlib import asynccontextmanager
+import shutil
+import tempfile
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from custom_components.yahoo_finance.api import RateLimitedError, YahooFinanceClient
+
+from .common import benchmark
+
+
+class YahooStub:
+    """A local server answering the cookie, crumb and quote endpoints.
+
+    Quotes are only answered for the current crumb and with the consent
+    cookie; every request is recorded.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.crumbs = iter(f"crumb{i}" for i in range(1, 100))
+        self.crumb = None
+        self.requests = []
+        self.ports = set()
+        # Set by tests to change the quote endpoint's answer
+        self.quote_status = 200
+        self.quote_delay = 0
+        self.reject_crumbs = False
+        self.etag = None
+        self.url = None
+        self._runner = None
+
+    @web.middleware
+    async def _record(self, request, handler):
+        """Record the request and the client port it came from."""
+        self.requests.append(request)
+        self.ports.add(request.transport.get_extra_info("peername")[1])
+        return await handler(request)
+
+    async def _cookie(self, request):
+        return web.Response(status=404, headers={"Set-Cookie": "A3=stub; Path=/"})
+
+    async def _crumb(self, request):
+        self.crumb = next(self.crumbs)
+        return web.Response(text=self.crumb)
+
+    async def _quote(self, request):
+        crumb = request.query.get("crumb")
+        if self.reject_crumbs or request.cookies.get("A3") != "stub" or crumb != self.crumb:
+            return web.Response(status=401)
+        if self.quote_delay:
+            await asyncio.sleep(self.quote_delay)
+        if self.quote_status != 200:
+            return web.Response(status=self.quote_status)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        results = [{"symbol": symbol, "regularMarketPrice": 1.5} for symbol in request.query["symbols"].split(",")]
+        response = web.json_response({"quoteResponse": {"result": results, "error": None}})
+        if self.etag:
+            response.headers["ETag"] = self.etag
+        # Compressed only if the client asked for it
+        response.enable_compression()
+        return response
+
+    def requests_to(self, path):
+        """Return the recorded requests to one path."""
+        return [request for request in self.requests if request.path == path]
+
+    async def async_start(self):
+        """Listen on a free port."""
+        app = web.Application(middlewares=[self._record])
+        app.router.add_get("/", self._cookie)
+        app.router.add_get("/crumb", self._crumb)
+        app.router.add_get("/quote", self._quote)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        # By name, the cookie jar ignores cookies from IP addresses
+        self.url = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+
+    async def async_stop(self):
+        """Stop listening."""
+        await self._runner.cleanup()
+
+
+@asynccontextmanager
+async def async_client(**kwargs):
+    """Yield (client, stub) with the client pointed at the stub."""
+    config_dir = tempfile.mkdtemp(prefix="yf-test-")
+    hass = await benchmark.async_start_hass(config_dir)
+    stub = YahooStub()
+    await stub.async_start()
+    client = YahooFinanceClient(hass, **kwargs)
+    client.cookie_url = f"{stub.url}/"
+    client.crumb_url = f"{stub.url}/crumb"
+    client.quote_url = f"{stub.url}/quote"
+    try:
+        yield client, stub
+    finally:
+        await client.async_close()
+        await stub.async_stop()
+        await hass.async_stop(force=True)
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+
+def test_crumb_fetched_once_and_reused():
+    """The cookie and crumb are fetched once for many requests, concurrent ones too."""
+
+    async def run():
+        async with async_client() as (client, stub):
+            await asyncio.gather(*(client.async_fetch_quotes(["AAPL", "MSFT"]) for _ in range(5)))
+            await client.async_fetch_quotes(["AAPL"])
+            assert len(stub.requests_to("/")) == 1
+            assert len(stub.requests_to("/crumb")) == 1
+            assert len(stub.requests_to("/quote")) == 6
+            assert client.crumb_refreshes == 1
+
+    asyncio.run(run())
+
+
+def test_rejected_crumb_is_refreshed():
+    """A 401 fetches a new crumb and retries once."""
+
+    async def run():
+        async with async_client() as (client, stub):
+            await client.async_fetch_quotes(["AAPL"])
+            # Yahoo expires the crumb
+            stub.crumb = "expired"
+            quotes = await client.async_fetch_quotes(["AAPL"])
+            assert quotes["AAPL"]["regularMarketPrice"] == 1.5
+            assert client.crumb_refreshes == 2
+            assert [request.query["crumb"] for request in stub.requests_to("/quote")] == [
+                "crumb1", "crumb1", "crumb2",
+            ]
+
+    asyncio.run(run())
+
+
+def test_crumb_rejected_twice_raises():
+    """A crumb that is rejected right after fetching it is an error, not a loop."""
+
+    async def run():
+        async with async_client() as (client, stub):
+            stub.reject_crumbs = True
+            with pytest.raises(aiohttp.ClientError):
+                await client.async_fetch_quotes(["AAPL"])
+            assert len(stub.requests_to("/quote")) == 2
+
+    asyncio.run(run())
+
+
+def test_compression_and_pooling():
+    """Responses are compressed and all requests share one kept-alive connection."""
+
+    async def run():
+        async with async_client() as (client, stub):
+            for _ in range(3):
+                await client.async_fetch_quotes(["AAPL"])
+            quote = stub.requests_to("/quote")[0]
+            assert "gzip" in quote.headers["Accept-Encoding"]
+            assert len(stub.ports) == 1
+
+    asyncio.run(run())
+
+
+def test_rate_limit_raises():
+    """429 raises RateLimitedError and is counted."""
+
+    async def run():
+        async with async_client() as (client, stub):
+            stub.quote_status = 429
+            with pytest.raises(RateLimitedError):
+                await client.async_fetch_quotes(["AAPL"])
+            assert client.endpoints["quote"].rate_limited == 1
+
+    asyncio.run(run())
+
+
+def test_request_timeout():
+    """A request taking longer than the timeout fails without hanging."""
+
+    async def run():
+        async with async_client(timeout=0.2) as (client, stub):
+            stub.quote_delay = 1
+            with pytest.raises(asyncio.TimeoutError):
+                await client.async_fetch_quotes(["AAPL"])
+            assert client.endpoints["quote"].errors == 1
+
+    asyncio.run(run())
+
+
+def test_unchanged_answers_are_not_decoded():
+    """The ETag is sent back, and a 304 or identical body returns no data."""
+
+    async def run():
+        async with async_client() as (client, stub):
+            url, params = client.quote_url, {"symbols": "AAPL"}
+            stub.etag = '"v1"'
+            version, data = await client.async_get_json_if_changed("quote", url, params)
+            assert data["quoteResponse"]["result"][0]["symbol"] == "AAPL"
+
+            # 304 Not Modified
+            version, data = await client.async_get_json_if_changed("quote", url, params, version)
+            assert data is None
+            assert stub.requests_to("/quote")[-1].headers["If-None-Match"] == '"v1"'
+
+            # Yahoo ignores the ETag but the body is the same
+            stub.etag = None
+            _, data = await client.async_get_json_if_changed("quote", url, params, version)
+            assert data is None
+
+    asyncio.run(run())
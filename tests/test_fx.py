@@ -0,0 +1,32 @@
+"""FX rates: triangulation, minor units and expiry."""
+import pytest
+
+from custom_components.yahoo_finance.fx import FxGraph
+
+
+def test_cross_and_minor_unit_rates():
+    """Rates are derived through the hub currency and scaled for minor units."""
+    fx = FxGraph(ttl=10)
+    fx.update({"EURUSD=X": {"regularMarketPrice": 1.1}, "GBPUSD=X": {"regularMarketPrice": 1.25}}, now=0)
+    assert fx.rate("USD", "EUR", now=1) == pytest.approx(1 / 1.1)
+    assert fx.rate("EUR", "GBP", now=1) == pytest.approx(1.1 / 1.25)
+    assert fx.rate("GBp", "USD", now=1) == pytest.approx(0.0125)
+    assert fx.rate("EUR", "EUR", now=1000) == 1.0
+    assert fx.rate("JPY", "USD", now=1) is None
+
+
+def test_cached_rates_expire():
+    """A cached rate is not used past the TTL of the quotes it came from."""
+    fx = FxGraph(ttl=10)
+    fx.update({"EURUSD=X": {"regularMarketPrice": 1.1}}, now=0)
+    assert fx.rate("EUR", "USD", now=1) == 1.1
+    assert fx.rate("EUR", "USD", now=1000) is None
+
+    # A cross rate expires with the older of its two quotes
+    fx.update({"GBPUSD=X": {"regularMarketPrice": 1.25}}, now=995)
+    fx.update({"EURUSD=X": {"regularMarketPrice": 1.1}}, now=1000)
+    assert fx.rate("EUR", "GBP", now=1001) == pytest.approx(1.1 / 1.25)
+    assert fx.rate("EUR", "GBP", now=1008) is None
+    # Fresh quotes bring it back
+    fx.update({"GBPUSD=X": {"regularMarketPrice": 1.25}}, now=1008)
+    assert fx.rate("EUR", "GBP", now=1009) == pytest.approx(1.1 / 1.25)
@@ -0,0 +1,104 @@
+"""Per-symbol circuit breakers and the retry queue."""
+import asyncio
+
+from custom_components.yahoo_finance.health import SymbolHealth
+
+from .common import async_watchlist, benchmark
+
+
+def make_health():
+    """Return a tracker with the default threshold of three failures."""
+    return SymbolHealth("test", threshold=3, base=900, maximum=3600, retry_delay=60)
+
+
+def test_transient_failures_are_retried():
+    """Failures below the threshold queue a retry after the delay."""
+    health = make_health()
+    health.record_failure("AAPL", now=0)
+    assert health.next_retry == 60
+    assert not health.retry_due("AAPL", now=59)
+    assert health.retry_due("AAPL", now=60)
+    assert health.available(["AAPL", "MSFT"], now=1) == ["AAPL", "MSFT"]
+
+    health.record_failure("MSFT", now=30)
+    assert health.pop_retries(now=60) == ["AAPL"]
+    assert health.next_retry == 90
+    assert not health.retry_due("AAPL", now=60)
+
+
+def test_breaker_trips_and_backs_off():
+    """The third failure in a row opens the breaker, longer after each further failure."""
+    health = make_health()
+    for _ in range(3):
+        health.record_failure("AAPL", now=0)
+    assert health.is_open("AAPL", now=899)
+    assert health.available(["AAPL", "MSFT"], now=899) == ["MSFT"]
+    # An open breaker isn't retried
+    assert health.next_retry is None
+
+    # Half open: one attempt once the period passed
+    assert health.available(["AAPL"], now=900) == ["AAPL"]
+    health.record_failure("AAPL", now=900)
+    assert health.is_open("AAPL", now=900 + 1799)
+    assert not health.is_open("AAPL", now=900 + 1800)
+    # Capped at the maximum
+    health.record_failure("AAPL", now=3000)
+    health.record_failure("AAPL", now=7000)
+    assert health.as_dict()["failing"] == {"AAPL": 6}
+    assert not health.is_open("AAPL", now=7000 + 3600)
+
+
+def test_permanent_failure_opens_at_once():
+    """An unknown symbol skips the retries."""
+    health = make_health()
+    health.record_failure("NOPE", permanent=True, now=0)
+    assert health.is_open("NOPE", now=899)
+    assert health.next_retry is None
+
+
+def test_success_recovers():
+    """A success closes the breaker and clears the retry."""
+    health = make_health()
+    health.record_failure("AAPL", now=0)
+    health.record_success("AAPL")
+    assert health.next_retry is None
+    for _ in range(3):
+        health.record_failure("MSFT", now=0)
+    health.record_success("MSFT")
+    assert not health.is_open("MSFT", now=1)
+    # The count starts over
+    health.record_failure("MSFT", now=1)
+    assert not health.is_open("MSFT", now=2)
+    assert health.as_dict()["failing"] == {"MSFT": 1}
+
+
+def test_unknown_symbol_is_skipped_right_away(fake_yahoo):
+    """A symbol missing from a successful bulk answer opens its breaker at once."""
+
+    async def run():
+        symbols = {**benchmark.watchlist(5), "UNKNOWN01": 0.0}
+        async with async_watchlist(fake_yahoo, 0, symbols=symbols) as (_, coordinators):
+            health = coordinators.quotes.health
+            assert health.is_open("UNKNOWN01")
+            assert health.available(coordinators.quotes.symbols) == coordinators.quotes.symbols[:-1]
+            assert coordinators.quotes.last_update_success
+
+    asyncio.run(run())
+
+
+def test_rate_limits_are_not_the_symbols_fault(fake_yahoo):
+    """Chunks that fail on a 429 don't count against their symbols."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 10) as (_, coordinators):
+            quotes = coordinators.quotes
+            fake_yahoo.configure(rate_limit=1)
+            try:
+                benchmark.force_full_cycle(coordinators)
+                await quotes.async_refresh()
+            finally:
+                fake_yahoo.configure(rate_limit=0)
+            assert quotes.hub.limiter.backoff_remaining
+            assert quotes.health.as_dict() == {"failing": {}, "open": {}, "retry_queue": []}
+
+    asyncio.run(run())
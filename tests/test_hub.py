@@ -0,0 +1,135 @@
+"""The hub shared by all config entries."""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.yahoo_finance import coordinator
+from custom_components.yahoo_finance.const import DATA_HUB
+
+from .common import async_watchlist, benchmark
+
+
+def test_hub_outlives_all_but_the_last_entry(fake_yahoo, caplog):
+    """Unloading one entry keeps the hub working; the last one tears it down."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 5) as (hass, coordinators):
+            hub = coordinators.quotes.hub
+            other = await benchmark.async_add_watchlist(
+                hass, {"symbols": {"OTHER00001": 1.0}, "request_budget": 100000}, "Other"
+            )
+            other_quotes = hass.data[benchmark.DOMAIN][other.entry_id].quotes
+            assert other_quotes.hub is hub
+
+            await hass.config_entries.async_unload(other.entry_id)
+            assert hass.data[DATA_HUB] is hub
+            # The session the first entry set up with is still usable
+            benchmark.force_full_cycle(coordinators)
+            await coordinators.quotes.async_refresh()
+            assert coordinators.quotes.last_update_success
+
+        assert DATA_HUB not in hass.data
+        assert hub.client._session is None
+
+    asyncio.run(run())
+    assert "closes the Home Assistant aiohttp session" not in caplog.text
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pin the coordinators' clock; returns a setter taking a UTC datetime."""
+    now = {}
+
+    def set_clock(utc):
+        now["utc"] = utc
+
+    monkeypatch.setattr(coordinator, "dt_util", SimpleNamespace(
+        utcnow=lambda: now["utc"],
+        now=lambda: now["utc"],
+    ))
+    return set_clock
+
+
+def _quote_requests(hub):
+    """Return the quote requests the hub's client made."""
+    return hub.client.endpoints["quote"].requests
+
+
+def test_own_closed_symbols_do_not_ride_along(fake_yahoo, clock):
+    """One open crypto symbol on a weekend fetches just that symbol."""
+    clock(datetime(2026, 10, 17, 12, tzinfo=timezone.utc))
+
+    async def run():
+        symbols = {**benchmark.watchlist(300), "BTC-USD": 0.0}
+        async with async_watchlist(fake_yahoo, 0, symbols=symbols) as (_, coordinators):
+            quotes = coordinators.quotes
+            hub = quotes.hub
+            # Settles the closing prices once
+            await quotes.async_refresh()
+            assert quotes.last_succeeded == 301
+
+            for _ in range(3):
+                # Hours pass; only the crypto symbol is due
+                quotes._fetched.pop("BTC-USD")
+                hub._fetched = {symbol: fetched - 3600 for symbol, fetched in hub._fetched.items()}
+                requests, piggybacked = _quote_requests(hub), hub.piggybacked
+                await quotes.async_refresh()
+                assert quotes.last_succeeded == 1
+                assert _quote_requests(hub) == requests + 1
+                assert hub.piggybacked == piggybacked
+
+    asyncio.run(run())
+
+
+def test_other_entries_piggyback(fake_yahoo, clock):
+    """Another entry's open symbols that are halfway to stale ride along."""
+    clock(datetime(2026, 10, 14, 15, tzinfo=timezone.utc))
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 5) as (hass, coordinators):
+            other = await benchmark.async_add_watchlist(
+                hass, {"symbols": {"OTHER00001": 0.0, "OTHER00002": 0.0}, "request_budget": 100000}, "Other"
+            )
+            quotes = coordinators.quotes
+            hub = quotes.hub
+            stale = hub._fetched["OTHER00001"] - 10000
+            hub._fetched.update({"OTHER00001": stale, "OTHER00002": stale})
+            own = quotes.symbols[0]
+            quotes._fetched.pop(own)
+            hub._fetched.pop(own)
+
+            requests, piggybacked = _quote_requests(hub), hub.piggybacked
+            await quotes.async_refresh()
+            assert _quote_requests(hub) == requests + 1
+            assert hub.piggybacked == piggybacked + 2
+            assert hub._fetched["OTHER00001"] > stale
+            await hass.config_entries.async_unload(other.entry_id)
+
+    asyncio.run(run())
+
+
+def test_slow_tier_waits_for_its_interval(fake_yahoo, clock):
+    """Fast ticks don't refetch the symbols of an entry's slow tier."""
+    clock(datetime(2026, 10, 14, 15, tzinfo=timezone.utc))
+
+    async def run():
+        symbols = benchmark.watchlist(20)
+        fast = sorted(symbols)[0]
+        intervals = {symbol: 900 for symbol in symbols if symbol != fast}
+        async with async_watchlist(fake_yahoo, 0, symbols=symbols, scan_interval=60, symbol_intervals=intervals) as (
+            _, coordinators
+        ):
+            quotes = coordinators.quotes
+            hub = quotes.hub
+            for _ in range(2):
+                # Five minutes pass: the fast symbol is due, the slow tier is not
+                quotes._fetched = {symbol: fetched - 300 for symbol, fetched in quotes._fetched.items()}
+                hub._fetched = {symbol: fetched - 300 for symbol, fetched in hub._fetched.items()}
+                piggybacked = hub.piggybacked
+                await quotes.async_refresh()
+                assert quotes.last_succeeded == 1
+                assert hub.piggybacked == piggybacked
+
+    asyncio.run(run())
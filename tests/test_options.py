@@ -0,0 +1,50 @@
+"""Options changes applied while the coordinators are running."""
+import asyncio
+
+from .common import async_watchlist, benchmark
+
+
+def test_symbol_removed_during_fetch(fake_yahoo):
+    """A symbol removed while a fetch waits for the hub doesn't come back."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 10) as (_, coordinators):
+            quotes = coordinators.quotes
+            removed = quotes.symbols[0]
+            assert quotes.symbol_definitions[removed] > 0
+            benchmark.force_full_cycle(coordinators)
+
+            # Another entry holds the hub while the options change
+            async with quotes.hub._lock:
+                refresh = asyncio.create_task(quotes.async_refresh())
+                await asyncio.sleep(0.1)
+                definitions = {symbol: amount for symbol, amount in quotes.symbol_definitions.items() if symbol != removed}
+                quotes.async_reconfigure(
+                    definitions, quotes.scan_interval, quotes.eco_threshold, quotes.base_currency, quotes.ext_hours
+                )
+            await refresh
+
+            assert quotes.last_update_success
+            assert removed not in quotes.data
+            assert removed not in quotes._fetched
+
+    asyncio.run(run())
+
+
+def test_refresh_of_some_symbols(fake_yahoo):
+    """Refreshing a few symbols fetches just those and keeps the others' data."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 10) as (_, coordinators):
+            quotes = coordinators.quotes
+            symbol, other = quotes.symbols[:2]
+            kept = quotes.data[other]
+            quotes.hub._fetched.pop(symbol)
+            requests = fake_yahoo.requests("quote")
+
+            await quotes.async_refresh_symbols([symbol])
+            assert fake_yahoo.requests("quote") == requests + 1
+            assert quotes.last_succeeded == 1
+            assert quotes.data[other] is kept
+
+    asyncio.run(run())
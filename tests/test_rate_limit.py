@@ -0,0 +1,84 @@
+"""Rate limiting: token bucket, backoff on 429 and recovery."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.yahoo_finance import ratelimit
+from custom_components.yahoo_finance.api import RateLimitedError
+
+from .common import async_watchlist, benchmark
+
+
+def test_backoff_and_recovery(fake_yahoo, monkeypatch):
+    """A 429 backs off every request until it passed, then updates recover."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 10) as (_, coordinators):
+            quotes = coordinators.quotes
+            limiter = quotes.hub.limiter
+            data = quotes.data
+
+            fake_yahoo.configure(rate_limit=1)
+            benchmark.force_full_cycle(coordinators)
+            await quotes.async_refresh()
+            assert limiter.rate_limited >= 1
+            assert limiter.backoff_remaining > 0
+            assert quotes.failed_updates == 1
+            # The previous quotes are kept and the interval backed off
+            assert quotes.data is data
+            assert quotes.update_interval > quotes._base_interval
+
+            # While backing off, nothing reaches Yahoo
+            before = fake_yahoo.requests("quote")
+            benchmark.force_full_cycle(coordinators)
+            await quotes.async_refresh()
+            assert fake_yahoo.requests("quote") == before
+            assert quotes.skipped_updates >= 1
+
+            # Once the backoff passed, the next update goes through and resets it
+            fake_yahoo.configure(rate_limit=0)
+            later = time.monotonic() + limiter.backoff_remaining + 1
+            monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=lambda: later))
+            benchmark.force_full_cycle(coordinators)
+            await quotes.async_refresh()
+            assert fake_yahoo.requests("quote") == before + 1
+            assert quotes.last_update_success
+            assert quotes.data is not data
+            assert quotes.update_interval == quotes._base_interval
+            assert limiter.metrics["consecutive_rate_limits"] == 0
+
+    asyncio.run(run())
+
+
+def test_acquire_raises_while_backing_off():
+    """Callers keep their data instead of waiting out a backoff."""
+    limiter = ratelimit.YahooFinanceRateLimiter()
+    limiter.async_report_rate_limited()
+
+    with pytest.raises(RateLimitedError):
+        asyncio.run(limiter.async_acquire())
+
+
+def test_token_bucket_throttles_to_budget():
+    """Bursts use the bucket, further requests wait at the budget's rate."""
+    # 600 per minute: 10 per second and a burst of 100
+    limiter = ratelimit.YahooFinanceRateLimiter(600)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(100):
+            await limiter.async_acquire()
+        assert time.monotonic() - start < 0.05
+        assert limiter.throttled_time == 0
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.async_acquire() for _ in range(5)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.4 < elapsed < 0.8
+    assert limiter.requests == 105
+    # Callers waiting together count once
+    assert limiter.throttled_time == pytest.approx(elapsed, abs=0.05)
@@ -0,0 +1,40 @@
+"""State writes: only entities whose value or attributes changed are written."""
+import asyncio
+
+from .common import async_watchlist, benchmark
+
+
+def test_unchanged_cycle_writes_nothing(fake_yahoo):
+    """A cycle whose prices didn't move fetches but writes no state."""
+
+    async def run():
+        fake_yahoo.configure(moving=False)
+        try:
+            async with async_watchlist(fake_yahoo, 20) as (hass, coordinators):
+                before = fake_yahoo.requests("quote")
+                writes = coordinators.state_writes
+                benchmark.force_full_cycle(coordinators)
+                await coordinators.quotes.async_refresh()
+                await hass.async_block_till_done()
+                assert fake_yahoo.requests("quote") == before + 1
+                assert coordinators.state_writes == writes
+        finally:
+            fake_yahoo.configure(moving=True)
+
+    asyncio.run(run())
+
+
+def test_moving_prices_write_only_changed_entities(fake_yahoo):
+    """Sensors that don't depend on the price keep their state."""
+
+    async def run():
+        async with async_watchlist(fake_yahoo, 20) as (hass, coordinators):
+            entities = len(hass.states.async_entity_ids("sensor"))
+            writes = coordinators.state_writes
+            benchmark.force_full_cycle(coordinators)
+            await coordinators.quotes.async_refresh()
+            await hass.async_block_till_done()
+            written = coordinators.state_writes - writes
+            assert 0 < written < entities
+
+    asyncio.run(run())
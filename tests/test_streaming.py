@@ -0,0 +1,251 @@
+"""Streaming: the pricing decoder and reconnects against a local websocket stand-in."""
+import asyncio
+import base64
+from contextlib import asynccontextmanager
+import json
+import shutil
+import struct
+import tempfile
+from types import SimpleNamespace
+
+from aiohttp import web
+import pytest
+
+from custom_components.yahoo_finance import streaming
+
+from .common import benchmark
+
+
+def _varint(value):
+    """Encode a protobuf varint."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def encode_pricing(**fields):
+    """Encode pricing fields the way Yahoo's PricingData message does."""
+    numbers = {name: (number, kind) for number, (name, kind) in streaming.PRICING_FIELDS.items()}
+    out = b""
+    for name, value in fields.items():
+        number, kind = numbers[name]
+        if kind == "string":
+            data = value.encode()
+            out += _varint(number << 3 | 2) + _varint(len(data)) + data
+        elif kind == "float":
+            out += _varint(number << 3 | 5) + struct.pack("<f", value)
+        elif kind == "double":
+            out += _varint(number << 3 | 1) + struct.pack("<d", value)
+        elif kind == "sint64":
+            out += _varint(number << 3) + _varint((value << 1) ^ (value >> 63))
+        else:
+            out += _varint(number << 3) + _varint(value)
+    return out
+
+
+def frame(**fields):
+    """Return a websocket text frame as the newer, JSON wrapped feed sends it."""
+    return json.dumps({"type": "pricing", "message": base64.b64encode(encode_pricing(**fields)).decode()})
+
+
+def test_decode_round_trip():
+    """All field types decode, unknown fields are skipped."""
+    buf = encode_pricing(
+        id="AAPL", price=187.25, time=1700000000000, currency="USD",
+        marketHours=1, dayVolume=-5, marketcap=2.9e12,
+    )
+    # An unknown length-delimited field
+    buf += _varint(14 << 3 | 2) + _varint(3) + b"xyz"
+    assert streaming.decode_pricing(buf) == {
+        "id": "AAPL",
+        "price": 187.25,
+        "time": 1700000000000,
+        "currency": "USD",
+        "marketHours": 1,
+        "dayVolume": -5,
+        "marketcap": 2.9e12,
+    }
+
+
+def test_decode_message_formats():
+    """Frames are accepted bare and wrapped in JSON."""
+    buf = encode_pricing(id="MSFT", price=410.5)
+    assert streaming.decode_message(base64.b64encode(buf).decode()) == {"id": "MSFT", "price": 410.5}
+    assert streaming.decode_message(frame(id="MSFT", price=410.5)) == {"id": "MSFT", "price": 410.5}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Cut off inside a string, a float and a varint
+        base64.b64encode(encode_pricing(id="AAPL")[:-2]).decode(),
+        base64.b64encode(encode_pricing(price=1.5)[:-1]).decode(),
+        base64.b64encode(b"\x08\xff").decode(),
+        # A string field sent as a varint
+        base64.b64encode(_varint(1 << 3) + _varint(7)).decode(),
+        base64.b64encode(b"\x0f").decode(),
+        "not base64!",
+        "[1, 2]",
+        '{"message": 5}',
+    ],
+)
+def test_decode_rejects_malformed(text):
+    """Malformed frames raise ValueError instead of yielding partial fields."""
+    with pytest.raises(ValueError):
+        streaming.decode_message(text)
+
+
+class StreamStandIn:
+    """A local websocket server playing one script per connection.
+
+    Each script is a list of frames to send before closing; None as a frame
+    leaves the connection open.
+    """
+
+    def __init__(self, scripts):
+        """Initialize."""
+        self.scripts = list(scripts)
+        self.subscriptions = []
+        self.url = None
+        self._runner = None
+
+    async def _handle(self, request):
+        """Subscribe, then play the next script."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.subscriptions.append((await ws.receive_json())["subscribe"])
+        script = self.scripts.pop(0) if self.scripts else []
+        for text in script:
+            if text is None:
+                # Until the streamer hangs up
+                await ws.receive()
+                break
+            await ws.send_str(text)
+        await ws.close()
+        return ws
+
+    async def async_start(self):
+        """Listen on a free port."""
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/"
+
+    async def async_stop(self):
+        """Stop listening."""
+        await self._runner.cleanup()
+
+
+@asynccontextmanager
+async def async_streamer(scripts, symbols=("AAPL", "MSFT")):
+    """Run a streamer against a stand-in; yield (streamer, stand-in, pricing, connection changes)."""
+    config_dir = tempfile.mkdtemp(prefix="yf-test-")
+    hass = await benchmark.async_start_hass(config_dir)
+    server = StreamStandIn(scripts)
+    await server.async_start()
+    pricing, changes = [], []
+    streamer = streaming.YahooFinanceStreamer(hass, symbols, pricing.append, changes.append, url=server.url)
+    try:
+        streamer.async_start()
+        yield streamer, server, pricing, changes
+    finally:
+        await streamer.async_stop()
+        await server.async_stop()
+        await hass.async_stop(force=True)
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+
+async def _async_wait_for(condition, timeout=5):
+    """Wait until condition() holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Make reconnects fast and record the backoff of each one."""
+    recorded = []
+
+    def uniform(low, high):
+        recorded.append(high)
+        return high
+
+    monkeypatch.setattr(streaming, "STREAM_RECONNECT_BASE", 0.01)
+    monkeypatch.setattr(streaming, "random", SimpleNamespace(uniform=uniform))
+    return recorded
+
+
+def test_stream_delivers_pricing(delays):
+    """Subscribes to the symbols and hands decoded pricing over."""
+
+    async def run():
+        script = [frame(id="AAPL", price=187.25), frame(id="MSFT", price=410.5), None]
+        async with async_streamer([script]) as (streamer, server, pricing, changes):
+            await _async_wait_for(lambda: len(pricing) == 2)
+            assert server.subscriptions == [["AAPL", "MSFT"]]
+            assert [fields["id"] for fields in pricing] == ["AAPL", "MSFT"]
+            assert streamer.connected
+            assert changes == [True]
+
+    asyncio.run(run())
+
+
+def test_stream_survives_bad_frames(delays):
+    """Undecodable frames and handler errors don't end the connection."""
+
+    async def run():
+        script = ["garbage", frame(id="AAPL", price=1.0), frame(id="MSFT", price=2.0), None]
+        async with async_streamer([script]) as (streamer, server, pricing, changes):
+            handled = []
+
+            def on_pricing(fields):
+                handled.append(fields["id"])
+                if fields["id"] == "AAPL":
+                    raise RuntimeError("handler bug")
+
+            streamer._on_pricing = on_pricing
+            await _async_wait_for(lambda: handled == ["AAPL", "MSFT"])
+            assert len(server.subscriptions) == 1
+            assert streamer.connected
+
+    asyncio.run(run())
+
+
+def test_stream_reconnects_with_backoff(delays):
+    """Drops report a disconnect; the backoff grows until messages arrive again."""
+
+    async def run():
+        # Two connections dropped right away, then one that delivers and drops
+        scripts = [[], [], [frame(id="AAPL", price=1.0)], []]
+        async with async_streamer(scripts) as (streamer, server, pricing, changes):
+            await _async_wait_for(lambda: len(server.subscriptions) == 5)
+            assert [fields["id"] for fields in pricing] == ["AAPL"]
+            assert changes[:6] == [True, False, True, False, True, False]
+            assert delays[:4] == [0.01, 0.02, 0.01, 0.02]
+
+    asyncio.run(run())
+
+
+def test_stop_does_not_report_disconnect(delays):
+    """Stopping ends the task quietly."""
+
+    async def run():
+        async with async_streamer([[None]]) as (streamer, server, pricing, changes):
+            await _async_wait_for(lambda: streamer.connected)
+            await streamer.async_stop()
+            assert not streamer.connected
+            assert changes == [True]
+            assert streamer._task is None
+
+    asyncio.run(run())